@@ -0,0 +1,99 @@
+# Benchmark for scraped-record cleaning in pidpal.func
+# Compares the per-record path processAllRows used (to_dict + clean_record + copying the fields
+# back, once per DataObject) against the column-wise clean_data_objects / clean_records, and
+# checks both give the same values.
+#
+# Run from the project directory:
+#   python -m Benchmarks.bench_clean_records --rows 1000000
+
+import time
+import random
+import argparse
+
+import pandas  # noqa: F401  (imported up front so the batch timings don't include it)
+
+from pidpal.func import DataObject, clean_record, clean_records, clean_data_objects
+
+# Value shapes seen on the county sites, plus the junk a scrape can return
+VALUE_SAMPLES = ["61,000", "$86,900", "155800", " 1,234.50 ", "", "N/A", None, "$0"]
+YEAR_SAMPLES = ["2024", "2023/2024", "2023-24", 2024, "", None, "N/A"]
+TIME_SAMPLES = ["2025-03-22 13:03:38", "2024-12-01 08:00:00", "", "not a date"]
+
+
+def make_objects(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        DataObject(
+            ParcelID=f"{i:03d}-{i % 97:05d}-{i % 9973:04d}",
+            LandValue=rng.choice(VALUE_SAMPLES),
+            BuildingValue=rng.choice(VALUE_SAMPLES),
+            TotalValue=rng.choice(VALUE_SAMPLES),
+            AssessmentYear=rng.choice(YEAR_SAMPLES),
+        )
+        for i in range(n)
+    ]
+
+
+def make_records(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "LandValue": rng.choice(VALUE_SAMPLES),
+            "TotalValue": rng.choice(VALUE_SAMPLES),
+            "AssessmentYear": rng.choice(YEAR_SAMPLES),
+            "LastScraped": rng.choice(TIME_SAMPLES),
+            "PropertyID": rng.choice(["None", "P1234567", ""]),
+        }
+        for _ in range(n)
+    ]
+
+
+# The loop processAllRows ran before clean_data_objects, kept here as the baseline
+def legacy_clean_objects(data_objects):
+    for data_obj in data_objects:
+        record = data_obj.to_dict()
+        clean_record(record)
+        data_obj.LandValue = record["LandValue"]
+        data_obj.BuildingValue = record["BuildingValue"]
+        data_obj.TotalValue = record["TotalValue"]
+        data_obj.AssessmentYear = record["AssessmentYear"]
+    return data_objects
+
+
+def legacy_clean_records(records):
+    return [clean_record(dict(record)) for record in records]
+
+
+def timed(label, func, rows, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {elapsed:8.2f}s  {rows / elapsed:12,.0f} rows/s")
+    return result
+
+
+def fields(obj):
+    return (obj.LandValue, obj.BuildingValue, obj.TotalValue, obj.AssessmentYear)
+
+
+def run(n):
+    print(f"{n:,} rows")
+
+    print("DataObjects (processAllRows):")
+    legacy = timed("per-record clean_record", legacy_clean_objects, n, make_objects(n))
+    batch = timed("clean_data_objects", clean_data_objects, n, make_objects(n))
+    mismatched = sum(fields(a) != fields(b) for a, b in zip(legacy, batch))
+    print(f"  mismatched objects: {mismatched:,}")
+
+    records = make_records(n)
+    columns = {key: [record[key] for record in records] for key in records[0]}
+    print("columns incl. LastScraped / PropertyID:")
+    timed("per-record clean_record", legacy_clean_records, n, records)
+    timed("clean_records", clean_records, n, columns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PidPal record cleaning")
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+    run(args.rows)
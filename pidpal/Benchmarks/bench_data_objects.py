@@ -0,0 +1,89 @@
+# Memory benchmark for the scraped-record containers in pidpal.func
+# Measures bytes per parcel (tracemalloc) for the old __dict__-based DataObject plus the to_dict()
+# copy processAllRows made of each, the slotted DataObject, and a DataBatch of the same records.
+#
+# Run from the project directory:
+#   python -m Benchmarks.bench_data_objects --rows 200000
+
+import gc
+import argparse
+import tracemalloc
+
+import pandas  # noqa: F401  (imported up front so its allocations aren't counted)
+
+from pidpal.func import DataObject, DataBatch
+
+
+# The pre-slots DataObject, kept here only as the baseline to measure against
+class LegacyDataObject:
+    def __init__(self, ParcelID, LandValue=None, BuildingValue=None, TotalValue=None,
+                 AssessmentYear=None, ScreenshotPath=None):
+        self.ParcelID = ParcelID
+        self.LandValue = LandValue
+        self.BuildingValue = BuildingValue
+        self.TotalValue = TotalValue
+        self.AssessmentYear = AssessmentYear
+        self.ScreenshotPath = ScreenshotPath
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+def raw_values(n):
+    """Scraped values as the county sites return them (text)."""
+    return [
+        (
+            f"{i:03d}-{i % 97:05d}-{i % 9973:04d}",
+            f"{i * 10:,}", f"{i * 20:,}", f"{i * 30:,}", "2024",
+            f"Screenshots\\{i:03d}-{i % 97:05d}-{i % 9973:04d}.png"
+        )
+        for i in range(n)
+    ]
+
+
+def cleaned(cls, values):
+    """Objects holding the cleaned values (floats, int year), as after clean_record."""
+    return [
+        cls(pid, float(land.replace(",", "")), float(bldg.replace(",", "")),
+            float(total.replace(",", "")), int(year), shot)
+        for pid, land, bldg, total, year, shot in values
+    ]
+
+
+def measure(label, n, build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<38} {size / 2**20:8.1f} MiB  {size / n:8.0f} bytes/parcel")
+    del result
+    return size
+
+
+def run(n):
+    places = {}
+    for i, row in enumerate(raw_values(n)):
+        places[row[0]] = (["Pierce", "Lake", "Hennepin"][i % 3], ["WI", "MN", "MN"][i % 3])
+
+    print(f"{n:,} parcels")
+    legacy = measure(
+        "dict DataObject + to_dict() copies", n,
+        lambda: (lambda objs: (objs, [obj.to_dict() for obj in objs]))(cleaned(LegacyDataObject, raw_values(n)))
+    )
+    measure("dict DataObject", n, lambda: cleaned(LegacyDataObject, raw_values(n)))
+    slotted = measure("slotted DataObject", n, lambda: cleaned(DataObject, raw_values(n)))
+
+    # Built from the raw scraped objects (cleaned on the way in); only the batch is kept
+    batch = measure(
+        "DataBatch", n,
+        lambda: DataBatch.from_objects([DataObject(*row) for row in raw_values(n)], places)
+    )
+    print(f"  reduction vs. legacy: slotted {legacy / slotted:.1f}x, DataBatch {legacy / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PidPal record memory")
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+    run(args.rows)
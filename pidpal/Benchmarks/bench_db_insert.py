@@ -0,0 +1,146 @@
+# Benchmark for the bulk DB writers in pidpal.db_func
+# Compares the old one-execute-per-row INSERT OR REPLACE / UPDATE loop against the
+# chunked executemany upserts, in rows per second, on a throwaway database. Both databases
+# get the current schema first (indexes, history, search and summary tables), so the legacy
+# writers pay the same index upkeep they would against master.db today. insert_scraped_data
+# also appends every row to ParcelValuations, which the legacy UPDATE never did.
+#
+# Run from the project directory:
+#   python -m Benchmarks.bench_db_insert --rows 100000
+
+import os
+import time
+import sqlite3
+import argparse
+import datetime
+import tempfile
+
+from pidpal.db_func import ensure_schema, insert_initial_parcels, insert_scraped_data
+from pidpal.func import DataObject
+
+
+def create_tables(db_path):
+    """Same Parcels/Properties layout as Database/create_database.py, plus the current schema"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS Parcels (
+        ParcelID TEXT PRIMARY KEY,
+        State TEXT,
+        County TEXT,
+        LandValue TEXT,
+        BuildingValue TEXT,
+        TotalValue TEXT,
+        AssessmentYear TEXT,
+        LastScraped TEXT,
+        ScreenshotPath TEXT
+    );
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS Properties (
+        PropertyID TEXT PRIMARY KEY,
+        Owner TEXT,
+        ParcelID TEXT NOT NULL,
+        FOREIGN KEY (ParcelID) REFERENCES Parcels(ParcelID)
+    );
+    ''')
+    conn.commit()
+    ensure_schema(conn, db_path)
+    conn.close()
+
+
+def make_rows(n):
+    data_list = [
+        {
+            "ParcelID": f"{i:03d}-{i % 97:05d}-{i % 9973:04d}",
+            "County": "Pierce",
+            "State": "WI",
+            "PropertyID": f"P{i:07d}",
+            "Owner": f"Owner {i % 500}"
+        }
+        for i in range(n)
+    ]
+    scraped = [
+        DataObject(
+            ParcelID=row["ParcelID"],
+            LandValue=float(i * 10),
+            BuildingValue=float(i * 20),
+            TotalValue=float(i * 30),
+            AssessmentYear=2024,
+            ScreenshotPath=os.path.join("Screenshots", f"{row['ParcelID']}.png")
+        )
+        for i, row in enumerate(data_list)
+    ]
+    return data_list, scraped
+
+
+# The pre-bulk implementations, kept here only as the baseline to measure against
+def legacy_insert_initial_parcels(data_list, db_path):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    for data in data_list:
+        cursor.execute('''
+            INSERT OR REPLACE INTO Parcels (
+                ParcelID, State, County, LandValue, BuildingValue, TotalValue, AssessmentYear, LastScraped, ScreenshotPath
+            )
+            VALUES (?, ?, ?, NULL, NULL, NULL, NULL, NULL, NULL)
+        ''', (data["ParcelID"], data["State"], data["County"]))
+        if data["PropertyID"]:
+            cursor.execute('''
+                INSERT OR REPLACE INTO Properties (PropertyID, Owner, ParcelID)
+                VALUES (?, ?, ?)
+            ''', (data["PropertyID"], data["Owner"], data["ParcelID"]))
+    conn.commit()
+    conn.close()
+
+
+def legacy_insert_scraped_data(scraped_data, db_path):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for obj in scraped_data:
+        cursor.execute('''
+            UPDATE Parcels
+            SET LandValue = ?, BuildingValue = ?, TotalValue = ?,
+                AssessmentYear = ?, LastScraped = ?, ScreenshotPath = ?
+            WHERE ParcelID = ?
+        ''', (obj.LandValue, obj.BuildingValue, obj.TotalValue,
+              obj.AssessmentYear, now, obj.ScreenshotPath, obj.ParcelID))
+    conn.commit()
+    conn.close()
+
+
+def timed(label, func, rows, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f}s  {rows / elapsed:12,.0f} rows/s")
+    return elapsed
+
+
+def run(n):
+    data_list, scraped = make_rows(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        bulk_db = os.path.join(tmp, "bulk.db")
+        create_tables(legacy_db)
+        create_tables(bulk_db)
+
+        print(f"{n:,} rows")
+        print("legacy (execute per row):")
+        timed("insert_initial_parcels", legacy_insert_initial_parcels, n, data_list, legacy_db)
+        timed("insert_scraped_data", legacy_insert_scraped_data, n, scraped, legacy_db)
+        timed("re-import", legacy_insert_initial_parcels, n, data_list, legacy_db)
+
+        print("bulk (chunked executemany upsert):")
+        timed("insert_initial_parcels", insert_initial_parcels, n, data_list, bulk_db)
+        timed("insert_scraped_data", insert_scraped_data, n, scraped, bulk_db)
+
+        # Re-import over existing rows: the path INSERT OR REPLACE used to churn
+        timed("re-import (upsert path)", insert_initial_parcels, n, data_list, bulk_db)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PidPal bulk DB inserts")
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.rows)
@@ -0,0 +1,126 @@
+# Startup benchmark for the desktop app
+# Reports the import cost of pidpal.MAIN (python -X importtime, top-level modules by cumulative
+# time, and whether any of the heavy modules that should load lazily were pulled in), then the
+# wall time from launch to the window's first paint and to the Home page being built.
+#
+# Run from the project directory (add QT_QPA_PLATFORM=offscreen on a machine without a display):
+#   python -m Benchmarks.bench_startup --runs 5
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+# Modules that must not be imported before the window is up
+LAZY_MODULES = ("pandas", "numpy", "selenium", "PyQt6.QtWebEngineWidgets", "openpyxl", "pyarrow")
+
+
+def import_times():
+    """[(cumulative_us, self_us, module)] for `import pidpal.MAIN` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pidpal.MAIN"],
+        capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+    return rows
+
+
+def report_imports(top):
+    rows = import_times()
+    total = sum(self_us for _, self_us, _ in rows)
+    print(f"import pidpal.MAIN: {total / 1000:.0f} ms in {len(rows)} modules")
+
+    # Top-level imports are the ones with no indentation in importtime's tree
+    top_level = sorted((row for row in rows if not row[2].startswith("  ")), reverse=True)
+    for cumulative_us, _, module in top_level[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module.strip()}")
+
+    imported = {module.strip() for _, _, module in rows}
+    eager = [name for name in LAZY_MODULES if name in imported]
+    print(f"  heavy modules imported at startup: {', '.join(eager) if eager else 'none'}")
+
+
+CHILD_SCRIPT = r'''
+import sys, time
+def report(event, detail=""):
+    print(f"{event} {time.time():.6f} {detail}", flush=True)
+
+from PyQt6.QtCore import Qt, QCoreApplication, QObject, QEvent, QTimer
+from PyQt6.QtWidgets import QApplication
+from pidpal.MAIN import MainWindow
+report("imported")
+
+QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+app = QApplication(sys.argv)
+window = MainWindow()
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            report("first_paint")
+            obj.removeEventFilter(self)
+        return False
+
+watcher = FirstPaint()
+window.installEventFilter(watcher)
+
+def build_home():
+    # What main() schedules after show()
+    try:
+        window.showHomePage()
+        report("home_ready")
+    except Exception as e:
+        report("home_failed", repr(e))
+    QTimer.singleShot(0, app.quit)
+
+window.show()
+QTimer.singleShot(0, build_home)
+app.exec()
+'''
+
+
+def launch_once():
+    """Seconds from launch to each event the child reports."""
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT], capture_output=True, text=True,
+        cwd=os.getcwd(), timeout=120
+    )
+    events = {}
+    for line in result.stdout.splitlines():
+        parts = line.split(" ", 2)
+        if len(parts) >= 2 and parts[0] in ("imported", "first_paint", "home_ready", "home_failed"):
+            events[parts[0]] = float(parts[1]) - start
+            if parts[0] == "home_failed":
+                events["error"] = parts[2] if len(parts) > 2 else ""
+    if "first_paint" not in events:
+        raise RuntimeError(f"The window never painted:\n{result.stderr[-2000:]}")
+    return events
+
+
+def report_launches(runs):
+    launches = [launch_once() for _ in range(runs)]
+    print(f"launch ({runs} runs, median):")
+    for event in ("imported", "first_paint", "home_ready"):
+        times = [launch[event] for launch in launches if event in launch]
+        if times:
+            print(f"  {event:<12} {statistics.median(times) * 1000:8.0f} ms")
+    failed = [launch["error"] for launch in launches if "error" in launch]
+    if failed:
+        print(f"  Home page failed to build: {failed[0]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PidPal startup")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="top-level imports to list")
+    args = parser.parse_args()
+    report_imports(args.top)
+    report_launches(args.runs)
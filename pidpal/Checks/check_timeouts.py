@@ -0,0 +1,72 @@
+# Check for the adaptive scraper timeouts in pidpal.scrapers.timeouts
+# Feeds a LatencyModel a site step's usual (fast) wait times, then a long run of timed-out
+# waits, and checks the step backs off: once half its recent waits missed, its timeout is at
+# least the scraper's default and doubles with every further miss up to MAX_TIMEOUT, also after
+# the model is saved and loaded again. Then checks that successful waits bring it back to the
+# adapted timeout. Uses a throwaway latency file.
+#
+# Run from the project directory:
+#   python -m Checks.check_timeouts --misses 500
+
+import os
+import math
+import random
+import argparse
+import tempfile
+
+from pidpal.scrapers.timeouts import (
+    BACKOFF_MISS_RATE, LatencyModel, MAX_TIMEOUT, MIN_SAMPLES, MIN_TIMEOUT, WINDOW
+)
+
+SITE = "https://example.test/"
+STEP = "search_results"
+DEFAULT = 10
+
+
+def run(misses, seed=0):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        model = LatencyModel(os.path.join(tmp, "latency.json"))
+        for _ in range(max(MIN_SAMPLES, WINDOW)):
+            model.record(SITE, STEP, rng.uniform(0.2, 1.0))
+        before = model.timeout(SITE, STEP, DEFAULT)
+
+        # Until enough of the recent waits missed, a miss leaves the timeout alone
+        first = math.ceil(BACKOFF_MISS_RATE * MIN_SAMPLES) - 1
+        for _ in range(first):
+            model.record_miss(SITE, STEP)
+        assert model.timeout(SITE, STEP, DEFAULT) == before, "a few misses changed the step's timeout"
+
+        timeouts = []
+        for _ in range(misses - first):
+            model.record_miss(SITE, STEP)
+            timeouts.append(model.timeout(SITE, STEP, DEFAULT))
+        after = model.timeout(SITE, STEP, DEFAULT)
+        rate = model.miss_rate(SITE, STEP)
+
+        model.save()
+        reloaded = LatencyModel(model.path).timeout(SITE, STEP, DEFAULT)
+
+        for _ in range(MIN_SAMPLES):
+            model.record(SITE, STEP, rng.uniform(0.2, 1.0))
+        recovered = model.timeout(SITE, STEP, DEFAULT)
+
+    print(f"timeout before {before:.2f}s, after {misses:,} misses {after:.2f}s "
+          f"(reloaded {reloaded:.2f}s, after {MIN_SAMPLES} successes {recovered:.2f}s), miss rate {rate:.2f}")
+    assert before < DEFAULT, "the fast waits didn't adapt the timeout"
+    if misses > first:
+        assert timeouts[0] == DEFAULT, "the step didn't back off to its default"
+        assert all(b >= a for a, b in zip(timeouts, timeouts[1:])), "the backed off timeout went down"
+        assert after == reloaded, "the backed off timeout wasn't kept between runs"
+        assert rate > 0, "misses were not counted"
+    if misses > first + 3:
+        assert after == MAX_TIMEOUT, "a run of misses didn't widen the timeout to MAX_TIMEOUT"
+    assert MIN_TIMEOUT <= recovered < DEFAULT, "successful waits didn't bring the timeout back"
+    print("ok")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that PidPal's timeouts back off when most waits time out")
+    parser.add_argument("--misses", type=int, default=500)
+    args = parser.parse_args()
+    run(args.misses)
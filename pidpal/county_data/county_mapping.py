@@ -0,0 +1,161 @@
+# Maps (County, State) from the import spreadsheet to the scraper "key" (e.g. "HennepinMN").
+# Keys are looked up in PATRIOT_URL_MAPPING / CPT_URL_MAPPING, or name one of the template-method
+# scrapers in scrape_all (TEMPLATE_SCRAPER_KEYS).
+
+COUNTY_MAPPING = {
+    ("Hennepin", "MN"): "HennepinMN",
+    ("Lake", "MN"): "LakeMN",
+    ("Pierce", "WI"): "PierceWI",
+    ("Falmouth", "MA"): "FalmouthMA",
+    ("Dover", "MA"): "DoverMA",
+    ("Acushnet", "MA"): "AcushnetMA",
+    ("Agawam", "MA"): "AgawamMA",
+    ("Andover", "MA"): "AndoverMA",
+    ("Arlington", "MA"): "ArlingtonMA",
+    ("Ashfield", "MA"): "AshfieldMA",
+    ("Auburn", "ME"): "AuburnME",
+    ("Barnard", "VT"): "BarnardVT",
+    ("Barton", "VT"): "BartonVT",
+    ("Bedford", "MA"): "BedfordMA",
+    ("Belchertown", "MA"): "BelchertownMA",
+    ("Bellingham", "MA"): "BellinghamMA",
+    ("Beverly", "MA"): "BeverlyMA",
+    ("Billerica", "MA"): "BillericaMA",
+    ("Blandford", "MA"): "BlandfordMA",
+    ("Braintree", "MA"): "BraintreeMA",
+    ("Brentwood", "NH"): "BrentwoodNH",
+    ("Brimfield", "MA"): "BrimfieldMA",
+    ("Burlington", "MA"): "BurlingtonMA",
+    ("Carlisle", "MA"): "CarlisleMA",
+    ("Castleton", "VT"): "CastletonVT",
+    ("Charlton", "MA"): "CharltonMA",
+    ("Clarksburg", "MA"): "ClarksburgMA",
+    ("Cohasset", "MA"): "CohassetMA",
+    ("Coventry", "VT"): "CoventryVT",
+    ("Cummington", "MA"): "CummingtonMA",
+    ("Dalton", "MA"): "DaltonMA",
+    ("Danvers", "MA"): "DanversMA",
+    ("Deerfield", "MA"): "DeerfieldMA",
+    ("Derby", "VT"): "DerbyVT",
+    ("Douglas", "MA"): "DouglasMA",
+    ("Dunstable", "MA"): "DunstableMA",
+    ("Essex", "MA"): "EssexMA",
+    ("Everett", "MA"): "EverettMA",
+    ("Fairhaven", "MA"): "FairhavenMA",
+    ("Fall River", "MA"): "Fall RiverMA",
+    ("Framingham", "MA"): "FraminghamMA",
+    ("Franklin", "MA"): "FranklinMA",
+    ("Great Barrington", "MA"): "Great BarringtonMA",
+    ("Groveland", "MA"): "GrovelandMA",
+    ("Hamilton", "MA"): "HamiltonMA",
+    ("Hardwick", "MA"): "HardwickMA",
+    ("Hatfield", "MA"): "HatfieldMA",
+    ("Haverhill", "MA"): "HaverhillMA",
+    ("Holbrook", "MA"): "HolbrookMA",
+    ("Holyoke", "MA"): "HolyokeMA",
+    ("Hopedale", "MA"): "HopedaleMA",
+    ("Hopkinton", "MA"): "HopkintonMA",
+    ("Hull", "MA"): "HullMA",
+    ("Ipswich", "MA"): "IpswichMA",
+    ("Jamaica", "VT"): "JamaicaVT",
+    ("Jay", "VT"): "JayVT",
+    ("Lancaster County", "SC"): "Lancaster CountySC",
+    ("Leicester", "MA"): "LeicesterMA",
+    ("Littleton", "MA"): "LittletonMA",
+    ("Lynn", "MA"): "LynnMA",
+    ("Lynnfield", "MA"): "LynnfieldMA",
+    ("Malden", "MA"): "MaldenMA",
+    ("Manchester-by-the-Sea", "MA"): "Manchester-by-the-SeaMA",
+    ("Marblehead", "MA"): "MarbleheadMA",
+    ("Marshfield", "MA"): "MarshfieldMA",
+    ("Marshfield", "VT"): "MarshfieldVT",
+    ("Maynard", "MA"): "MaynardMA",
+    ("Medway", "MA"): "MedwayMA",
+    ("Melrose", "MA"): "MelroseMA",
+    ("Merrimac", "MA"): "MerrimacMA",
+    ("Methuen", "MA"): "MethuenMA",
+    ("Middleton", "MA"): "MiddletonMA",
+    ("Milford", "MA"): "MilfordMA",
+    ("Millville", "MA"): "MillvilleMA",
+    ("Milton", "MA"): "MiltonMA",
+    ("Montague", "MA"): "MontagueMA",
+    ("Montgomery", "MA"): "MontgomeryMA",
+    ("Montpelier", "VT"): "MontpelierVT",
+    ("Nahant", "MA"): "NahantMA",
+    ("New Ashford", "MA"): "New AshfordMA",
+    ("Newbury", "MA"): "NewburyMA",
+    ("North Adams", "MA"): "North AdamsMA",
+    ("North Andover", "MA"): "North AndoverMA",
+    ("Northborough", "MA"): "NorthboroughMA",
+    ("Northfield", "MA"): "NorthfieldMA",
+    ("Norwich", "VT"): "NorwichVT",
+    ("Orange", "MA"): "OrangeMA",
+    ("Pembroke", "MA"): "PembrokeMA",
+    ("Pepperell", "MA"): "PepperellMA",
+    ("Peru", "MA"): "PeruMA",
+    ("Plainville", "MA"): "PlainvilleMA",
+    ("Plymouth", "MA"): "PlymouthMA",
+    ("Raynham", "MA"): "RaynhamMA",
+    ("Reading", "MA"): "ReadingMA",
+    ("Revere", "MA"): "RevereMA",
+    ("Rochester", "NH"): "RochesterNH",
+    ("Salem", "MA"): "SalemMA",
+    ("Salisbury", "MA"): "SalisburyMA",
+    ("Saugus", "MA"): "SaugusMA",
+    ("Shelburne", "MA"): "ShelburneMA",
+    ("Sherborn", "MA"): "SherbornMA",
+    ("Shirley", "MA"): "ShirleyMA",
+    ("Somersworth", "NH"): "SomersworthNH",
+    ("Southborough", "MA"): "SouthboroughMA",
+    ("Springfield", "VT"): "SpringfieldVT",
+    ("Stoneham", "MA"): "StonehamMA",
+    ("Stoughton", "MA"): "StoughtonMA",
+    ("Swampscott", "MA"): "SwampscottMA",
+    ("Tolland", "MA"): "TollandMA",
+    ("Topsfield", "MA"): "TopsfieldMA",
+    ("Townsend", "MA"): "TownsendMA",
+    ("Tyngsborough", "MA"): "TyngsboroughMA",
+    ("Upton", "MA"): "UptonMA",
+    ("Uxbridge", "MA"): "UxbridgeMA",
+    ("Wakefield", "MA"): "WakefieldMA",
+    ("Waltham", "MA"): "WalthamMA",
+    ("Warwick", "MA"): "WarwickMA",
+    ("Watertown", "MA"): "WatertownMA",
+    ("Wendell", "MA"): "WendellMA",
+    ("Wenham", "MA"): "WenhamMA",
+    ("West Bridgewater", "MA"): "West BridgewaterMA",
+    ("West Newbury", "MA"): "West NewburyMA",
+    ("West Tisbury", "MA"): "West TisburyMA",
+    ("Westborough", "MA"): "WestboroughMA",
+    ("Westford", "MA"): "WestfordMA",
+    ("Whitman", "MA"): "WhitmanMA",
+    ("Williamsburg", "MA"): "WilliamsburgMA",
+    ("Williamstown", "MA"): "WilliamstownMA",
+    ("Winchester", "MA"): "WinchesterMA",
+    ("Worthington", "MA"): "WorthingtonMA",
+    ("Douglas", "MN"): "DouglasMN",
+    ("Grant", "MN"): "GrantMN",
+    ("Kandiyohi", "MN"): "KandiyohiMN",
+    ("Lincoln", "MN"): "LincolnMN",
+    ("Meeker", "MN"): "MeekerMN",
+    ("Mille Lacs", "MN"): "Mille LacsMN",
+    ("Pope", "MN"): "PopeMN",
+    ("Renville", "MN"): "RenvilleMN",
+    ("Sibley", "MN"): "SibleyMN",
+    ("Yellow Medicine", "MN"): "Yellow MedicineMN",
+    ("Spokane", "WA"): "SpokaneWA",
+    ("Douglas", "WI"): "DouglasWI"
+}
+
+# Keys handled by a dedicated scraper class rather than a Patriot/CPT URL
+TEMPLATE_SCRAPER_KEYS = ("HennepinMN", "LakeMN", "PierceWI", "SpokaneWA")
+
+
+# COUNTY_MAPPING by casefolded (County, State): str.title() would mangle names such as
+# "Manchester-by-the-Sea" or "McLeod"
+_CASEFOLDED_MAPPING = {(county.casefold(), state.casefold()): key for (county, state), key in COUNTY_MAPPING.items()}
+
+
+def county_key(county, state):
+    """The COUNTY_MAPPING key for a spreadsheet County/State (whitespace and case tolerant), or None."""
+    return _CASEFOLDED_MAPPING.get(((county or "").strip().casefold(), (state or "").strip().casefold()))
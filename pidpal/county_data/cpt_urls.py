@@ -8,7 +8,7 @@ CPT_URL_MAPPING = {
     "LincolnMN": "https://tax.cptmn.us/PTaxPortal/#/parcelSearch/Lincoln",
     "MeekerMN": "https://tax.cptmn.us/PTaxPortal/#/parcelSearch/Meeker",
     "Mille LacsMN": r"https://tax.cptmn.us/PTaxPortal/#/parcelSearch/Mille%20Lacs",
-    "Pope MN": "https://tax.cptmn.us/PTaxPortal/#/parcelSearch/Pope",
+    "PopeMN": "https://tax.cptmn.us/PTaxPortal/#/parcelSearch/Pope",
     "RenvilleMN": "https://tax.cptmn.us/PTaxPortal/#/parcelSearch/Renville",
     "SibleyMN": "https://tax.cptmn.us/PTaxPortal/#/parcelSearch/Sibley",
     "Yellow MedicineMN": "https://tax.cptmn.us/PTaxPortal/#/parcelSearch/Yellow%20Medicine"
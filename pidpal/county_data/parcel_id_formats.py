@@ -0,0 +1,42 @@
+# ParcelID formats for counties whose IDs follow a fixed layout, keyed like COUNTY_MAPPING values.
+# Used by pidpal.parcel_ids to normalize and check imported ParcelIDs before a scrape.
+#
+#   pattern    - regex the normalized ParcelID must fully match
+#   template   - optional layout, "#" = digit: IDs typed with other (or no) separators but the
+#                right number of digits are rewritten to it, e.g. 14120233100 73 -> 14-120-23-31-0073
+#   separators - optional characters to replace, e.g. "_" (screenshot file names) -> "/"
+#   uppercase  - optional, True if the county's IDs have upper-case letters (typed ones are
+#                upper-cased); other IDs keep their case
+#   example    - shown to the user when an ID doesn't match
+#
+# Counties not listed here only get the generic check in pidpal.parcel_ids.
+
+PARCEL_ID_FORMATS = {
+    "HennepinMN": {
+        "pattern": r"\d{2}-\d{3}-\d{2}-\d{2}-\d{4}",
+        "template": "##-###-##-##-####",
+        "example": "14-120-23-31-0073",
+    },
+    "LakeMN": {
+        "pattern": r"\d{2}-\d{4}-\d{5}",
+        "template": "##-####-#####",
+        "example": "28-6311-29400",
+    },
+    "PierceWI": {
+        "pattern": r"\d{3}-\d{5}-\d{4}",
+        "template": "###-#####-####",
+        "example": "276-01060-0500",
+    },
+    "SpringfieldVT": {
+        "pattern": r"[0-9A-Z]+/[0-9A-Z]+/[0-9A-Z]+(-[0-9A-Z]+)?",
+        "separators": {"_": "/", "\\": "/"},
+        "uppercase": True,
+        "example": "010/2/42",
+    },
+    "FalmouthMA": {
+        "pattern": r"[0-9A-Z]{2,3} \d{2} \d{3} \d{3}",
+        "separators": {"_": " "},
+        "uppercase": True,
+        "example": "02A 11 015 000",
+    },
+}
@@ -1,13 +1,19 @@
 import sys
-from PyQt6.QtCore import Qt
+import importlib
+from PyQt6.QtCore import Qt, QCoreApplication, QTimer
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QHBoxLayout, QVBoxLayout, QStackedWidget, QPushButton
 )
 
-from pidpal.pages.INPUT_PAGE import ImportPage
-from pidpal.pages.DB_VIEW import DBViewPage
-from pidpal.pages.HOME_PAGE import HomePage
+# Pages are built (and their modules imported) the first time they are shown, so startup
+# doesn't pay for QtWebEngine, pandas or Selenium before the window appears
+PAGE_CLASSES = {
+    "home": ("pidpal.pages.HOME_PAGE", "HomePage"),
+    "import": ("pidpal.pages.INPUT_PAGE", "ImportPage"),
+    "dbView": ("pidpal.pages.DB_VIEW", "DBViewPage"),
+    "analytics": ("pidpal.pages.ANALYTICS", "AnalyticsPage"),
+}
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -56,10 +62,15 @@ class MainWindow(QMainWindow):
         self.dbViewPageButton = QPushButton("DB Viewer")
         self.dbViewPageButton.clicked.connect(self.showDBViewPage)
 
+        # Analytics button
+        self.analyticsPageButton = QPushButton("Analytics")
+        self.analyticsPageButton.clicked.connect(self.showAnalyticsPage)
+
         # Add buttons to sidebar
         self.sidebarLayout.addWidget(self.homePageButton)
         self.sidebarLayout.addWidget(self.importPageButton)
         self.sidebarLayout.addWidget(self.dbViewPageButton)
+        self.sidebarLayout.addWidget(self.analyticsPageButton)
         self.sidebarLayout.addStretch()
 
         #########################
@@ -67,40 +78,56 @@ class MainWindow(QMainWindow):
         #########################
         self.pagesWidget = QStackedWidget()
 
-        # Create instances of each page
-        self.homePage = HomePage()
-        self.importPage = ImportPage()
-        self.dbViewPage = DBViewPage()
-
-        # Add pages to the stack (the order determines their index)
-        self.pagesWidget.addWidget(self.homePage)    # index 0
-        self.pagesWidget.addWidget(self.importPage)  # index 1
-        self.pagesWidget.addWidget(self.dbViewPage)  # index 2
-
-        # Start with the Home page (index 0)
-        self.pagesWidget.setCurrentIndex(0)
+        # Pages built so far (see page()); the Home page is shown once the window is up (main())
+        self.pages = {}
 
         # Add sidebar + stacked widget to the main layout
         mainLayout.addLayout(self.sidebarLayout, 1)
         mainLayout.addWidget(self.pagesWidget, 4)
 
+    def page(self, name):
+        """The page widget for `name` (a PAGE_CLASSES key), built and added to the stack on first use."""
+        if name not in self.pages:
+            module_name, class_name = PAGE_CLASSES[name]
+            page_class = getattr(importlib.import_module(module_name), class_name)
+            self.pages[name] = page_class()
+            self.pagesWidget.addWidget(self.pages[name])
+        return self.pages[name]
+
     ##################
     #  Page Switchers
     ##################
     def showHomePage(self):
-        self.pagesWidget.setCurrentWidget(self.homePage)
+        self.pagesWidget.setCurrentWidget(self.page("home"))
 
     def showImportPage(self):
-        self.pagesWidget.setCurrentWidget(self.importPage)
+        self.pagesWidget.setCurrentWidget(self.page("import"))
 
     def showDBViewPage(self):
-        self.pagesWidget.setCurrentWidget(self.dbViewPage)
+        self.pagesWidget.setCurrentWidget(self.page("dbView"))
+
+    def showAnalyticsPage(self):
+        built = "analytics" in self.pages
+        analyticsPage = self.page("analytics")
+        if built:
+            # Summaries may have changed since the page was built (e.g. after a scrape)
+            analyticsPage.loadData()
+        self.pagesWidget.setCurrentWidget(analyticsPage)
 
 
 def main():
+    # QtWebEngine is imported after the QApplication exists (with the Home page), which it
+    # only allows when contexts are shared
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    # Build the Home page once the window has painted
+    QTimer.singleShot(0, window.showHomePage)
+    # The Import page's browser is started by the first Go! (not every launch opens a Chrome
+    # window), and kept for the next ones until the app quits
+    from pidpal.scrapers.driver_pool import close_shared_pool
+    app.aboutToQuit.connect(close_shared_pool)
     sys.exit(app.exec())
 
 
@@ -0,0 +1,225 @@
+# Portfolio roll-ups over the parcel data: totals per Owner/County/State, land-to-building
+# ratios and value percentiles.
+#
+# Sums and counts come straight from the ValueSummaries table, brought up to date with the
+# latest imports and scrapes (just the groups they touched) when it's read, so they're instant. Anything that needs every value (percentiles, ratio
+# distributions, histograms) loads the typed value columns into pandas and is vectorized there.
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from pidpal.db_func import (
+    DB_PATH, SUMMARY_GROUPS, ensure_schema, refresh_value_summaries, sql_number, sync_value_summaries
+)
+
+VALUE_COLUMNS = ("LandValue", "BuildingValue", "TotalValue")
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Columns value_summary can sort on
+SUMMARY_SORT_COLUMNS = (
+    "GroupKey", "ParcelCount", "ValuedCount", "LandValue", "BuildingValue", "TotalValue",
+    "AverageTotalValue", "LandToBuildingRatio", "MinTotalValue", "MaxTotalValue"
+)
+
+
+def _connect(db_path=None):
+    db_path = db_path or DB_PATH
+    conn = sqlite3.connect(db_path)
+    ensure_schema(conn, db_path)
+    return conn
+
+
+def _check_group_by(group_by):
+    if group_by not in SUMMARY_GROUPS:
+        raise ValueError(f"group_by must be one of {', '.join(SUMMARY_GROUPS)}, not {group_by!r}")
+
+
+def value_summary(group_by="County", sort_by="TotalValue", descending=True, limit=None, db_path=None):
+    """
+    Total assessed values per Owner, County or State, read from ValueSummaries.
+
+    Each row has GroupKey ('' for parcels without one), ParcelCount, ValuedCount (parcels that
+    have been scraped), LandValue, BuildingValue and TotalValue sums, AverageTotalValue,
+    LandToBuildingRatio (summed land over summed building value), MinTotalValue and MaxTotalValue.
+
+    :return: a list of dictionaries, largest TotalValue first by default.
+    """
+    _check_group_by(group_by)
+    if sort_by not in SUMMARY_SORT_COLUMNS:
+        sort_by = "TotalValue"
+
+    query = f'''
+        SELECT GroupKey, ParcelCount, ValuedCount, LandValue, BuildingValue, TotalValue,
+               TotalValue / NULLIF(ValuedCount, 0) AS AverageTotalValue,
+               LandValue / NULLIF(BuildingValue, 0) AS LandToBuildingRatio,
+               MinTotalValue, MaxTotalValue, RefreshedAt
+        FROM ValueSummaries
+        WHERE GroupBy = ?
+        ORDER BY {sort_by} {"DESC" if descending else "ASC"}, GroupKey
+    '''
+    values = [group_by]
+    if limit:
+        query += " LIMIT ?"
+        values.append(int(limit))
+
+    conn = _connect(db_path)
+    sync_value_summaries(conn)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(query, values).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def portfolio_totals(db_path=None):
+    """Overall ParcelCount, ValuedCount and value sums (the State summaries added up)."""
+    conn = _connect(db_path)
+    sync_value_summaries(conn)
+    row = conn.execute('''
+        SELECT IFNULL(SUM(ParcelCount), 0), IFNULL(SUM(ValuedCount), 0),
+               SUM(LandValue), SUM(BuildingValue), SUM(TotalValue)
+        FROM ValueSummaries
+        WHERE GroupBy = 'State'
+    ''').fetchone()
+    conn.close()
+    return dict(zip(("ParcelCount", "ValuedCount", "LandValue", "BuildingValue", "TotalValue"), row))
+
+
+def rebuild_summaries(db_path=None):
+    """Recomputes every ValueSummaries row (e.g. after master.db was edited by hand)."""
+    conn = _connect(db_path)
+    refresh_value_summaries(conn)
+    conn.commit()
+    conn.close()
+
+
+def load_parcel_values(filters=None, with_owner=False, db_path=None):
+    """
+    Loads the current parcel values as a DataFrame with typed columns: ParcelID, State and
+    County (categorical), LandValue, BuildingValue and TotalValue (float64, NaN if unscraped)
+    and AssessmentYear (nullable Int64). with_owner=True adds Owner, one row per distinct
+    (Owner, parcel), which is what per-Owner statistics need.
+
+    :param filters: optional dict of exact matches on "State", "County" and/or "Owner".
+    """
+    filters = filters or {}
+    owner = with_owner or "Owner" in filters
+
+    select = f'''
+        SELECT {"DISTINCT IFNULL(pr.Owner, '') AS Owner," if owner else ""}
+               p.ParcelID, IFNULL(p.State, '') AS State, IFNULL(p.County, '') AS County,
+               {sql_number("p.LandValue")} AS LandValue,
+               {sql_number("p.BuildingValue")} AS BuildingValue,
+               {sql_number("p.TotalValue")} AS TotalValue,
+               CAST(NULLIF(p.AssessmentYear, '') AS INTEGER) AS AssessmentYear
+        FROM Parcels p
+    '''
+    if owner:
+        select += " JOIN Properties pr ON pr.ParcelID = p.ParcelID"
+
+    where_clauses = []
+    values = []
+    for column, alias in (("State", "p.State"), ("County", "p.County"), ("Owner", "pr.Owner")):
+        if filters.get(column):
+            where_clauses.append(f"{alias} = ?")
+            values.append(filters[column])
+    if where_clauses:
+        select += " WHERE " + " AND ".join(where_clauses)
+
+    conn = _connect(db_path)
+    df = pd.read_sql_query(select, conn, params=values)
+    conn.close()
+
+    for column in VALUE_COLUMNS:
+        df[column] = df[column].astype("float64")
+    df["AssessmentYear"] = df["AssessmentYear"].astype("Int64")
+    for column in ("State", "County"):
+        df[column] = df[column].astype("category")
+    return df
+
+
+def land_to_building_ratios(df):
+    """
+    Per-row LandValue / BuildingValue for a load_parcel_values frame, as a float Series.
+    Rows with no (or zero) building value get NaN rather than inf.
+    """
+    land = df["LandValue"].to_numpy(dtype="float64")
+    building = df["BuildingValue"].to_numpy(dtype="float64")
+    ratios = np.full(len(df), np.nan)
+    np.divide(land, building, out=ratios, where=building > 0)
+    return pd.Series(ratios, index=df.index, name="LandToBuildingRatio")
+
+
+def value_percentiles(group_by=None, column="TotalValue", percentiles=DEFAULT_PERCENTILES,
+                      filters=None, db_path=None):
+    """
+    Percentiles of `column` (a value column or "LandToBuildingRatio") over scraped parcels,
+    overall or per Owner/County/State.
+
+    :return: a DataFrame with one row per group (a single "All" row when group_by is None),
+             a Count column and one column per percentile, e.g. P10, P25, P50.
+    """
+    if group_by is not None:
+        _check_group_by(group_by)
+
+    df = load_parcel_values(filters=filters, with_owner=group_by == "Owner", db_path=db_path)
+    if column == "LandToBuildingRatio":
+        df[column] = land_to_building_ratios(df)
+    elif column not in VALUE_COLUMNS:
+        raise ValueError(f"Unknown value column {column!r}")
+
+    df = df[df[column].notna()]
+    names = [f"P{p:g}" for p in percentiles]
+    quantiles = [p / 100 for p in percentiles]
+
+    if group_by is None:
+        values = df[column].to_numpy()
+        row = np.percentile(values, percentiles) if len(values) else [np.nan] * len(percentiles)
+        result = pd.DataFrame([row], columns=names, index=pd.Index(["All"], name="GroupKey"))
+        result.insert(0, "Count", len(values))
+        return result
+
+    grouped = df.groupby(group_by, observed=True)[column]
+    result = grouped.quantile(quantiles).unstack()
+    result.columns = names
+    result.insert(0, "Count", grouped.size())
+    result.index.name = "GroupKey"
+    return result
+
+
+def value_distribution(column="TotalValue", bins=20, filters=None, db_path=None):
+    """
+    Histogram of `column` over scraped parcels: returns (counts, bin_edges) from np.histogram.
+    """
+    df = load_parcel_values(filters=filters, db_path=db_path)
+    if column == "LandToBuildingRatio":
+        values = land_to_building_ratios(df).to_numpy()
+    else:
+        values = df[column].to_numpy()
+    values = values[~np.isnan(values)]
+    return np.histogram(values, bins=bins)
+
+
+def group_statistics(group_by="County", percentiles=(25, 50, 75), limit=None, db_path=None):
+    """
+    value_summary for `group_by` joined with TotalValue percentiles and the median per-parcel
+    land-to-building ratio of each group, as one DataFrame indexed by GroupKey. This is what the
+    Analytics page shows.
+    """
+    summary = pd.DataFrame(value_summary(group_by, limit=limit, db_path=db_path))
+    if summary.empty:
+        return summary
+    summary = summary.drop(columns="RefreshedAt").set_index("GroupKey")
+
+    df = load_parcel_values(with_owner=group_by == "Owner", db_path=db_path)
+    df = df[df[group_by].isin(summary.index)]
+    df["LandToBuildingRatio"] = land_to_building_ratios(df)
+
+    scraped = df[df["TotalValue"].notna()].groupby(group_by, observed=True)
+    value_stats = scraped["TotalValue"].quantile([p / 100 for p in percentiles]).unstack()
+    value_stats.columns = [f"TotalValue P{p:g}" for p in percentiles]
+    value_stats["Median LandToBuildingRatio"] = scraped["LandToBuildingRatio"].median()
+    value_stats.index = value_stats.index.astype(str)
+
+    # Keep the summary's (sorted) order; groups with nothing scraped get NaN
+    return summary.join(value_stats)
@@ -0,0 +1,366 @@
+# Headless batch runner, for servers and cron:
+#   python -m pidpal.cli parcels.csv --db Database/master.db --workers 4 --freshness stale
+#   python -m pidpal.cli --retry --db Database/master.db    (re-run retryable ScrapeFailures)
+#   python -m pidpal.cli parcels.csv --profiles              (keep each browser's cache between runs)
+#
+# Runs the same pipeline as the Import page's Go! button (import, ParcelID checks, initial insert,
+# scrape, clean, insert) with no Qt import at all. Progress is written to stdout as JSON lines,
+# one object per event, ending with a "summary" line with the throughput; anything meant for a
+# person (tracebacks, Selenium noise, the scrapers' and circuit breakers' prints) goes to stderr.
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import datetime
+import threading
+import traceback
+import contextlib
+
+import pandas as pd
+
+from pidpal.db_func import (
+    DB_PATH, insert_initial_parcels, insert_scraped_data, insert_scrape_failures, last_scraped_times,
+    scrape_failures, sync_derived_tables
+)
+from pidpal.func import DataBatch, LAST_SCRAPED_FORMAT
+from pidpal.parcel_import import IMPORT_COLUMNS, IMPORT_FORMATS, load_parcel_batch, batch_records, records_batch
+from pidpal.parcel_ids import check_parcel_batch, valid_rows, rejected_rows
+from pidpal.export import export_format, export_parcels
+from pidpal.scrapers.failures import FAILURE_CLASSES, RETRYABLE_CLASSES
+from pidpal.scrapers.browser_profile import PROFILE_ROOT, cache_stats
+from pidpal.scrapers.driver_pool import MAX_MEMORY_MB, MAX_PARCELS, DriverPool
+
+FRESHNESS_POLICIES = ("always", "missing", "stale")
+
+# Parcels handed to a worker at a time (one scrape_all_counties call on the worker's driver)
+DEFAULT_BATCH_SIZE = 25
+
+# Scraped parcels are cleaned and written to the DB in groups of this many
+FLUSH_SIZE = 500
+
+# The stream emit() writes to: the real stdout, while main() sends every print to stderr
+_events = None
+
+
+def emit(event, **fields):
+    """Writes one JSON progress line to stdout."""
+    fields = {"event": event, "time": datetime.datetime.now().strftime(LAST_SCRAPED_FORMAT), **fields}
+    out = _events or sys.stdout
+    out.write(json.dumps(fields) + "\n")
+    out.flush()
+
+
+def select_for_scrape(batch, freshness, max_age_days, db_path):
+    """
+    The rows of a checked batch to scrape under the freshness policy:
+      always   every row
+      missing  rows whose parcel has never been scraped
+      stale    rows never scraped, or last scraped more than max_age_days ago
+    Returns (rows to scrape, number skipped as fresh).
+    """
+    if freshness == "always" or not len(batch):
+        return batch, 0
+    scraped = last_scraped_times(batch["ParcelID"].tolist(), db_path)
+    if freshness == "missing":
+        keep = ~batch["ParcelID"].isin(scraped.keys())
+    else:
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=max_age_days)).strftime(LAST_SCRAPED_FORMAT)
+        fresh = {parcel_id for parcel_id, scraped_at in scraped.items() if scraped_at >= cutoff}
+        keep = ~batch["ParcelID"].isin(fresh)
+    return batch[keep], int((~keep).sum())
+
+
+def _scrape_worker(jobs, results, screenshot_dir, pool, tabs=1, capture_network=False):
+    """
+    Thread body: takes batches from `jobs` and scrapes each on a driver from `pool`.
+    Puts (records, scraped DataObjects, deferred records, ScrapeFailures rows, error message or
+    None) on `results`; the driver of a batch that fails is recycled by the pool.
+    """
+    from pidpal.scrapers.scrape_all import scrape_all_counties
+    from pidpal.scrapers.failures import classify_failure, failure_record
+
+    while True:
+        records = jobs.get()
+        if records is None:
+            break
+        driver = None
+        broken = False
+        try:
+            driver = pool.acquire()
+            deferred = []
+            failures = []
+            scraped = scrape_all_counties(records, screenshot_dir=screenshot_dir, driver=driver,
+                                          deferred=deferred, failures=failures, tabs=tabs,
+                                          capture_network=capture_network)
+            results.put((records, scraped, deferred, failures, None))
+        except Exception as e:
+            broken = True
+            traceback.print_exc(file=sys.stderr)
+            error = f"{type(e).__name__}: {e}"
+            failures = [failure_record(record, classify_failure(e), message=error) for record in records]
+            results.put((records, [], [], failures, error))
+        finally:
+            if driver is not None:
+                pool.release(driver, parcels=len(records), broken=broken)
+
+
+def start_pool(workers, headless=True, profiles=None, max_parcels=MAX_PARCELS, max_memory_mb=MAX_MEMORY_MB,
+               network_log=False):
+    """
+    A DriverPool of `workers` drivers, starting in the background (with their persistent profiles
+    under the `profiles` folder, if given, and their network events logged for capture_network).
+    """
+    # Imported here (not in the pool's threads) so a missing Selenium fails the run right away
+    import pidpal.scrapers.scrape_all  # noqa: F401
+
+    return DriverPool(workers, headless=headless, profiles=profiles, max_parcels=max_parcels,
+                      max_memory_mb=max_memory_mb, network_log=network_log)
+
+
+def scrape_records(records, db_path, workers, batch_size=DEFAULT_BATCH_SIZE,
+                   screenshot_dir="Screenshots", headless=True, tabs=1, profiles=None, pool=None,
+                   capture_network=False):
+    """
+    Scrapes `records` (batch_records dicts) on `workers` threads, each on a driver from `pool`
+    (or from a pool of its own, see start_pool, closed at the end) with `tabs` tabs for the
+    scrapers that pipeline parcels (and CPT values read from the portal's JSON, with
+    capture_network=True and a pool started with network_log=True),
+    cleaning and inserting results (and ScrapeFailures rows) into db_path as they come in.
+    Emits "progress" events. Returns (parcels scraped, parcels without a result, records
+    deferred because their site's circuit breaker was open, {failure class: parcels}).
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = start_pool(workers, headless, profiles, network_log=capture_network)
+    try:
+        return _scrape_records(records, db_path, workers, batch_size, screenshot_dir, pool,
+                               tabs=tabs, capture_network=capture_network)
+    finally:
+        if own_pool:
+            pool.close()
+
+
+def _scrape_records(records, db_path, workers, batch_size, screenshot_dir, pool, **scrape_args):
+    jobs = queue.Queue()
+    results = queue.Queue()
+    batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+    for batch in batches:
+        jobs.put(batch)
+    threads = []
+    for i in range(max(1, min(workers, len(batches)))):
+        jobs.put(None)
+        thread = threading.Thread(
+            target=_scrape_worker, args=(jobs, results, screenshot_dir, pool), kwargs=scrape_args,
+            name=f"scrape-{i}", daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+
+    places = {record["ParcelID"]: (record["County"], record["State"]) for record in records}
+    pending = []
+    pending_failures = []
+    deferred = []
+    failure_counts = {}
+    done = scraped = 0
+    start = time.perf_counter()
+
+    def flush():
+        if pending:
+            insert_scraped_data(DataBatch.from_objects(pending, places), db_path=db_path)
+            pending.clear()
+        if pending_failures:
+            insert_scrape_failures(pending_failures, db_path=db_path)
+            pending_failures.clear()
+
+    for _ in batches:
+        batch, batch_scraped, batch_deferred, batch_failures, error = results.get()
+        done += len(batch)
+        scraped += len(batch_scraped)
+        pending.extend(batch_scraped)
+        deferred.extend(batch_deferred)
+        pending_failures.extend(batch_failures)
+        for failure in batch_failures:
+            failure_counts[failure["Class"]] = failure_counts.get(failure["Class"], 0) + 1
+        if error:
+            emit("error", stage="scrape", message=error, parcels=[record["ParcelID"] for record in batch])
+        if batch_deferred:
+            emit("deferred", stage="scrape", parcels=[record["ParcelID"] for record in batch_deferred])
+        if len(pending) + len(pending_failures) >= FLUSH_SIZE:
+            flush()
+        elapsed = time.perf_counter() - start
+        emit("progress", stage="scrape", done=done, total=len(records), scraped=scraped,
+             failed=done - scraped - len(deferred), deferred=len(deferred), elapsed=round(elapsed, 3),
+             parcels_per_second=round(done / elapsed, 3) if elapsed else None)
+    flush()
+
+    for thread in threads:
+        thread.join()
+    return scraped, len(records) - scraped - len(deferred), deferred, failure_counts
+
+
+def run(args):
+    stages = {}
+    started = time.perf_counter()
+    emit("start", input=args.input, retry=args.retry, db=args.db, workers=args.workers,
+         freshness=args.freshness, max_age_days=args.max_age_days, export=args.export)
+
+    # 1) Import and check the spreadsheet (or the failures to retry)
+    t = time.perf_counter()
+    if args.retry:
+        checked = check_parcel_batch(records_batch(scrape_failures(args.classes, args.db)))
+    else:
+        checked = check_parcel_batch(load_parcel_batch(args.input))
+    valid, rejected = valid_rows(checked), rejected_rows(checked)
+    if args.rejected and len(rejected):
+        rejected.to_csv(args.rejected, index=False)
+    to_scrape, fresh = select_for_scrape(valid, args.freshness, args.max_age_days, args.db)
+    # Rows of the same county next to each other, so each batch stays on one site
+    to_scrape = to_scrape.sort_values("ScraperKey", kind="stable")
+    stages["import"] = time.perf_counter() - t
+    emit("import", rows=len(checked), valid=len(valid), rejected=len(rejected),
+         skipped_fresh=fresh, to_scrape=len(to_scrape), seconds=round(stages["import"], 3))
+
+    # The browsers start while the rows are registered
+    records = batch_records(to_scrape)
+    batches = -(-len(records) // args.batch_size)
+    pool = start_pool(min(args.workers, batches), not args.no_headless, args.profiles,
+                      args.recycle_parcels, args.max_memory_mb, args.cpt_network) if records else None
+    drivers = None
+    try:
+        # 2) Register every valid row (fresh ones too, so Owner/PropertyID changes land)
+        t = time.perf_counter()
+        insert_initial_parcels(batch_records(valid), db_path=args.db)
+        stages["insert_initial"] = time.perf_counter() - t
+
+        # 3) Scrape, clean and insert
+        t = time.perf_counter()
+        scraped, failed, deferred, failure_counts = scrape_records(
+            records, args.db, args.workers, args.batch_size, args.screenshots, tabs=args.tabs, pool=pool,
+            capture_network=args.cpt_network
+        ) if records else (0, 0, [], {})
+        stages["scrape"] = time.perf_counter() - t
+    finally:
+        if pool is not None:
+            drivers = pool.status()
+            pool.close()
+    if args.deferred and deferred:
+        # Same layout as the input, so the file can be run again as is
+        pd.DataFrame.from_records(deferred, columns=IMPORT_COLUMNS).to_csv(args.deferred, index=False)
+
+    # 4) Index and summarize the new parcels in one pass (the writers leave that to the first read)
+    t = time.perf_counter()
+    sync_derived_tables(args.db)
+    stages["index"] = time.perf_counter() - t
+
+    # 5) Export
+    exported = None
+    if args.export:
+        t = time.perf_counter()
+        exported = export_parcels(args.export, db_path=args.db)
+        stages["export"] = time.perf_counter() - t
+        emit("export", path=args.export, rows=exported, seconds=round(stages["export"], 3))
+
+    elapsed = time.perf_counter() - started
+    emit(
+        "summary",
+        rows=len(checked), rejected=len(rejected), skipped_fresh=fresh,
+        attempted=len(records), scraped=scraped, failed=failed, deferred=len(deferred),
+        failure_classes=failure_counts, exported=exported, cache=cache_stats().summary(),
+        drivers=drivers,
+        seconds=round(elapsed, 3),
+        stage_seconds={stage: round(seconds, 3) for stage, seconds in stages.items()},
+        scrape_parcels_per_second=round(len(records) / stages["scrape"], 3) if records and stages["scrape"] else None,
+        parcels_per_second=round(len(checked) / elapsed, 3) if elapsed else None,
+    )
+    return 1 if (failed or deferred) and not scraped else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pidpal.cli",
+        description="Import, scrape and store parcels without the GUI (JSON-lines progress on stdout)."
+    )
+    parser.add_argument("input", nargs="?",
+                        help=f"parcel spreadsheet ({', '.join(IMPORT_FORMATS)}) in the template layout")
+    parser.add_argument("--retry", action="store_true",
+                        help="instead of a spreadsheet, scrape the parcels in the DB's ScrapeFailures "
+                             "table again (only the --classes given)")
+    parser.add_argument("--classes", default=",".join(RETRYABLE_CLASSES),
+                        help=f"failure classes --retry re-runs, comma-separated, from {', '.join(FAILURE_CLASSES)} "
+                             f"(default {','.join(RETRYABLE_CLASSES)})")
+    parser.add_argument("--db", default=DB_PATH, help=f"SQLite database to write (default {DB_PATH})")
+    parser.add_argument("--workers", type=int, default=1, help="parallel browsers (default 1)")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help="tabs per browser: load the next parcels' search pages while one is "
+                             "searched and read; searches still run one at a time (default 1)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"parcels per worker hand-off (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--freshness", choices=FRESHNESS_POLICIES, default="always",
+                        help="always scrape, only never-scraped parcels, or never-scraped and stale ones")
+    parser.add_argument("--max-age-days", type=float, default=30,
+                        help="age after which a parcel is stale (--freshness stale, default 30)")
+    parser.add_argument("--export", help="write the DB's parcels to this .csv/.xlsx/.parquet file at the end")
+    parser.add_argument("--rejected", help="write rows that failed the ParcelID checks to this CSV")
+    parser.add_argument("--deferred", help="write rows deferred because their county site was down to this "
+                                           "CSV (in the input layout, to run again later)")
+    parser.add_argument("--cpt-network", action="store_true",
+                        help="read CPT parcel values from the portal's JSON responses instead of its "
+                             "Appraisal Summary tab")
+    parser.add_argument("--recycle-parcels", type=int, default=MAX_PARCELS,
+                        help=f"parcels a browser handles before it is replaced (default {MAX_PARCELS})")
+    parser.add_argument("--max-memory-mb", type=float, default=MAX_MEMORY_MB,
+                        help=f"replace a browser whose Chrome processes use over this (default {MAX_MEMORY_MB} MB)")
+    parser.add_argument("--profiles", nargs="?", const=PROFILE_ROOT,
+                        help="keep each browser's cache and cookies between runs, in a profile per worker "
+                             f"under this folder (default {PROFILE_ROOT})")
+    parser.add_argument("--screenshots", default="Screenshots", help="screenshot folder (default Screenshots)")
+    parser.add_argument("--no-headless", action="store_true", help="show the browser windows")
+    args = parser.parse_args(argv)
+
+    if args.retry:
+        if args.input:
+            parser.error("give either an input file or --retry, not both")
+        args.classes = [name.strip() for name in args.classes.split(",") if name.strip()]
+        unknown = set(args.classes) - set(FAILURE_CLASSES)
+        if unknown or not args.classes:
+            parser.error(f"--classes must be from {', '.join(FAILURE_CLASSES)}")
+    elif not args.input:
+        parser.error("an input file (or --retry) is required")
+    elif not os.path.isfile(args.input):
+        parser.error(f"input file not found: {args.input}")
+    elif os.path.splitext(args.input)[1].lower() not in IMPORT_FORMATS:
+        parser.error(f"input must be one of {', '.join(IMPORT_FORMATS)}")
+    if args.workers < 1 or args.batch_size < 1 or args.tabs < 1 or args.recycle_parcels < 1:
+        parser.error("--workers, --tabs, --batch-size and --recycle-parcels must be at least 1")
+    if args.export:
+        try:
+            export_format(args.export)
+        except ValueError as e:
+            parser.error(str(e))
+    db_dir = os.path.dirname(os.path.abspath(args.db))
+    if not os.path.isdir(db_dir):
+        parser.error(f"DB folder does not exist: {db_dir}")
+    return args
+
+
+def main(argv=None):
+    global _events
+    args = parse_args(argv)
+    # Only the JSON lines go to stdout: the scrapers, circuit breakers and driver pool print()
+    # their progress, from every thread, which would corrupt them
+    _events = sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            return run(args)
+    except Exception as e:
+        traceback.print_exc(file=sys.stderr)
+        emit("failed", message=f"{type(e).__name__}: {e}")
+        return 1
+    finally:
+        _events = None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,137 +1,893 @@
 # A module for functions (an other doodads as arises)
 import os
+import re
+import json
 import sqlite3
 import datetime
+import threading
+from operator import itemgetter
+from collections import OrderedDict
 
-def insert_initial_parcels(data_list, db_path=r"Database\master.db"):
+# Rows per transaction for the bulk writers. Large enough that a 100k-row import
+# is only a handful of commits, small enough that a failure mid-import doesn't
+# hold a giant journal open.
+CHUNK_SIZE = 10000
+
+
+def _chunked(iterable, size):
+    """Yields lists of up to `size` items from any iterable."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# The original Database/create_database.py tables plus the ones added since. All of it is
+# IF NOT EXISTS so it can run against the shipped master.db or a brand new file.
+SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS Parcels (
+        ParcelID TEXT PRIMARY KEY,
+        State TEXT,
+        County TEXT,
+        LandValue TEXT,
+        BuildingValue TEXT,
+        TotalValue TEXT,
+        AssessmentYear TEXT,
+        LastScraped TEXT,
+        ScreenshotPath TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS Properties (
+        PropertyID TEXT PRIMARY KEY,
+        Owner TEXT,
+        ParcelID TEXT NOT NULL,
+        FOREIGN KEY (ParcelID) REFERENCES Parcels(ParcelID)
+    );
+
+    -- Append-only history: one row per parcel per scrape, never updated or replaced
+    CREATE TABLE IF NOT EXISTS ParcelValuations (
+        ParcelID TEXT NOT NULL,
+        AssessmentYear INTEGER,
+        ScrapedAt TEXT NOT NULL,
+        LandValue REAL,
+        BuildingValue REAL,
+        TotalValue REAL,
+        ScreenshotPath TEXT
+    );
+
+    -- One row per parcel, year and scrape. A missing year counts as 0 here, as NULLs are never
+    -- equal to each other in a UNIQUE constraint and a yearless scrape would be kept twice.
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_ParcelValuations_scrape
+        ON ParcelValuations (ParcelID, IFNULL(AssessmentYear, 0), ScrapedAt);
+
+    -- Covering index for "latest row per parcel (as of a date / for a year)": the lookup is a
+    -- seek to ParcelID and a backwards walk over ScrapedAt without touching the table
+    CREATE INDEX IF NOT EXISTS idx_ParcelValuations_latest
+        ON ParcelValuations (ParcelID, ScrapedAt, AssessmentYear, LandValue, BuildingValue, TotalValue);
+
+    -- Join / filter / keyset-pagination support
+    CREATE INDEX IF NOT EXISTS idx_Properties_ParcelID ON Properties (ParcelID);
+    CREATE INDEX IF NOT EXISTS idx_Parcels_State ON Parcels (State, ParcelID);
+    CREATE INDEX IF NOT EXISTS idx_Parcels_County ON Parcels (County, ParcelID);
+
+    -- The last failed scrape of each parcel (see pidpal/scrapers/failures.py for the classes),
+    -- removed when the parcel is scraped successfully
+    CREATE TABLE IF NOT EXISTS ScrapeFailures (
+        ParcelID TEXT PRIMARY KEY,
+        County TEXT,
+        State TEXT,
+        Class TEXT NOT NULL,
+        Step TEXT,
+        Message TEXT,
+        Attempts INTEGER NOT NULL DEFAULT 1,
+        FirstFailed TEXT NOT NULL,
+        LastFailed TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_ScrapeFailures_Class ON ScrapeFailures (Class, ParcelID);
+
+    CREATE VIEW IF NOT EXISTS CurrentValuations AS
+        SELECT v.*
+        FROM ParcelValuations v
+        WHERE v.rowid = (
+            SELECT v2.rowid FROM ParcelValuations v2
+            WHERE v2.ParcelID = v.ParcelID
+            ORDER BY v2.ScrapedAt DESC
+            LIMIT 1
+        );
+'''
+
+
+# Full-text search over ParcelID, Owner, County and PropertyID. There is one search document per
+# row of Parcels LEFT JOIN Properties (a parcel document, plus one per property). ParcelSearch
+# (unicode61 tokens, with prefix indexes) serves word and prefix searches; ParcelSearchTrigram
+# serves substring searches.
+#
+# The bulk writers don't touch any of it: indexing 100k rows into both FTS tables takes several
+# times as long as the import itself. ParcelSearchSources records, per source table, the rowid
+# through which rows have been queued as documents; sync_search_index() queues every row above
+# it in ParcelSearchDocs (AUTOINCREMENT DocIDs above ParcelSearchState.IndexedThrough) and
+# indexes the queue, set-based, in one pass. It runs before a search reads the index, and once
+# at the end of a CLI run. Upserts that only update a row keep its rowid. The triggers below
+# handle the rare changes of a searchable column of an already queued row (skipping upserts
+# that don't change one) and removals.
+SEARCH_TABLES = ("ParcelSearch", "ParcelSearchTrigram")
+
+# Source table -> the columns of its search documents (ParcelID, PropertyID)
+SEARCH_SOURCES = {"Parcels": "ParcelID, NULL", "Properties": "ParcelID, PropertyID"}
+
+
+def _search_remove_sql(docs_where):
+    """Trigger body statements that remove the search documents matching `docs_where`."""
+    statements = [
+        f"DELETE FROM {table} WHERE rowid IN (SELECT DocID FROM ParcelSearchDocs WHERE {docs_where});"
+        for table in SEARCH_TABLES
+    ]
+    statements.append(f"DELETE FROM ParcelSearchDocs WHERE {docs_where};")
+    return "\n        ".join(statements)
+
+
+def _queued_through(source):
+    """SQL for the rowid through which `source`'s rows have been queued as search documents."""
+    return f"(SELECT QueuedThrough FROM ParcelSearchSources WHERE SourceTable = '{source}')"
+
+
+def _search_forget_sql(source):
+    """
+    Trigger body statement for a removal from `source`: if its last queued rows are gone, the
+    mark goes back to the highest remaining rowid, so a reused rowid is queued again.
+    """
+    return f'''UPDATE ParcelSearchSources SET QueuedThrough = (SELECT IFNULL(MAX(rowid), 0) FROM {source})
+        WHERE SourceTable = '{source}' AND QueuedThrough > (SELECT IFNULL(MAX(rowid), 0) FROM {source});'''
+
+
+SEARCH_SCHEMA_SQL = f"""
+    CREATE TABLE IF NOT EXISTS ParcelSearchDocs (
+        DocID INTEGER PRIMARY KEY AUTOINCREMENT,
+        ParcelID TEXT NOT NULL,
+        PropertyID TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_ParcelSearchDocs_ParcelID ON ParcelSearchDocs (ParcelID);
+    CREATE INDEX IF NOT EXISTS idx_ParcelSearchDocs_PropertyID ON ParcelSearchDocs (PropertyID);
+
+    CREATE TABLE IF NOT EXISTS ParcelSearchState (
+        IndexedThrough INTEGER NOT NULL
+    );
+    INSERT INTO ParcelSearchState (IndexedThrough)
+        SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM ParcelSearchState);
+
+    -- Existing rows were queued when the documents were seeded (or by the writers before)
+    CREATE TABLE IF NOT EXISTS ParcelSearchSources (
+        SourceTable TEXT PRIMARY KEY,
+        QueuedThrough INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO ParcelSearchSources (SourceTable, QueuedThrough)
+        SELECT 'Parcels', IFNULL(MAX(rowid), 0) FROM Parcels
+        UNION ALL
+        SELECT 'Properties', IFNULL(MAX(rowid), 0) FROM Properties;
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS ParcelSearch USING fts5(
+        ParcelID, Owner, County, PropertyID,
+        tokenize = 'unicode61', prefix = '2 3'
+    );
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS ParcelSearchTrigram USING fts5(
+        ParcelID, Owner, County, PropertyID,
+        tokenize = 'trigram'
+    );
+
+    -- Queued by sync_search_index instead (databases created before kept these, and the older
+    -- versions of the triggers below)
+    DROP TRIGGER IF EXISTS trg_Parcels_search_insert;
+    DROP TRIGGER IF EXISTS trg_Properties_search_insert;
+    DROP TRIGGER IF EXISTS trg_Parcels_search_update;
+    DROP TRIGGER IF EXISTS trg_Parcels_search_delete;
+    DROP TRIGGER IF EXISTS trg_Properties_search_update;
+    DROP TRIGGER IF EXISTS trg_Properties_search_delete;
+
+    -- Rows not queued yet get their documents from sync_search_index, with their new values
+    CREATE TRIGGER trg_Parcels_search_update AFTER UPDATE OF ParcelID, County ON Parcels
+    WHEN (OLD.ParcelID IS NOT NEW.ParcelID OR OLD.County IS NOT NEW.County)
+        AND OLD.rowid <= {_queued_through("Parcels")} BEGIN
+        {_search_remove_sql("ParcelID = OLD.ParcelID")}
+        INSERT INTO ParcelSearchDocs (ParcelID, PropertyID)
+            SELECT NEW.ParcelID, NULL
+            UNION ALL
+            SELECT ParcelID, PropertyID FROM Properties
+            WHERE ParcelID = NEW.ParcelID AND rowid <= {_queued_through("Properties")};
+    END;
+
+    CREATE TRIGGER trg_Parcels_search_delete AFTER DELETE ON Parcels BEGIN
+        {_search_remove_sql("ParcelID = OLD.ParcelID")}
+        {_search_forget_sql("Parcels")}
+    END;
+
+    CREATE TRIGGER trg_Properties_search_update AFTER UPDATE OF PropertyID, Owner, ParcelID ON Properties
+    WHEN (OLD.PropertyID IS NOT NEW.PropertyID OR OLD.Owner IS NOT NEW.Owner OR OLD.ParcelID IS NOT NEW.ParcelID)
+        AND OLD.rowid <= {_queued_through("Properties")} BEGIN
+        {_search_remove_sql("PropertyID = OLD.PropertyID")}
+        INSERT INTO ParcelSearchDocs (ParcelID, PropertyID) VALUES (NEW.ParcelID, NEW.PropertyID);
+    END;
+
+    CREATE TRIGGER trg_Properties_search_delete AFTER DELETE ON Properties BEGIN
+        {_search_remove_sql("PropertyID = OLD.PropertyID")}
+        {_search_forget_sql("Properties")}
+    END;
+"""
+
+
+def sync_search_index(conn):
+    """
+    Queues a search document for every Parcels and Properties row added since the last sync
+    (rowids above ParcelSearchSources.QueuedThrough), then indexes all queued documents, in one
+    INSERT ... SELECT per table. Runs inside the caller's transaction when there is one;
+    otherwise it opens and commits its own.
+    """
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+    for source, columns in SEARCH_SOURCES.items():
+        queued = conn.execute(
+            "SELECT QueuedThrough FROM ParcelSearchSources WHERE SourceTable = ?", (source,)
+        ).fetchone()[0]
+        last = conn.execute(f"SELECT IFNULL(MAX(rowid), 0) FROM {source}").fetchone()[0]
+        if last > queued:
+            conn.execute(f'''
+                INSERT INTO ParcelSearchDocs (ParcelID, PropertyID)
+                SELECT {columns} FROM {source} WHERE rowid > ? AND rowid <= ?
+            ''', (queued, last))
+            conn.execute("UPDATE ParcelSearchSources SET QueuedThrough = ? WHERE SourceTable = ?", (last, source))
+
+    indexed = conn.execute("SELECT IndexedThrough FROM ParcelSearchState").fetchone()[0]
+    latest = conn.execute("SELECT IFNULL(MAX(DocID), 0) FROM ParcelSearchDocs").fetchone()[0]
+
+    if latest > indexed:
+        for table in SEARCH_TABLES:
+            conn.execute(f'''
+                INSERT INTO {table} (rowid, ParcelID, Owner, County, PropertyID)
+                SELECT d.DocID, p.ParcelID, pr.Owner, p.County, pr.PropertyID
+                FROM ParcelSearchDocs d
+                JOIN Parcels p ON p.ParcelID = d.ParcelID
+                LEFT JOIN Properties pr ON pr.PropertyID = d.PropertyID
+                WHERE d.DocID > ? AND d.DocID <= ?
+            ''', (indexed, latest))
+        conn.execute("UPDATE ParcelSearchState SET IndexedThrough = ?", (latest,))
+
+    if own_transaction:
+        conn.commit()
+
+
+# Materialized roll-ups for the analytics module: one ValueSummaries row per Owner, County and
+# State with counts, sums and min/max of the current (Parcels) values. Like the search index,
+# they are brought up to date before they're read rather than by the bulk writers: recomputing
+# the groups an import touches takes longer than the import itself. SummarySources records,
+# per source table, the rowid through which rows have been summarized, so the rows added since
+# are found by rowid range, and insert_scraped_data queues the ParcelIDs of each chunk it
+# writes in SummaryScrapes (one JSON array per chunk). The triggers below mark the groups a
+# summarized row leaves (its County, State, Owner or ParcelID changes, or it is removed) in
+# StaleSummaries. sync_value_summaries() recomputes just those groups, in one pass. Percentiles can't be kept incrementally, so pidpal.analytics
+# computes those from the parcel values on demand.
+SUMMARY_GROUPS = ("Owner", "County", "State")
+
+SUMMARY_SOURCES = ("Parcels", "Properties")
+
+
+def _summarized_through(source):
+    """SQL for the rowid through which `source`'s rows are in ValueSummaries."""
+    return f"(SELECT SummarizedThrough FROM SummarySources WHERE SourceTable = '{source}')"
+
+
+def _summary_forget_sql(source):
+    """
+    Trigger body statement for a removal from `source`: if its last summarized rows are gone,
+    the mark goes back to the highest remaining rowid, so a reused rowid is summarized again.
+    """
+    return f'''UPDATE SummarySources SET SummarizedThrough = (SELECT IFNULL(MAX(rowid), 0) FROM {source})
+        WHERE SourceTable = '{source}' AND SummarizedThrough > (SELECT IFNULL(MAX(rowid), 0) FROM {source});'''
+
+
+SUMMARY_SCHEMA_SQL = f'''
+    CREATE TABLE IF NOT EXISTS ValueSummaries (
+        GroupBy TEXT NOT NULL,          -- 'Owner', 'County' or 'State'
+        GroupKey TEXT NOT NULL,         -- '' for parcels with no Owner/County/State
+        ParcelCount INTEGER NOT NULL,
+        ValuedCount INTEGER NOT NULL,   -- parcels with a scraped TotalValue
+        LandValue REAL,
+        BuildingValue REAL,
+        TotalValue REAL,
+        MinTotalValue REAL,
+        MaxTotalValue REAL,
+        RefreshedAt TEXT,
+        PRIMARY KEY (GroupBy, GroupKey)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_Properties_Owner ON Properties (Owner, ParcelID);
+
+    -- Existing rows are summarized (ValueSummaries is built from every parcel when it's new)
+    CREATE TABLE IF NOT EXISTS SummarySources (
+        SourceTable TEXT PRIMARY KEY,
+        SummarizedThrough INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO SummarySources (SourceTable, SummarizedThrough)
+        SELECT 'Parcels', IFNULL(MAX(rowid), 0) FROM Parcels
+        UNION ALL
+        SELECT 'Properties', IFNULL(MAX(rowid), 0) FROM Properties;
+
+    CREATE TABLE IF NOT EXISTS SummaryScrapes (
+        ParcelIDs TEXT NOT NULL         -- JSON array
+    );
+
+    -- No key: in a trigger fired by an upsert, INSERT OR IGNORE takes on the upsert's conflict
+    -- handling, so a group can be listed more than once
+    CREATE TABLE IF NOT EXISTS StaleSummaries (
+        GroupBy TEXT NOT NULL,
+        GroupKey TEXT NOT NULL
+    );
+
+    -- Rows not summarized yet are picked up by sync_value_summaries with their new values. The
+    -- upserts skip rows that don't change, so a re-import of the same data fires none of these.
+    CREATE TRIGGER IF NOT EXISTS trg_Parcels_summary_update AFTER UPDATE OF ParcelID, County, State ON Parcels
+    WHEN (OLD.ParcelID IS NOT NEW.ParcelID OR OLD.County IS NOT NEW.County OR OLD.State IS NOT NEW.State)
+        AND OLD.rowid <= {_summarized_through("Parcels")} BEGIN
+        INSERT INTO StaleSummaries (GroupBy, GroupKey) VALUES
+            ('County', IFNULL(OLD.County, '')), ('State', IFNULL(OLD.State, '')),
+            ('County', IFNULL(NEW.County, '')), ('State', IFNULL(NEW.State, ''));
+        INSERT INTO StaleSummaries (GroupBy, GroupKey)
+            SELECT 'Owner', IFNULL(Owner, '') FROM Properties
+            WHERE ParcelID IN (OLD.ParcelID, NEW.ParcelID) AND OLD.ParcelID IS NOT NEW.ParcelID;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_Parcels_summary_delete AFTER DELETE ON Parcels
+    WHEN OLD.rowid <= {_summarized_through("Parcels")} BEGIN
+        INSERT INTO StaleSummaries (GroupBy, GroupKey) VALUES
+            ('County', IFNULL(OLD.County, '')), ('State', IFNULL(OLD.State, ''));
+        INSERT INTO StaleSummaries (GroupBy, GroupKey)
+            SELECT 'Owner', IFNULL(Owner, '') FROM Properties WHERE ParcelID = OLD.ParcelID;
+        {_summary_forget_sql("Parcels")}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_Properties_summary_update AFTER UPDATE OF Owner, ParcelID ON Properties
+    WHEN (OLD.Owner IS NOT NEW.Owner OR OLD.ParcelID IS NOT NEW.ParcelID)
+        AND OLD.rowid <= {_summarized_through("Properties")} BEGIN
+        INSERT INTO StaleSummaries (GroupBy, GroupKey) VALUES
+            ('Owner', IFNULL(OLD.Owner, '')), ('Owner', IFNULL(NEW.Owner, ''));
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_Properties_summary_delete AFTER DELETE ON Properties
+    WHEN OLD.rowid <= {_summarized_through("Properties")} BEGIN
+        INSERT INTO StaleSummaries (GroupBy, GroupKey) VALUES ('Owner', IFNULL(OLD.Owner, ''));
+        {_summary_forget_sql("Properties")}
+    END;
+'''
+
+
+def sql_number(column):
+    """
+    SQL expression reading a scraped value column (stored as TEXT, e.g. "61,000.0" or "$61,000")
+    as REAL. Empty/NULL stays NULL.
+    """
+    return f"CAST(NULLIF(REPLACE(REPLACE(TRIM({column}), '$', ''), ',', ''), '') AS REAL)"
+
+
+def _summary_select(group_by, where=None):
+    """SELECT producing ValueSummaries rows for `group_by`, limited to `where` when given."""
+    if group_by == "Owner":
+        # An owner holds a parcel once, however many of its properties they own
+        source = '''
+            SELECT DISTINCT IFNULL(pr.Owner, '') AS GroupKey, p.ParcelID,
+                   p.LandValue, p.BuildingValue, p.TotalValue
+            FROM Properties pr
+            JOIN Parcels p ON p.ParcelID = pr.ParcelID
+        '''
+        column = "pr.Owner"
+    else:
+        source = f'''
+            SELECT IFNULL({group_by}, '') AS GroupKey, ParcelID,
+                   LandValue, BuildingValue, TotalValue
+            FROM Parcels
+        '''
+        column = group_by
+
+    if where:
+        source += " WHERE " + where.format(column=column)
+
+    return f'''
+        SELECT ?, GroupKey, COUNT(*), COUNT({sql_number("TotalValue")}),
+               SUM({sql_number("LandValue")}), SUM({sql_number("BuildingValue")}),
+               SUM({sql_number("TotalValue")}),
+               MIN({sql_number("TotalValue")}), MAX({sql_number("TotalValue")}), ?
+        FROM ({source})
+        GROUP BY GroupKey
+    '''
+
+
+def _summary_marks(conn):
+    """{source table: (rowid summarized through, current highest rowid)}"""
+    marks = dict(conn.execute("SELECT SourceTable, SummarizedThrough FROM SummarySources"))
+    return {
+        source: (marks.get(source, 0), conn.execute(f"SELECT IFNULL(MAX(rowid), 0) FROM {source}").fetchone()[0])
+        for source in SUMMARY_SOURCES
+    }
+
+
+def _stage_summary_groups(conn, marks):
+    """
+    Adds to StaleSummaries the groups of the rows written since the marks: the County, State
+    and Owners of new Parcels rows and of the parcels queued in SummaryScrapes, and the Owners
+    of new Properties rows.
+    """
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS SummaryParcels (ParcelID TEXT PRIMARY KEY)")
+    conn.execute('''
+        INSERT OR IGNORE INTO temp.SummaryParcels (ParcelID)
+        SELECT ParcelID FROM Parcels WHERE rowid > ? AND rowid <= ?
+        UNION ALL
+        SELECT j.value FROM SummaryScrapes s, json_each(s.ParcelIDs) j
+    ''', marks["Parcels"])
+    conn.execute('''
+        INSERT INTO StaleSummaries (GroupBy, GroupKey)
+        SELECT 'County', IFNULL(County, '') FROM Parcels WHERE ParcelID IN temp.SummaryParcels
+        UNION
+        SELECT 'State', IFNULL(State, '') FROM Parcels WHERE ParcelID IN temp.SummaryParcels
+        UNION
+        SELECT 'Owner', IFNULL(Owner, '') FROM Properties WHERE ParcelID IN temp.SummaryParcels
+        UNION
+        SELECT 'Owner', IFNULL(Owner, '') FROM Properties WHERE rowid > ? AND rowid <= ?
+    ''', marks["Properties"])
+    conn.execute("DELETE FROM temp.SummaryParcels")
+
+
+def refresh_value_summaries(conn, staged_only=False):
+    """
+    Recomputes ValueSummaries: every group, or with staged_only=True just the groups that are
+    out of date (see _stage_summary_groups and the StaleSummaries triggers). A load that added
+    as many rows as the summaries cover is refreshed in full either way. Runs in the caller's
+    transaction; the caller commits.
+    """
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    marks = _summary_marks(conn)
+
+    new_rows = sum(last - summarized for summarized, last in marks.values())
+    new_rows += conn.execute("SELECT IFNULL(SUM(json_array_length(ParcelIDs)), 0) FROM SummaryScrapes").fetchone()[0]
+    if staged_only and new_rows * 2 > marks["Parcels"][1]:
+        staged_only = False
+
+    if not staged_only:
+        conn.execute("DELETE FROM ValueSummaries")
+        for group_by in SUMMARY_GROUPS:
+            conn.execute(f"INSERT INTO ValueSummaries {_summary_select(group_by)}", (group_by, now))
+    else:
+        _stage_summary_groups(conn, marks)
+        conn.execute('''
+            DELETE FROM ValueSummaries
+            WHERE (GroupBy, GroupKey) IN (SELECT GroupBy, GroupKey FROM StaleSummaries)
+        ''')
+        for group_by in SUMMARY_GROUPS:
+            keys = "SELECT GroupKey FROM StaleSummaries WHERE GroupBy = '%s'" % group_by
+            where = "{column} IN (" + keys + ")"
+            # Parcels with no County/State/Owner are summarized under ''
+            has_blank = conn.execute(
+                "SELECT 1 FROM StaleSummaries WHERE GroupBy = ? AND GroupKey = ''", (group_by,)
+            ).fetchone()
+            if has_blank:
+                where = "(" + where + " OR {column} IS NULL)"
+            conn.execute(f"INSERT INTO ValueSummaries {_summary_select(group_by, where)}", (group_by, now))
+
+    conn.execute("DELETE FROM StaleSummaries")
+    conn.execute("DELETE FROM SummaryScrapes")
+    conn.executemany(
+        "UPDATE SummarySources SET SummarizedThrough = ? WHERE SourceTable = ?",
+        [(last, source) for source, (summarized, last) in marks.items()]
+    )
+
+
+def sync_value_summaries(conn):
+    """
+    Brings ValueSummaries up to date with the writes since the last sync (a no-op when there
+    are none). Runs inside the caller's transaction when there is one; otherwise it opens and
+    commits its own.
+    """
+    marks = _summary_marks(conn)
+    stale = conn.execute(
+        "SELECT 1 FROM StaleSummaries UNION ALL SELECT 1 FROM SummaryScrapes LIMIT 1"
+    ).fetchone()
+    if not stale and all(last == summarized for summarized, last in marks.values()):
+        return
+
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+    refresh_value_summaries(conn, staged_only=True)
+
+    if own_transaction:
+        conn.commit()
+
+
+# db paths whose schema has already been checked in this process
+_schema_ready = set()
+
+
+def ensure_schema(conn, db_path):
+    """
+    Creates any missing tables/indexes from SCHEMA_SQL, SEARCH_SCHEMA_SQL and SUMMARY_SCHEMA_SQL
+    (once per db_path per process). Tables that are new to an existing database are seeded from
+    it: the first ParcelValuations row of each parcel is its current Parcels values, and the
+    search indexes and value summaries are built from every existing parcel. Duplicate yearless
+    history rows left by older databases are removed before idx_ParcelValuations_scrape is made.
+    """
+    key = os.path.abspath(db_path)
+    if key in _schema_ready:
+        return
+
+    existing = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    had_history = "ParcelValuations" in existing
+
+    if had_history and not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_ParcelValuations_scrape'"
+    ).fetchone():
+        # Databases from before idx_ParcelValuations_scrape may hold a yearless scrape twice
+        conn.execute('''
+            DELETE FROM ParcelValuations
+            WHERE AssessmentYear IS NULL AND rowid NOT IN (
+                SELECT MIN(rowid) FROM ParcelValuations WHERE AssessmentYear IS NULL
+                GROUP BY ParcelID, ScrapedAt
+            )
+        ''')
+
+    conn.executescript(SCHEMA_SQL)
+    conn.executescript(SEARCH_SCHEMA_SQL)
+    conn.executescript(SUMMARY_SCHEMA_SQL)
+
+    if "ParcelSearchDocs" not in existing:
+        conn.execute('''
+            INSERT INTO ParcelSearchDocs (ParcelID, PropertyID)
+            SELECT ParcelID, NULL FROM Parcels
+            UNION ALL
+            SELECT ParcelID, PropertyID FROM Properties
+        ''')
+        sync_search_index(conn)
+
+    if not had_history:
+        conn.execute('''
+            INSERT OR IGNORE INTO ParcelValuations (
+                ParcelID, AssessmentYear, ScrapedAt, LandValue, BuildingValue, TotalValue, ScreenshotPath
+            )
+            SELECT ParcelID, AssessmentYear, LastScraped, LandValue, BuildingValue, TotalValue, ScreenshotPath
+            FROM Parcels
+            WHERE LastScraped IS NOT NULL
+        ''')
+
+    if "ValueSummaries" not in existing:
+        refresh_value_summaries(conn)
+    conn.commit()
+
+    _schema_ready.add(key)
+
+
+# Secondary indexes insert_initial_parcels drops for a load bigger than the table it goes into
+# and rebuilds at the end: building one from sorted rows is several times faster than an index
+# insert per row. SCHEMA_SQL/SUMMARY_SCHEMA_SQL create them again if an import never finished.
+BULK_LOAD_INDEXES = ("idx_Parcels_State", "idx_Parcels_County", "idx_Properties_ParcelID", "idx_Properties_Owner")
+
+
+def _create_indexes(conn):
+    conn.executescript(SCHEMA_SQL)
+    conn.executescript(SUMMARY_SCHEMA_SQL)
+
+
+def insert_initial_parcels(data_list, db_path=r"Database\master.db", chunk_size=CHUNK_SIZE):
     """
     Inserts initial parcel data (from the UI table) into the Parcels and Properties tables.
     This function is called before starting the scraping.
+
+    Rows are upserted with executemany in chunks of `chunk_size`, one transaction per chunk.
+    Existing parcels keep their scraped values; only State/County (and Owner/ParcelID for
+    Properties) are refreshed, and rows where those don't change aren't written at all. The
+    search index and ValueSummaries catch up on the new rows when they're next read.
     """
     conn = sqlite3.connect(db_path)
+    ensure_schema(conn, db_path)
     cursor = conn.cursor()
-    
-    for data in data_list:
+
+    if not isinstance(data_list, (list, tuple)):
+        data_list = list(data_list)
+    existing = conn.execute("SELECT IFNULL(MAX(rowid), 0) FROM Parcels").fetchone()[0]
+    rebuild = len(data_list) > max(existing, chunk_size)
+
+    try:
+        if rebuild:
+            for index in BULK_LOAD_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {index}")
+            conn.commit()
+
+        for chunk in _chunked(data_list, chunk_size):
+            _insert_initial_chunk(cursor, chunk)
+            conn.commit()
+            _bump_data_version(db_path)
+    finally:
+        if rebuild:
+            conn.rollback()
+            _create_indexes(conn)
+        conn.close()
+
+
+def _insert_initial_chunk(cursor, chunk):
+    parcel_rows = []
+    property_rows = []
+    for data in chunk:
         parcelID = data.get("ParcelID", "")
-        county = data.get("County", "")
-        state = data.get("State", "")
+        parcel_rows.append((parcelID, data.get("State", ""), data.get("County", "")))
+
+        # If propertyID is provided, it also goes into the Properties table.
         propertyID = data.get("PropertyID", "")
-        owner = data.get("Owner", "")
-        
-        # Insert initial data into the Parcels table.
-        # Leaving scraped data values empty
-        # Setting LastScraped to the current time
-        # Using Insert or replace for now, will work great for one off use (Not collecting data year over year (Could version/partition with this method))
-        cursor.execute('''
-            INSERT OR REPLACE INTO Parcels (
-                ParcelID, State, County, LandValue, BuildingValue, TotalValue, AssessmentYear, LastScraped, ScreenshotPath
-            )
-            VALUES (:ParcelID, :State, :County, :LandValue, :BuildingValue, :TotalValue, :AssessmentYear, :LastScraped, :ScreenshotPath
-            )
-        ''',{
-            "ParcelID": parcelID,
-            "State": state,
-            "County": county,
-            "LandValue": None,
-            "BuildingValue": None,
-            "TotalValue": None,
-            "AssessmentYear": None,
-            "LastScraped": None,
-            "ScreenshotPath": None
-        })
-        
-        # If propertyID is provided, insert into the Properties table.
         if propertyID:
-            cursor.execute('''
-                INSERT OR REPLACE INTO Properties (
-                    PropertyID, Owner, ParcelID
-                )
-                VALUES (:PropertyID, :Owner, :ParcelID)
-            ''', {
-                "PropertyID": propertyID,
-                "Owner": owner,
-                "ParcelID": parcelID
-            })
-    
-    conn.commit()
-    conn.close()
+            property_rows.append((propertyID, data.get("Owner", ""), parcelID))
+
+    # In key order, so consecutive rows land on the same b-tree pages. Sorting is stable, so a
+    # key given twice still ends up with its last values.
+    parcel_rows.sort(key=itemgetter(0))
+    property_rows.sort(key=itemgetter(0))
+
+    # Scraped value columns are left alone on conflict (ON CONFLICT DO UPDATE rather than
+    # INSERT OR REPLACE, which would delete the row and wipe them).
+    cursor.executemany('''
+        INSERT INTO Parcels (ParcelID, State, County)
+        VALUES (?, ?, ?)
+        ON CONFLICT(ParcelID) DO UPDATE SET
+            State = excluded.State,
+            County = excluded.County
+        WHERE State IS NOT excluded.State OR County IS NOT excluded.County
+    ''', parcel_rows)
+
+    cursor.executemany('''
+        INSERT INTO Properties (PropertyID, Owner, ParcelID)
+        VALUES (?, ?, ?)
+        ON CONFLICT(PropertyID) DO UPDATE SET
+            Owner = excluded.Owner,
+            ParcelID = excluded.ParcelID
+        WHERE Owner IS NOT excluded.Owner OR ParcelID IS NOT excluded.ParcelID
+    ''', property_rows)
 
-def insert_scraped_data(scraped_data, db_path=r"Database\master.db"):
+
+def insert_scraped_data(scraped_data, db_path=r"Database\master.db", chunk_size=CHUNK_SIZE):
     """
     Updates the Parcels table with the scraped data from the scrape all data objects (and the current time).
     Assumes scraped_data is a list of DataObject instances that have attributes:
-    ParcelID, LandValue, BuildingValue, TotalValue, AssessmentYear, ScreenshotPath.
+    ParcelID, LandValue, BuildingValue, TotalValue, AssessmentYear, ScreenshotPath,
+    or a DataBatch (pidpal.func) holding the same fields as columns.
+
+    Written as an executemany upsert in chunks of `chunk_size`, so a parcel that was never
+    registered through insert_initial_parcels still lands in the table. Every scrape is also
+    appended to ParcelValuations, so Parcels holds the latest values and the history is kept,
+    and the parcels' ScrapeFailures rows (if an earlier attempt failed) are removed.
+    ValueSummaries catches up on the new values when it's next read.
     """
     conn = sqlite3.connect(db_path)
+    ensure_schema(conn, db_path)
     cursor = conn.cursor()
-    
+
     # Set a new timestamp for LastScraped.
     now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    for obj in scraped_data:
-        cursor.execute('''
-            UPDATE Parcels 
-            SET LandValue = ?,
-                BuildingValue = ?,
-                TotalValue = ?,
-                AssessmentYear = ?,
-                LastScraped = ?,
-                ScreenshotPath = ?
-            WHERE ParcelID = ?
-        ''', (
-            obj.LandValue,
-            obj.BuildingValue,
-            obj.TotalValue,
-            obj.AssessmentYear,
-            now,
-            obj.ScreenshotPath,
-            obj.ParcelID
-        ))
-    
-    conn.commit()
+
+    try:
+        for chunk in _chunked(_scraped_rows(scraped_data), chunk_size):
+            _insert_scraped_chunk(cursor, chunk, now)
+            conn.commit()
+            _bump_data_version(db_path)
+    finally:
+        conn.close()
+
+
+def _insert_scraped_chunk(cursor, chunk, now):
+    rows = sorted(
+        ((parcel_id, land, building, total, year, now, screenshot)
+         for parcel_id, land, building, total, year, screenshot in chunk),
+        key=itemgetter(0)
+    )
+    cursor.executemany('''
+        INSERT INTO Parcels (
+            ParcelID, LandValue, BuildingValue, TotalValue, AssessmentYear, LastScraped, ScreenshotPath
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(ParcelID) DO UPDATE SET
+            LandValue = excluded.LandValue,
+            BuildingValue = excluded.BuildingValue,
+            TotalValue = excluded.TotalValue,
+            AssessmentYear = excluded.AssessmentYear,
+            LastScraped = excluded.LastScraped,
+            ScreenshotPath = excluded.ScreenshotPath
+    ''', rows)
+    parcel_ids = json.dumps([row[0] for row in rows])
+
+    # Append the chunk's new values to the history table, straight from Parcels (duplicates
+    # of the same scrape are ignored)
+    cursor.execute('''
+        INSERT OR IGNORE INTO ParcelValuations (
+            ParcelID, AssessmentYear, ScrapedAt, LandValue, BuildingValue, TotalValue, ScreenshotPath
+        )
+        SELECT ParcelID, AssessmentYear, LastScraped, LandValue, BuildingValue, TotalValue, ScreenshotPath
+        FROM Parcels
+        WHERE ParcelID IN (SELECT value FROM json_each(?))
+    ''', (parcel_ids,))
+
+    cursor.execute("DELETE FROM ScrapeFailures WHERE ParcelID IN (SELECT value FROM json_each(?))", (parcel_ids,))
+    cursor.execute("INSERT INTO SummaryScrapes (ParcelIDs) VALUES (?)", (parcel_ids,))
+
+
+def sync_derived_tables(db_path=None):
+    """
+    Indexes the parcels added since the last search (sync_search_index) and brings
+    ValueSummaries up to date (sync_value_summaries), e.g. at the end of a bulk import, so the
+    next search or analytics read doesn't wait for it.
+    """
+    db_path = db_path or DB_PATH
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_schema(conn, db_path)
+        sync_search_index(conn)
+        sync_value_summaries(conn)
+    finally:
+        conn.close()
+
+
+def _scraped_rows(scraped_data):
+    """(ParcelID, LandValue, BuildingValue, TotalValue, AssessmentYear, ScreenshotPath) tuples."""
+    if hasattr(scraped_data, "rows"):
+        # DataBatch: rows come straight from its columns
+        return scraped_data.rows()
+    return (
+        (obj.ParcelID, obj.LandValue, obj.BuildingValue, obj.TotalValue, obj.AssessmentYear, obj.ScreenshotPath)
+        for obj in scraped_data
+    )
+
+
+def insert_scrape_failures(failures, db_path=None):
+    """
+    Records failed scrapes in ScrapeFailures. `failures` are dicts with ParcelID, County, State,
+    Class and optionally Step and Message (as collected by scrape_all_counties). A parcel that
+    already has a row gets the new class and message and its Attempts count goes up.
+    """
+    db_path = db_path or DB_PATH
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = sqlite3.connect(db_path)
+    ensure_schema(conn, db_path)
+    for chunk in _chunked(failures, CHUNK_SIZE):
+        conn.executemany('''
+            INSERT INTO ScrapeFailures (
+                ParcelID, County, State, Class, Step, Message, Attempts, FirstFailed, LastFailed
+            )
+            VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)
+            ON CONFLICT(ParcelID) DO UPDATE SET
+                County = excluded.County,
+                State = excluded.State,
+                Class = excluded.Class,
+                Step = excluded.Step,
+                Message = excluded.Message,
+                Attempts = Attempts + 1,
+                LastFailed = excluded.LastFailed
+        ''', [
+            (f["ParcelID"], f.get("County"), f.get("State"), f["Class"], f.get("Step"), f.get("Message"), now, now)
+            for f in chunk
+        ])
+        conn.commit()
+    conn.close()
+
+
+def scrape_failures(classes=None, db_path=None):
+    """
+    The ScrapeFailures rows (as dicts, oldest failure first), optionally only those whose
+    Class is in `classes`. They have ParcelID, County and State, so they can be fed back into
+    a scrape as they are.
+    """
+    conn = _connect_read(db_path)
+    conn.row_factory = sqlite3.Row
+    query = '''
+        SELECT ParcelID, County, State, Class, Step, Message, Attempts, FirstFailed, LastFailed
+        FROM ScrapeFailures
+    '''
+    values = []
+    if classes:
+        query += f" WHERE Class IN ({', '.join('?' for _ in classes)})"
+        values = list(classes)
+    query += " ORDER BY FirstFailed, ParcelID"
+    rows = [dict(row) for row in conn.execute(query, values)]
     conn.close()
+    return rows
 
 
 DB_PATH = os.path.join("Database", "master.db")
 
 
-def query_parcels(filters=None, sort_by=None, sort_order="ASC"):
+def _as_of_timestamp(as_of):
     """
-    Dynamically queries parcel data joined with the 'Properties' table in master.db.
-    Returns rows with columns:
-       ParcelID, State, County, LandValue, BuildingValue, TotalValue,
-       AssessmentYear, LastScraped, PropertyID, Owner
+    Normalizes an as_of value (datetime, date or string) to the LastScraped text format.
+    A bare date means the end of that day.
+    """
+    if isinstance(as_of, datetime.datetime):
+        return as_of.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(as_of, datetime.date):
+        return as_of.strftime("%Y-%m-%d") + " 23:59:59"
+    as_of = str(as_of).strip()
+    if len(as_of) == 10:
+        as_of += " 23:59:59"
+    return as_of
 
-    :param filters: dict of {column_name: value} for exact matches 
-                    e.g. {"State": "OH", "County": "Franklin"}.
-                    Allowed filter keys: [ParcelID, State, County, PropertyID, Owner].
-                    If None or empty, no WHERE clause is used.
-    :param sort_by: column name to sort by (optional). Must be one of:
-                    [ParcelID, State, County, LandValue, BuildingValue,
-                     TotalValue, AssessmentYear, LastScraped, PropertyID, Owner].
-    :param sort_order: 'ASC' or 'DESC'. Defaults to 'ASC'.
-    :return: A list of dictionaries, each representing a joined row 
-             from Parcels + Properties.
 
-    EXAMPLE:
-        results = query_parcels(
-            filters={"State": "OH", "County": "Franklin"},
-            sort_by="ParcelID",
-            sort_order="ASC"
-        )
+SEARCH_MODES = ("token", "prefix", "substring")
+
+
+def _search_clause(search, search_mode="token"):
+    """
+    WHERE fragment (and values) restricting p.ParcelID to parcels whose ParcelID, Owner,
+    County or PropertyID match `search`:
+      token     - every word appears as a whole word (any column, any order)
+      prefix    - the text starts at a word boundary, e.g. "276-01", "Pier" or "Schait"
+      substring - the text appears anywhere, e.g. "0106" (3+ characters use the trigram
+                  index; shorter strings fall back to a LIKE scan of the search table)
+    Punctuation separates words for token/prefix, so "010_2_42" finds "010/2/42".
     """
+    search = (search or "").strip()
+    if search_mode not in SEARCH_MODES:
+        search_mode = "token"
+
+    words = re.findall(r"\w+", search)
+    if search_mode != "substring" and not words:
+        search_mode = "substring"
+
+    if search_mode == "substring" and len(search) < 3:
+        pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        likes = " OR ".join(f"{col} LIKE ? ESCAPE '\\'" for col in ("ParcelID", "Owner", "County", "PropertyID"))
+        return f"""p.ParcelID IN (
+            SELECT ParcelID FROM ParcelSearchTrigram WHERE {likes}
+        )""", [pattern] * 4
+
+    if search_mode == "substring":
+        table = "ParcelSearchTrigram"
+        match = '"' + search.replace('"', '""') + '"'
+    elif search_mode == "prefix":
+        table = "ParcelSearch"
+        match = '"' + " ".join(words) + '"*'
+    else:
+        table = "ParcelSearch"
+        match = " ".join(f'"{word}"' for word in words)
+
+    return f"""p.ParcelID IN (
+        SELECT d.ParcelID
+        FROM {table} s
+        JOIN ParcelSearchDocs d ON d.DocID = s.rowid
+        WHERE {table} MATCH ?
+    )""", [match]
+
+
+def _build_parcel_query(filters=None, as_of=None, year=None, search=None, search_mode="token"):
+    """
+    Builds the Parcels + Properties SELECT shared by query_parcels, query_parcels_page and
+    iter_parcels. Returns (query, where_clauses, values, valid_sort_columns); callers add
+    their own WHERE / ORDER BY / LIMIT on top.
+    """
+
+    # Value columns come from Parcels (latest scrape) unless a point in history was asked for
+    historical = as_of is not None or year is not None
+    src = "v" if historical else "p"
+    last_scraped = "v.ScrapedAt" if historical else "p.LastScraped"
 
     # 1) Base SELECT query with LEFT JOIN on Properties
-    query = """
+    query = f"""
         SELECT 
             p.ParcelID,
             p.State,
             p.County,
-            p.LandValue,
-            p.BuildingValue,
-            p.TotalValue,
-            p.AssessmentYear,
-            p.LastScraped,
+            {src}.LandValue,
+            {src}.BuildingValue,
+            {src}.TotalValue,
+            {src}.AssessmentYear,
+            {last_scraped} AS LastScraped,
             pr.PropertyID,
             pr.Owner
         FROM Parcels p
@@ -139,10 +895,32 @@ def query_parcels(filters=None, sort_by=None, sort_order="ASC"):
             ON p.ParcelID = pr.ParcelID
     """
 
-    # 2) Build WHERE clause if filters provided
-    where_clauses = []
     values = []
 
+    # 1.5) Historical values: pick one ParcelValuations row per parcel. The subquery is answered
+    #      from a covering index (idx_ParcelValuations_latest, or the UNIQUE key when a year is
+    #      given), then a single rowid lookup fetches the row.
+    if historical:
+        history_clauses = ["ParcelID = p.ParcelID"]
+        if as_of is not None:
+            history_clauses.append("ScrapedAt <= ?")
+            values.append(_as_of_timestamp(as_of))
+        if year is not None:
+            history_clauses.append("AssessmentYear = ?")
+            values.append(int(year))
+        query += f"""
+        LEFT JOIN ParcelValuations v
+            ON v.rowid = (
+                SELECT rowid FROM ParcelValuations
+                WHERE {" AND ".join(history_clauses)}
+                ORDER BY ScrapedAt DESC
+                LIMIT 1
+            )
+        """
+
+    # 2) Build WHERE clauses if filters provided
+    where_clauses = []
+
     # Valid columns we allow filtering on
     valid_filter_keys = {
         "ParcelID": "p.ParcelID",
@@ -161,51 +939,412 @@ def query_parcels(filters=None, sort_by=None, sort_order="ASC"):
                 # Ignore any unknown filters or raise an error
                 pass
 
-    if where_clauses:
-        query += " WHERE " + " AND ".join(where_clauses)
+    # 2.5) Full-text search (see _search_clause)
+    if search and search.strip():
+        clause, clause_values = _search_clause(search, search_mode)
+        where_clauses.append(clause)
+        values.extend(clause_values)
 
-    # 3) Sorting
+    # 3) Columns we allow sorting on
     valid_sort_columns = {
         "ParcelID": "p.ParcelID",
         "State": "p.State",
         "County": "p.County",
-        "LandValue": "p.LandValue",
-        "BuildingValue": "p.BuildingValue",
-        "TotalValue": "p.TotalValue",
-        "AssessmentYear": "p.AssessmentYear",
-        "LastScraped": "p.LastScraped",
+        "LandValue": f"{src}.LandValue",
+        "BuildingValue": f"{src}.BuildingValue",
+        "TotalValue": f"{src}.TotalValue",
+        "AssessmentYear": f"{src}.AssessmentYear",
+        "LastScraped": last_scraped,
         "PropertyID": "pr.PropertyID",
         "Owner": "pr.Owner"
     }
 
-    if sort_by and sort_by in valid_sort_columns:
-        # Validate sort_order
-        sort_order = sort_order.upper()
-        if sort_order not in ["ASC", "DESC"]:
-            sort_order = "ASC"
-        query += f" ORDER BY {valid_sort_columns[sort_by]} {sort_order}"
+    return query, where_clauses, values, valid_sort_columns
 
-    # 4) Execute the query
-    conn = sqlite3.connect(DB_PATH)
+
+def _valid_sort_order(sort_order):
+    """'ASC' or 'DESC' (anything else falls back to 'ASC')."""
+    sort_order = (sort_order or "ASC").upper()
+    if sort_order not in ["ASC", "DESC"]:
+        sort_order = "ASC"
+    return sort_order
+
+
+# Query result cache for the read helpers. Results are kept per normalized query (filters, sort,
+# history and search arguments) in an LRU bounded by the total number of cached rows, and each
+# entry remembers the data version it was read at. The bulk writers bump the version of their
+# db after every commit; the db file's mtime/size are part of the version too, so writes made by
+# another process (or by hand) also invalidate. Cached rows are shared between callers, so treat
+# returned dicts as read-only.
+QUERY_CACHE_MAX_ROWS = 200000
+
+_query_cache = OrderedDict()    # key -> (data version, row count, result)
+_query_cache_rows = 0
+_query_cache_lock = threading.Lock()
+_write_versions = {}            # abspath -> number of writer commits in this process
+_CACHE_MISS = object()
+
+
+def _data_version(db_path):
+    """Version stamp of a db: (writer commits in this process, file mtime, file size)."""
+    key = os.path.abspath(db_path)
+    try:
+        stat = os.stat(key)
+        return _write_versions.get(key, 0), stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return _write_versions.get(key, 0), None, None
+
+
+def _bump_data_version(db_path):
+    """Called by the writers after each commit; invalidates every cached result for db_path."""
+    key = os.path.abspath(db_path)
+    with _query_cache_lock:
+        _write_versions[key] = _write_versions.get(key, 0) + 1
+
+
+def _query_cache_key(kind, db_path, filters=None, sort_by=None, sort_order=None, as_of=None,
+                     year=None, search=None, search_mode=None, *extra):
+    """Normalizes query arguments so equivalent calls share one cache entry."""
+    search = " ".join((search or "").split()) or None
+    return (
+        kind,
+        os.path.abspath(db_path),
+        tuple(sorted((filters or {}).items())),
+        sort_by,
+        _valid_sort_order(sort_order) if sort_by else None,
+        _as_of_timestamp(as_of) if as_of is not None else None,
+        int(year) if year is not None else None,
+        search,
+        (search_mode if search_mode in SEARCH_MODES else "token") if search else None,
+    ) + extra
+
+
+def _cache_get(key, version):
+    """The cached result for key if it was read at `version`, else _CACHE_MISS."""
+    global _query_cache_rows
+    with _query_cache_lock:
+        entry = _query_cache.get(key)
+        if entry is None:
+            return _CACHE_MISS
+        if entry[0] != version:
+            del _query_cache[key]
+            _query_cache_rows -= entry[1]
+            return _CACHE_MISS
+        _query_cache.move_to_end(key)
+        return entry[2]
+
+
+def _cache_put(key, version, result, rows):
+    """Stores a result (`rows` long), evicting least recently used entries past the bound."""
+    global _query_cache_rows
+    if rows > QUERY_CACHE_MAX_ROWS:
+        return
+    with _query_cache_lock:
+        old = _query_cache.pop(key, None)
+        if old is not None:
+            _query_cache_rows -= old[1]
+        _query_cache[key] = (version, rows, result)
+        _query_cache_rows += rows
+        while _query_cache_rows > QUERY_CACHE_MAX_ROWS:
+            _, (_, evicted_rows, _) = _query_cache.popitem(last=False)
+            _query_cache_rows -= evicted_rows
+
+
+def clear_query_cache():
+    """Drops every cached query result."""
+    global _query_cache_rows
+    with _query_cache_lock:
+        _query_cache.clear()
+        _query_cache_rows = 0
+
+
+def _connect_read(db_path=None, search=None):
+    """
+    Opens master.db (or db_path) for the read helpers below. When the query searches, any
+    queued search documents are indexed first so results are never stale.
+    """
+    db_path = db_path or DB_PATH
+    conn = sqlite3.connect(db_path)
     conn.execute("PRAGMA foreign_keys = ON;")
+    ensure_schema(conn, db_path)
+    if search and search.strip():
+        sync_search_index(conn)
+    return conn
+
+
+def query_parcels(filters=None, sort_by=None, sort_order="ASC", as_of=None, year=None, db_path=None,
+                  search=None, search_mode="token"):
+    """
+    Dynamically queries parcel data joined with the 'Properties' table in master.db.
+    Returns rows with columns:
+       ParcelID, State, County, LandValue, BuildingValue, TotalValue,
+       AssessmentYear, LastScraped, PropertyID, Owner
+
+    :param filters: dict of {column_name: value} for exact matches 
+                    e.g. {"State": "OH", "County": "Franklin"}.
+                    Allowed filter keys: [ParcelID, State, County, PropertyID, Owner].
+                    If None or empty, no WHERE clause is used.
+    :param sort_by: column name to sort by (optional). Must be one of:
+                    [ParcelID, State, County, LandValue, BuildingValue,
+                     TotalValue, AssessmentYear, LastScraped, PropertyID, Owner].
+    :param sort_order: 'ASC' or 'DESC'. Defaults to 'ASC'.
+    :param as_of: optional date/datetime (or 'YYYY-MM-DD[ HH:MM:SS]' string). When given, the
+                  value columns come from the latest ParcelValuations row scraped at or before it.
+    :param year: optional AssessmentYear. When given, the value columns come from the latest
+                 ParcelValuations row for that assessment year (combinable with as_of).
+    :param db_path: optional database path, defaults to DB_PATH.
+    :param search: optional free text matched against ParcelID, Owner, County and PropertyID
+                   through the FTS5 search indexes (combined with filters using AND).
+    :param search_mode: 'token' (whole words), 'prefix' (starts with) or 'substring' (contains).
+    :return: A list of dictionaries, each representing a joined row 
+             from Parcels + Properties. Repeated queries are served from the query cache
+             until the next write, so treat the dictionaries as read-only.
+
+    EXAMPLE:
+        results = query_parcels(
+            filters={"State": "OH", "County": "Franklin"},
+            sort_by="ParcelID",
+            sort_order="ASC"
+        )
+    """
+
+    query, where_clauses, values, valid_sort_columns = _build_parcel_query(filters, as_of, year, search, search_mode)
+
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    # Sorting
+    if sort_by and sort_by in valid_sort_columns:
+        query += f" ORDER BY {valid_sort_columns[sort_by]} {_valid_sort_order(sort_order)}"
+    else:
+        sort_by = None
+
+    # Served from the cache when nothing was written since the same query last ran
+    db_path = db_path or DB_PATH
+    cache_key = _query_cache_key("rows", db_path, filters, sort_by, sort_order, as_of, year, search, search_mode)
+    version = _data_version(db_path)
+    cached = _cache_get(cache_key, version)
+    if cached is not _CACHE_MISS:
+        return list(cached)
+
+    # Execute the query
+    conn = _connect_read(db_path, search)
     cursor = conn.cursor()
 
     cursor.execute(query, values)
     rows = cursor.fetchall()
 
-    # 5) Convert rows to list of dictionaries
+    # Convert rows to list of dictionaries
     columns = [desc[0] for desc in cursor.description]
     results = [dict(zip(columns, row)) for row in rows]
 
     conn.close()
-    return results
+    _cache_put(cache_key, version, results, len(results))
+    return list(results)
+
+
+def _keyset_segments(sort_expr, descending, after):
+    """
+    Returns the WHERE fragments (each with its values) that together select the rows coming
+    after `after` = (sort value, ParcelID, PropertyID), in page order. NULL sort values sort
+    first ascending and last descending (SQLite's ordering) and are kept in their own segment,
+    so every fragment is a plain range that SQLite can seek to on an index.
+    """
+    op = "<" if descending else ">"
+    key = "(p.ParcelID, IFNULL(pr.PropertyID, ''))"
+
+    if after is None:
+        if sort_expr is None:
+            return [(None, [])]
+        not_null = (f"{sort_expr} IS NOT NULL", [])
+        null = (f"{sort_expr} IS NULL", [])
+        return [not_null, null] if descending else [null, not_null]
+
+    last_value, parcel_id, property_id = after
+    property_id = property_id or ""
+
+    if sort_expr is None:
+        return [(f"p.ParcelID {op}= ? AND {key} {op} (?, ?)", [parcel_id, parcel_id, property_id])]
+
+    if last_value is None:
+        rest = (
+            f"{sort_expr} IS NULL AND p.ParcelID {op}= ? AND {key} {op} (?, ?)",
+            [parcel_id, parcel_id, property_id]
+        )
+        return [rest] if descending else [rest, (f"{sort_expr} IS NOT NULL", [])]
+
+    # The (sort, ParcelID) bound is what SQLite seeks on; the 3-column compare is the exact cut
+    rest = (
+        f"({sort_expr}, p.ParcelID) {op}= (?, ?) "
+        f"AND ({sort_expr}, p.ParcelID, IFNULL(pr.PropertyID, '')) {op} (?, ?, ?)",
+        [last_value, parcel_id, last_value, parcel_id, property_id]
+    )
+    return [rest, (f"{sort_expr} IS NULL", [])] if descending else [rest]
+
+
+def query_parcels_page(filters=None, sort_by=None, sort_order="ASC", page_size=500, after=None,
+                       as_of=None, year=None, db_path=None, search=None, search_mode="token"):
+    """
+    Keyset-paginated variant of query_parcels. Rows are ordered by the sort column, then ParcelID
+    (then PropertyID, since a parcel can have several properties), and each page continues from
+    the last row of the previous one instead of using OFFSET, so page N costs the same as page 1.
+
+    :param filters, sort_by, sort_order, as_of, year, db_path, search, search_mode:
+        same as query_parcels.
+    :param page_size: max rows per page.
+    :param after: the cursor returned with the previous page (None for the first page).
+    :return: (rows, next_after) where rows is a list of dicts like query_parcels and next_after
+             is the cursor for the following page, or None when this was the last page.
+             Pages are cached like query_parcels results.
+
+    EXAMPLE:
+        rows, after = query_parcels_page(sort_by="County", page_size=500)
+        while after:
+            more, after = query_parcels_page(sort_by="County", page_size=500, after=after)
+    """
+
+    base_query, where_clauses, values, valid_sort_columns = _build_parcel_query(filters, as_of, year, search, search_mode)
+
+    sort_order = _valid_sort_order(sort_order)
+    if not (sort_by and sort_by in valid_sort_columns):
+        sort_by = None
+    # ParcelID is already the first tie-breaker, so sorting by it needs no extra key
+    sort_expr = valid_sort_columns[sort_by] if sort_by and sort_by != "ParcelID" else None
+
+    order_by = [f"p.ParcelID {sort_order}", f"IFNULL(pr.PropertyID, '') {sort_order}"]
+    if sort_expr:
+        order_by.insert(0, f"{sort_expr} {sort_order}")
+    order_by = " ORDER BY " + ", ".join(order_by)
+
+    db_path = db_path or DB_PATH
+    cache_key = _query_cache_key(
+        "page", db_path, filters, sort_by, sort_order, as_of, year, search, search_mode, page_size, after
+    )
+    version = _data_version(db_path)
+    cached = _cache_get(cache_key, version)
+    if cached is not _CACHE_MISS:
+        return list(cached[0]), cached[1]
+
+    conn = _connect_read(db_path, search)
+    cursor = conn.cursor()
+    rows = []
+    columns = None
+
+    # One extra row tells us whether there is a next page
+    for clause, clause_values in _keyset_segments(sort_expr, sort_order == "DESC", after):
+        wanted = page_size + 1 - len(rows)
+        if wanted <= 0:
+            break
+
+        clauses = where_clauses + ([clause] if clause else [])
+        query = base_query
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += order_by + " LIMIT ?"
+
+        cursor.execute(query, values + clause_values + [wanted])
+        rows.extend(cursor.fetchall())
+        columns = [desc[0] for desc in cursor.description]
+
+    conn.close()
+
+    results = [dict(zip(columns, row)) for row in rows[:page_size]]
+
+    next_after = None
+    if len(rows) > page_size:
+        last = results[-1]
+        next_after = (last[sort_by] if sort_expr else None, last["ParcelID"], last["PropertyID"])
+
+    _cache_put(cache_key, version, (results, next_after), len(results))
+    return list(results), next_after
+
+
+def iter_parcels(filters=None, sort_by=None, sort_order="ASC", chunk_size=5000,
+                 as_of=None, year=None, db_path=None, search=None, search_mode="token",
+                 as_tuples=False):
+    """
+    Streams the same rows as query_parcels in chunks (lists of up to `chunk_size` dicts),
+    for exports and reports that shouldn't hold the whole result in memory.
+    as_tuples=True yields the raw row tuples (query_parcels column order) instead of dicts,
+    which roughly halves the cost of large exports.
+    Uses a single query read with fetchmany, so the connection stays open until the
+    generator is exhausted or closed.
+
+    EXAMPLE:
+        for chunk in iter_parcels(filters={"State": "MA"}, chunk_size=10000):
+            writer.writerows(chunk)
+    """
+
+    query, where_clauses, values, valid_sort_columns = _build_parcel_query(filters, as_of, year, search, search_mode)
+
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    if sort_by and sort_by in valid_sort_columns:
+        query += f" ORDER BY {valid_sort_columns[sort_by]} {_valid_sort_order(sort_order)}"
+
+    conn = _connect_read(db_path, search)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, values)
+        columns = [desc[0] for desc in cursor.description]
+
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows if as_tuples else [dict(zip(columns, row)) for row in rows]
+    finally:
+        conn.close()
+
+
+def count_parcels(filters=None, as_of=None, year=None, db_path=None, search=None, search_mode="token"):
+    """Number of rows query_parcels would return for the same arguments (e.g. for progress bars)."""
+    query, where_clauses, values, _ = _build_parcel_query(filters, as_of, year, search, search_mode)
+
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    conn = _connect_read(db_path, search)
+    count = conn.execute(f"SELECT COUNT(*) FROM ({query})", values).fetchone()[0]
+    conn.close()
+    return count
+
+
+def last_scraped_times(parcel_ids, db_path=None):
+    """
+    {ParcelID: LastScraped} for those of `parcel_ids` that have been scraped (parcels never
+    scraped, or not in the DB, are left out). Used to skip parcels that are still fresh.
+    """
+    conn = _connect_read(db_path)
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS LookupParcels (ParcelID TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.LookupParcels")
+    for chunk in _chunked(parcel_ids, CHUNK_SIZE):
+        conn.executemany(
+            "INSERT OR IGNORE INTO temp.LookupParcels (ParcelID) VALUES (?)",
+            [(parcel_id,) for parcel_id in chunk]
+        )
+    rows = conn.execute("""
+        SELECT p.ParcelID, p.LastScraped
+        FROM temp.LookupParcels l
+        JOIN Parcels p ON p.ParcelID = l.ParcelID
+        WHERE p.LastScraped IS NOT NULL AND p.LastScraped <> ''
+    """).fetchall()
+    conn.close()
+    return dict(rows)
 
 
 def get_screenshot_path(parcel_id):
     """
     Retrieves the ScreenshotPath for a given ParcelID (if it exists).
-    Returns a string path or None.
+    Returns a string path or None. Cached like the query results.
     """
+    cache_key = ("screenshot", os.path.abspath(DB_PATH), parcel_id)
+    version = _data_version(DB_PATH)
+    cached = _cache_get(cache_key, version)
+    if cached is not _CACHE_MISS:
+        return cached
+
     conn = sqlite3.connect(DB_PATH)
     conn.execute("PRAGMA foreign_keys = ON;")
     cursor = conn.cursor()
@@ -216,6 +1355,6 @@ def get_screenshot_path(parcel_id):
     row = cursor.fetchone()
 
     conn.close()
-    if row:
-        return row[0]  # might be None if not set
-    return None
\ No newline at end of file
+    screenshot_path = row[0] if row else None  # might be None if not set
+    _cache_put(cache_key, version, screenshot_path, 1)
+    return screenshot_path
\ No newline at end of file
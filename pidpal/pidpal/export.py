@@ -0,0 +1,166 @@
+# Streaming export of query_parcels results to CSV, XLSX and Parquet.
+#
+# Rows come from iter_parcels in fixed-size chunks and each chunk is written before the next is
+# read, so memory use stays flat however large the result is. Files are written under a
+# temporary name and moved into place when complete, so a failed or cancelled export never
+# leaves a half-written file behind.
+import os
+import csv
+
+from pidpal.db_func import iter_parcels, count_parcels
+
+# query_parcels column order, which is also the order of iter_parcels(as_tuples=True) rows
+EXPORT_COLUMNS = [
+    "ParcelID", "State", "County", "LandValue", "BuildingValue",
+    "TotalValue", "AssessmentYear", "LastScraped", "PropertyID", "Owner"
+]
+
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".xlsx": "xlsx",
+    ".parquet": "parquet",
+}
+
+# Rows read from SQLite (and written) per step
+EXPORT_CHUNK_SIZE = 50000
+
+# Data rows per worksheet (Excel's limit is 1,048,576 rows including the header)
+XLSX_MAX_ROWS = 1048575
+
+
+class ExportCancelled(Exception):
+    """Raised when the `cancelled` callback passed to export_parcels returns True."""
+
+
+def export_format(path):
+    """'csv', 'xlsx' or 'parquet' from the file extension, else ValueError."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export type '{ext}' (use {', '.join(EXPORT_FORMATS)})")
+    return EXPORT_FORMATS[ext]
+
+
+def _write_csv(path, chunks, on_chunk):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            on_chunk(len(chunk))
+
+
+def _write_xlsx(path, chunks, on_chunk):
+    from openpyxl import Workbook
+
+    # write_only streams rows to disk instead of building the whole sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = XLSX_MAX_ROWS
+
+    for chunk in chunks:
+        rows = chunk
+        start = 0
+        while start < len(rows):
+            if sheet_rows >= XLSX_MAX_ROWS:
+                sheet = workbook.create_sheet(f"Parcels {len(workbook.worksheets) + 1}")
+                sheet.append(EXPORT_COLUMNS)
+                sheet_rows = 0
+            take = min(len(rows) - start, XLSX_MAX_ROWS - sheet_rows)
+            for row in rows[start:start + take]:
+                sheet.append(row)
+            sheet_rows += take
+            start += take
+        on_chunk(len(chunk))
+
+    if sheet is None:
+        workbook.create_sheet("Parcels 1").append(EXPORT_COLUMNS)
+    workbook.save(path)
+
+
+def _parquet_table(chunk, schema):
+    """One chunk as a typed Arrow table: values as float64, year as int64, LastScraped as timestamp."""
+    import pandas as pd
+    import pyarrow as pa
+
+    df = pd.DataFrame.from_records(chunk, columns=EXPORT_COLUMNS)
+    for col in ("LandValue", "BuildingValue", "TotalValue"):
+        # Scraped values are stored as text such as "61,000" or "$61,000"
+        text = df[col].astype("string").str.replace(r"[$,\s]", "", regex=True)
+        df[col] = pd.to_numeric(text, errors="coerce").astype("float64")
+    df["AssessmentYear"] = pd.to_numeric(df["AssessmentYear"], errors="coerce").astype("Int64")
+    df["LastScraped"] = pd.to_datetime(df["LastScraped"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    for col in ("ParcelID", "State", "County", "PropertyID", "Owner"):
+        df[col] = df[col].astype("string")
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def _write_parquet(path, chunks, on_chunk):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("ParcelID", pa.string()),
+        ("State", pa.string()),
+        ("County", pa.string()),
+        ("LandValue", pa.float64()),
+        ("BuildingValue", pa.float64()),
+        ("TotalValue", pa.float64()),
+        ("AssessmentYear", pa.int64()),
+        ("LastScraped", pa.timestamp("s")),
+        ("PropertyID", pa.string()),
+        ("Owner", pa.string()),
+    ])
+
+    # Each chunk becomes one row group
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            writer.write_table(_parquet_table(chunk, schema))
+            on_chunk(len(chunk))
+
+
+_WRITERS = {
+    "csv": _write_csv,
+    "xlsx": _write_xlsx,
+    "parquet": _write_parquet,
+}
+
+
+def export_parcels(path, filters=None, sort_by=None, sort_order="ASC", as_of=None, year=None,
+                   search=None, search_mode="token", db_path=None, chunk_size=EXPORT_CHUNK_SIZE,
+                   progress=None, cancelled=None):
+    """
+    Exports the rows query_parcels would return for the same arguments to `path`. The format
+    comes from the extension: .csv, .xlsx (write-only workbook, extra sheets past Excel's row
+    limit) or .parquet (zstd-compressed, typed columns).
+
+    :param progress: optional callback(rows_written, total_rows), called after every chunk.
+    :param cancelled: optional callback returning True to stop; raises ExportCancelled.
+    :return: the number of rows written.
+    """
+    writer = _WRITERS[export_format(path)]
+
+    total = count_parcels(filters, as_of, year, db_path, search, search_mode)
+    written = 0
+
+    def on_chunk(rows):
+        nonlocal written
+        written += rows
+        if progress:
+            progress(written, total)
+
+    def chunks():
+        for chunk in iter_parcels(filters, sort_by, sort_order, chunk_size, as_of, year,
+                                  db_path, search, search_mode, as_tuples=True):
+            if cancelled and cancelled():
+                raise ExportCancelled()
+            yield chunk
+
+    tmp_path = path + ".part"
+    try:
+        writer(tmp_path, chunks(), on_chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return written
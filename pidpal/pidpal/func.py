@@ -1,8 +1,23 @@
 import os
 import re
+import sys
+import math
+import numbers
+from array import array
 
-# Data Object for scraping collection TODO: Add data transformation functions
+# Data Object for scraping collection (one parcel's scraped values)
 class DataObject:
+    # Slots instead of a per-instance __dict__: a large run holds one of these per parcel
+    __slots__ = ("ParcelID", "LandValue", "BuildingValue", "TotalValue", "AssessmentYear", "ScreenshotPath")
+
+    # Values are the scraped text (e.g. "61,000") until cleaned to floats / an int year
+    ParcelID: str
+    LandValue: "str | float | None"
+    BuildingValue: "str | float | None"
+    TotalValue: "str | float | None"
+    AssessmentYear: "str | int | None"
+    ScreenshotPath: "str | None"
+
     def __init__(self, ParcelID, LandValue = None, BuildingValue = None, TotalValue = None, AssessmentYear = None, ScreenshotPath = None):
         self.ParcelID = ParcelID # Parcel ID
         self.LandValue = LandValue # Assessed Land Value
@@ -22,6 +37,129 @@ class DataObject:
             "ScreenshotPath": self.ScreenshotPath
         }
 
+    def __repr__(self):
+        return f"DataObject({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+
+class DataBatch:
+    """
+    Columnar container for many parcels' cleaned values, used to hand a whole scrape from the
+    cleaner to the DB writer (insert_scraped_data accepts it in place of a DataObject list).
+
+    Values are stored as array.array columns (float64, NaN for a missing value; int32 years,
+    0 for a missing year) instead of one Python object per value, and County/State are
+    interned so each distinct name is stored once. Indexing or iterating yields DataObjects.
+    """
+    __slots__ = (
+        "ParcelID", "County", "State", "LandValue", "BuildingValue", "TotalValue",
+        "AssessmentYear", "ScreenshotPath"
+    )
+
+    VALUE_COLUMNS = ("LandValue", "BuildingValue", "TotalValue")
+
+    def __init__(self):
+        self.ParcelID = []
+        self.County = []
+        self.State = []
+        self.LandValue = array("d")
+        self.BuildingValue = array("d")
+        self.TotalValue = array("d")
+        self.AssessmentYear = array("i")
+        self.ScreenshotPath = []
+
+    @classmethod
+    def from_objects(cls, data_objects, places=None):
+        """
+        Cleans the scraped DataObjects column-wise (clean_records) into a new batch.
+        :param places: optional dict ParcelID -> (County, State), e.g. from the imported rows.
+        """
+        batch = cls()
+        if not data_objects:
+            return batch
+        columns = {field: [getattr(obj, field) for obj in data_objects] for field in CLEANED_FIELDS}
+        cleaned = clean_records(columns)
+
+        batch.ParcelID = [obj.ParcelID for obj in data_objects]
+        batch.ScreenshotPath = [obj.ScreenshotPath for obj in data_objects]
+        for col in cls.VALUE_COLUMNS:
+            getattr(batch, col).frombytes(cleaned[col].to_numpy("float64").tobytes())
+        batch.AssessmentYear.frombytes(cleaned["AssessmentYear"].fillna(0).to_numpy("int32").tobytes())
+
+        places = places or {}
+        for parcel_id in batch.ParcelID:
+            county, state = places.get(parcel_id, (None, None))
+            batch.County.append(sys.intern(county) if county else None)
+            batch.State.append(sys.intern(state) if state else None)
+        return batch
+
+    def append(self, data_object, county=None, state=None):
+        """Adds one already-cleaned DataObject (float values, int or None year)."""
+        self.ParcelID.append(data_object.ParcelID)
+        self.County.append(sys.intern(county) if county else None)
+        self.State.append(sys.intern(state) if state else None)
+        for col in self.VALUE_COLUMNS:
+            value = getattr(data_object, col)
+            getattr(self, col).append(float("nan") if value is None else value)
+        self.AssessmentYear.append(data_object.AssessmentYear or 0)
+        self.ScreenshotPath.append(data_object.ScreenshotPath)
+
+    def __len__(self):
+        return len(self.ParcelID)
+
+    def __getitem__(self, i):
+        land, building, total, year = (
+            self.LandValue[i], self.BuildingValue[i], self.TotalValue[i], self.AssessmentYear[i]
+        )
+        return DataObject(
+            self.ParcelID[i],
+            None if math.isnan(land) else land,
+            None if math.isnan(building) else building,
+            None if math.isnan(total) else total,
+            year or None,
+            self.ScreenshotPath[i],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def rows(self):
+        """(ParcelID, LandValue, BuildingValue, TotalValue, AssessmentYear, ScreenshotPath) tuples."""
+        def value(v):
+            return None if math.isnan(v) else v
+
+        for parcel_id, land, building, total, year, screenshot in zip(
+            self.ParcelID, self.LandValue, self.BuildingValue, self.TotalValue,
+            self.AssessmentYear, self.ScreenshotPath
+        ):
+            yield parcel_id, value(land), value(building), value(total), year or None, screenshot
+
+    def to_frame(self):
+        """The batch as a DataFrame (numeric columns share the arrays' memory until modified)."""
+        import numpy as np
+        import pandas as pd
+
+        years = np.frombuffer(self.AssessmentYear, dtype="int32")
+        return pd.DataFrame({
+            "ParcelID": self.ParcelID,
+            "County": pd.Categorical(self.County),
+            "State": pd.Categorical(self.State),
+            "LandValue": np.frombuffer(self.LandValue, dtype="float64"),
+            "BuildingValue": np.frombuffer(self.BuildingValue, dtype="float64"),
+            "TotalValue": np.frombuffer(self.TotalValue, dtype="float64"),
+            "AssessmentYear": pd.Series(years, dtype="Int64").mask(years == 0),
+            "ScreenshotPath": self.ScreenshotPath,
+        })
+
+    def nbytes(self):
+        """Approximate memory held by the batch, in bytes (containers plus the values they own)."""
+        total = sum(sys.getsizeof(getattr(self, col)) for col in self.__slots__)
+        total += sum(sys.getsizeof(value) for value in self.ParcelID)
+        total += sum(sys.getsizeof(value) for value in self.ScreenshotPath if value is not None)
+        # County/State are interned: each distinct name counts once
+        total += sum(sys.getsizeof(value) for value in set(self.County) | set(self.State) if value is not None)
+        return total
+
 
 def take_screenshot(driver, screenshot_dir, filename):
     """
@@ -57,6 +195,22 @@ def take_screenshot(driver, screenshot_dir, filename):
 
 import datetime
 
+# Characters dropped from scraped currency strings before parsing ("$61,000 " -> "61000")
+_CURRENCY_JUNK = r"[$,\s]"
+
+# What float() accepts once the junk is gone (anything else cleans to 0.0)
+_NUMBER_PATTERN = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+
+# A year, or a year range such as "2023/2024" or "2023-24" (the first year is kept); "2023.0"
+# is a year that went through a float column
+_YEAR_PATTERN = re.compile(r"^\s*(\d+)(?:\.0*)?(?:\s*[/\-]\s*\d+)?\s*$")
+
+LAST_SCRAPED_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# DataObject fields clean_data_objects converts
+CLEANED_FIELDS = ("LandValue", "BuildingValue", "TotalValue", "AssessmentYear")
+
+
 def clean_record(record):
     """
     Cleans a single record (dictionary) in-place, converting string fields to
@@ -66,25 +220,25 @@ def clean_record(record):
       ParcelID        (string)
       State           (string)
       County          (string)
-      LandValue       (string with commas, e.g. "61,000")
+      LandValue       (string with commas or "$", e.g. "61,000")
       BuildingValue   (string with commas, e.g. "86,900")
       TotalValue      (string with commas, e.g. "155,800")
-      AssessmentYear  (string or int)
+      AssessmentYear  (string, int or a whole float like 2023.0, or a range like "2023/2024")
       LastScraped     (string datetime, e.g. "2025-03-22 13:03:38")
       PropertyID      (string or "None")
 
     Returns the same dictionary with cleaned values:
       LandValue, BuildingValue, TotalValue => float (or int if you prefer)
-      AssessmentYear                       => int
+      AssessmentYear                       => int (first year of a range)
       LastScraped                          => datetime.datetime
       PropertyID                           => None if "None", else original string
     """
 
-    # Helper to parse numeric strings like "61,000" -> 61000.0 (float)
+    # Helper to parse numeric strings like "$61,000" -> 61000.0 (float)
     def parse_numeric(val):
-        if not val:
+        if val is None or val == "":
             return 0.0
-        val = val.replace(",", "")
+        val = re.sub(_CURRENCY_JUNK, "", str(val))
         try:
             return float(val)
         except ValueError:
@@ -100,16 +254,13 @@ def clean_record(record):
 
     # AssessmentYear -> int if possible
     if "AssessmentYear" in record and record["AssessmentYear"] is not None:
-        try:
-            record["AssessmentYear"] = int(record["AssessmentYear"])
-        except ValueError:
-            record["AssessmentYear"] = None
+        record["AssessmentYear"] = _parse_year(record["AssessmentYear"])
 
     # LastScraped -> datetime
     # e.g. "2025-03-22 13:03:38" -> datetime(2025, 3, 22, 13, 3, 38)
     if "LastScraped" in record and record["LastScraped"]:
         try:
-            record["LastScraped"] = datetime.datetime.strptime(record["LastScraped"], "%Y-%m-%d %H:%M:%S")
+            record["LastScraped"] = datetime.datetime.strptime(record["LastScraped"], LAST_SCRAPED_FORMAT)
         except (ValueError, TypeError):
             record["LastScraped"] = None  # or leave as-is
 
@@ -120,3 +271,74 @@ def clean_record(record):
 
     return record
 
+
+def _parse_year(value):
+    # Numbers as they are: an int column with blanks in it is float64 in pandas (2023.0, NaN)
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return int(value) if float(value).is_integer() else None
+    match = _YEAR_PATTERN.match(str(value))
+    return int(match.group(1)) if match else None
+
+
+def clean_records(columns):
+    """
+    Column-wise counterpart of clean_record: cleans a whole batch at once with pandas string
+    and parsing operations instead of one dict at a time.
+
+    :param columns: a DataFrame, or a dict of column name -> list of values, with any of the
+        keys clean_record handles (missing columns are left out of the result).
+    :return: a DataFrame with the same values clean_record would give, as columns:
+        LandValue, BuildingValue, TotalValue => float64 (0.0 for blanks, "N/A" etc.)
+        AssessmentYear                       => Int64 (first year of a range, <NA> if invalid)
+        LastScraped                          => datetime64 (NaT if blank or invalid)
+        PropertyID                           => None where the value was "None"
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(columns)
+    for col in ("LandValue", "BuildingValue", "TotalValue"):
+        if col in df:
+            text = df[col].astype("str").str.replace(_CURRENCY_JUNK, "", regex=True)
+            # Only well-formed numbers are cast; blanks, "N/A" and NaN become 0.0
+            valid = text.str.fullmatch(_NUMBER_PATTERN).fillna(False).astype(bool)
+            df[col] = text.where(valid, "0").astype("float64")
+
+    if "AssessmentYear" in df:
+        # A batch holds a handful of distinct years, so each distinct value is parsed once
+        codes, uniques = pd.factorize(df["AssessmentYear"])
+        parsed = pd.array([_parse_year(value) for value in uniques] + [None], dtype="Int64")
+        df["AssessmentYear"] = parsed.take(codes)  # code -1 (missing) takes the trailing None
+
+    if "LastScraped" in df:
+        df["LastScraped"] = pd.to_datetime(df["LastScraped"], format=LAST_SCRAPED_FORMAT, errors="coerce")
+
+    if "PropertyID" in df:
+        ids = df["PropertyID"].astype(object)
+        df["PropertyID"] = ids.where(ids.notna() & ids.ne("None"), None)
+
+    return df
+
+
+def clean_data_objects(data_objects):
+    """
+    Cleans the value fields of a list of DataObjects in place with clean_records (floats for
+    the values, an int or None for AssessmentYear), and returns the list.
+    """
+    if not data_objects:
+        return data_objects
+    columns = {field: [getattr(obj, field) for obj in data_objects] for field in CLEANED_FIELDS}
+    cleaned = clean_records(columns)
+
+    years = cleaned["AssessmentYear"].astype(object)
+    values = zip(
+        cleaned["LandValue"].tolist(),
+        cleaned["BuildingValue"].tolist(),
+        cleaned["TotalValue"].tolist(),
+        years.where(years.notna(), None).tolist(),
+    )
+    for obj, (land, building, total, year) in zip(data_objects, values):
+        obj.LandValue = land
+        obj.BuildingValue = building
+        obj.TotalValue = total
+        obj.AssessmentYear = year
+    return data_objects
@@ -0,0 +1,305 @@
+# Local server for the Home page map.
+#
+# The map page, Leaflet and the map tiles are all served from 127.0.0.1, so the QWebEngineView
+# never waits on unpkg.com or tile.openstreetmap.org at startup:
+#   /map/<file>              the cached map HTML (see working_county_map.leaflet_map_file)
+#   /assets/<path>           Leaflet and Leaflet.markercluster, bundled in MAP_ASSET_DIR
+#   /tiles/<z>/<x>/<y>.png   OpenStreetMap tiles through a disk cache bounded by size
+# The bundle (pidpal/map_assets, Leaflet 1.9.3 under its BSD-2-Clause LICENSE and
+# Leaflet.markercluster 1.5.3, MIT) ships with the code. An asset missing from it is downloaded
+# once into ASSET_DOWNLOAD_DIR; tiles are downloaded on a cache miss, and a cached tile is
+# served as is (even when old) if the network is down.
+import os
+import re
+import time
+import threading
+import mimetypes
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Bundled Leaflet files: path under MAP_ASSET_DIR -> where they are downloaded from
+LEAFLET_URL = "https://unpkg.com/leaflet@1.9.3/dist/"
+MARKERCLUSTER_URL = "https://unpkg.com/leaflet.markercluster@1.5.3/dist/"
+MAP_ASSETS = {
+    "leaflet/leaflet.js": LEAFLET_URL + "leaflet.js",
+    "leaflet/leaflet.css": LEAFLET_URL + "leaflet.css",
+    "leaflet/images/layers.png": LEAFLET_URL + "images/layers.png",
+    "leaflet/images/layers-2x.png": LEAFLET_URL + "images/layers-2x.png",
+    "leaflet/images/marker-icon.png": LEAFLET_URL + "images/marker-icon.png",
+    "leaflet/images/marker-icon-2x.png": LEAFLET_URL + "images/marker-icon-2x.png",
+    "leaflet/images/marker-shadow.png": LEAFLET_URL + "images/marker-shadow.png",
+    "markercluster/leaflet.markercluster.js": MARKERCLUSTER_URL + "leaflet.markercluster.js",
+    "markercluster/MarkerCluster.css": MARKERCLUSTER_URL + "MarkerCluster.css",
+    "markercluster/MarkerCluster.Default.css": MARKERCLUSTER_URL + "MarkerCluster.Default.css",
+}
+
+MAP_ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "map_assets")
+
+# Where assets missing from the bundle are saved when they are downloaded
+ASSET_DOWNLOAD_DIR = os.path.join("Resources", "map_assets")
+
+TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+TILE_CACHE_DIR = os.path.join("Resources", "tile_cache")
+
+# Disk space the tile cache may use (least recently used tiles are removed past this)
+TILE_CACHE_BYTES = 256 * 1024 * 1024
+
+# Cached tiles older than this are re-downloaded when the network is up
+TILE_MAX_AGE = 30 * 24 * 3600
+
+# The OSM tile usage policy asks for an identifying User-Agent
+USER_AGENT = "PidPal/1.0 (desktop parcel viewer)"
+
+DOWNLOAD_TIMEOUT = 10
+
+
+def _download(url):
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.part"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def fetch_map_assets(asset_dir=MAP_ASSET_DIR, force=False):
+    """Downloads the MAP_ASSETS into asset_dir (to bundle them); returns the paths written."""
+    written = []
+    for name, url in MAP_ASSETS.items():
+        path = os.path.join(asset_dir, *name.split("/"))
+        if force or not os.path.exists(path):
+            _write_atomic(path, _download(url))
+            written.append(path)
+    return written
+
+
+class TileCache:
+    """
+    Map tiles on disk as <cache_dir>/<z>/<x>/<y>.png, limited to max_bytes in total.
+    Least recently used tiles are evicted first (file mtimes carry the order across runs).
+    """
+
+    def __init__(self, cache_dir=TILE_CACHE_DIR, max_bytes=TILE_CACHE_BYTES, url=TILE_URL,
+                 max_age=TILE_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.url = url
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._tiles = OrderedDict()   # path -> size, least recently used first
+        self._bytes = 0
+        self._scan()
+
+    def _scan(self):
+        found = []
+        for folder, _, files in os.walk(self.cache_dir):
+            for filename in files:
+                if filename.endswith(".png"):
+                    path = os.path.join(folder, filename)
+                    stat = os.stat(path)
+                    found.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(found):
+            self._tiles[path] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._tiles:
+            path, size = self._tiles.popitem(last=False)
+            self._bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def path(self, z, x, y):
+        return os.path.join(self.cache_dir, str(z), str(x), f"{y}.png")
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def get(self, z, x, y):
+        """PNG bytes of a tile, from disk or downloaded (and cached); None if unavailable."""
+        path = self.path(z, x, y)
+        # Under the lock, so another request can't evict the tile between the two
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                age = time.time() - os.path.getmtime(path)
+            except OSError:
+                data = None     # not cached
+        if data is not None and age < self.max_age:
+            self._touch(path)
+            return data
+
+        try:
+            fresh = _download(self.url.format(z=z, x=x, y=y))
+        except OSError:
+            # Offline (or the tile server failed): an old tile beats a blank one
+            if data is not None:
+                self._touch(path)
+            return data
+        self.put(z, x, y, fresh)
+        return fresh
+
+    def _touch(self, path):
+        with self._lock:
+            if path in self._tiles:
+                self._tiles.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def put(self, z, x, y, data):
+        path = self.path(z, x, y)
+        _write_atomic(path, data)
+        with self._lock:
+            self._bytes += len(data) - self._tiles.pop(path, 0)
+            self._tiles[path] = len(data)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self._bytes = 0
+            for folder, _, files in os.walk(self.cache_dir, topdown=False):
+                for filename in files:
+                    os.remove(os.path.join(folder, filename))
+
+
+_TILE_PATH = re.compile(r"/tiles/(\d+)/(\d+)/(\d+)\.png")
+
+
+class MapRequestHandler(BaseHTTPRequestHandler):
+    server_version = "PidPalMap/1.0"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        try:
+            match = _TILE_PATH.fullmatch(path)
+            if match:
+                z, x, y = (int(part) for part in match.groups())
+                data = self.server.tile_cache.get(z, x, y)
+                if data is None:
+                    self.send_error(404, "Tile not available")
+                else:
+                    self._send(data, "image/png", max_age=86400)
+            elif path.startswith("/assets/"):
+                self._send_asset(path[len("/assets/"):])
+            elif path.startswith("/map/"):
+                self._send_file(self.server.map_dir, path[len("/map/"):], max_age=0)
+            else:
+                self.send_error(404)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_asset(self, name):
+        bundled = self._local_path(self.server.asset_dir, name)
+        if bundled and os.path.isfile(bundled):
+            self._send_file(self.server.asset_dir, name, max_age=31536000)
+            return
+        download_dir = self.server.download_dir
+        path = self._local_path(download_dir, name)
+        if path and not os.path.exists(path) and name in MAP_ASSETS:
+            # Missing from the bundle: download it once and keep it for next time
+            try:
+                _write_atomic(path, _download(MAP_ASSETS[name]))
+            except OSError:
+                pass
+        self._send_file(download_dir, name, max_age=31536000)
+
+    def _local_path(self, folder, name):
+        """The file `name` inside folder, or None if the name would leave it."""
+        folder = os.path.abspath(folder)
+        path = os.path.abspath(os.path.join(folder, *urllib.parse.unquote(name).split("/")))
+        return path if path.startswith(folder + os.sep) else None
+
+    def _send_file(self, folder, name, max_age):
+        path = self._local_path(folder, name)
+        if not path or not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            data = f.read()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith("javascript"):
+            content_type += "; charset=utf-8"
+        self._send(data, content_type, max_age)
+
+    def _send(self, data, content_type, max_age):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", f"max-age={max_age}" if max_age else "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MapServer:
+    """
+    Serves the map page, the bundled assets and the tile cache on 127.0.0.1 (a free port),
+    from a daemon thread. url_for(map_file) is what the QWebEngineView loads.
+    """
+
+    def __init__(self, map_dir, asset_dir=MAP_ASSET_DIR, tile_cache=None, port=0,
+                 download_dir=ASSET_DOWNLOAD_DIR):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), MapRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.map_dir = map_dir
+        self.httpd.asset_dir = asset_dir
+        self.httpd.download_dir = download_dir
+        self.httpd.tile_cache = tile_cache
+        self._thread = threading.Thread(target=self._serve, name="MapServer", daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        if self.httpd.tile_cache is None:
+            # Reading the tile cache folder takes a while when it's full: not on the GUI thread
+            self.httpd.tile_cache = TileCache()
+        self.httpd.serve_forever()
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, map_file):
+        """URL of a map HTML file in map_dir."""
+        return f"{self.base_url}/map/{urllib.parse.quote(os.path.basename(map_file))}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def map_server(map_dir):
+    """The running MapServer for map_dir, started on first use."""
+    map_dir = os.path.abspath(map_dir)
+    with _servers_lock:
+        if map_dir not in _servers:
+            _servers[map_dir] = MapServer(map_dir)
+        return _servers[map_dir]
+
+
+if __name__ == "__main__":
+    # Refresh the bundled Leaflet files (after changing the pinned versions): python -m pidpal.map_server
+    for written in fetch_map_assets(force=True):
+        print(f"Saved {written}")
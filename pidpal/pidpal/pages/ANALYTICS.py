@@ -0,0 +1,123 @@
+# ANALYTICS.py
+
+import math
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QPushButton,
+    QLabel, QMessageBox, QComboBox, QTableWidget, QTableWidgetItem
+)
+
+from pidpal.analytics import group_statistics, portfolio_totals, rebuild_summaries
+
+
+class AnalyticsPage(QWidget):
+    """
+    Roll-ups of the parcel data per Owner, County or State: total assessed values,
+    land-to-building ratios and TotalValue percentiles (see pidpal.analytics).
+    """
+
+    # Groups shown at once (largest TotalValue first); there can be a lot of owners
+    ROW_LIMIT = 500
+
+    # Columns that are counts or ratios rather than dollar amounts
+    COUNT_COLUMNS = ("ParcelCount", "ValuedCount")
+    RATIO_COLUMNS = ("LandToBuildingRatio", "Median LandToBuildingRatio")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Heading label
+        self.headingLabel = QLabel("Portfolio Analytics")
+        self.headingLabel.setStyleSheet("font-size: 18px; font-weight: bold;")
+        self.headingLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Overall totals
+        self.totalsLabel = QLabel()
+        self.totalsLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Group by options
+        self.groupByCombo = QComboBox()
+        self.groupByCombo.addItems(["County", "State", "Owner"])
+        self.groupByCombo.currentTextChanged.connect(self.loadData)
+
+        self.refreshButton = QPushButton("Refresh")
+        self.refreshButton.clicked.connect(self.loadData)
+        self.rebuildButton = QPushButton("Rebuild Summaries")
+        self.rebuildButton.clicked.connect(self.rebuildSummaries)
+
+        controlsLayout = QHBoxLayout()
+        controlsLayout.addWidget(QLabel("Group by:"))
+        controlsLayout.addWidget(self.groupByCombo)
+        controlsLayout.addWidget(self.refreshButton)
+        controlsLayout.addWidget(self.rebuildButton)
+        controlsLayout.addStretch()
+
+        # The table
+        self.tableWidget = QTableWidget()
+        self.tableWidget.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+
+        tableGroupBox = QGroupBox(f"Top {self.ROW_LIMIT} by Total Value")
+        tableLayout = QVBoxLayout()
+        tableLayout.addWidget(self.tableWidget)
+        tableGroupBox.setLayout(tableLayout)
+
+        # Main layout
+        mainLayout = QVBoxLayout()
+        mainLayout.addWidget(self.headingLabel)
+        mainLayout.addWidget(self.totalsLabel)
+        mainLayout.addLayout(controlsLayout)
+        mainLayout.addWidget(tableGroupBox)
+        self.setLayout(mainLayout)
+
+        self.loadData()
+
+    def formatValue(self, column, value):
+        """Counts as integers, ratios to 3 places, dollar amounts with thousands separators."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return ""
+        if column in self.COUNT_COLUMNS:
+            return f"{int(value):,}"
+        if column in self.RATIO_COLUMNS:
+            return f"{value:.3f}"
+        return f"${value:,.0f}"
+
+    def loadData(self):
+        """Fill the table with group_statistics for the selected grouping."""
+        group_by = self.groupByCombo.currentText()
+
+        try:
+            totals = portfolio_totals()
+            stats = group_statistics(group_by, limit=self.ROW_LIMIT)
+        except Exception as e:
+            QMessageBox.critical(self, "DB Error", f"Error computing analytics:\n{e}")
+            return
+
+        self.totalsLabel.setText(
+            f"{totals['ParcelCount']:,} parcels ({totals['ValuedCount']:,} scraped) - "
+            f"Total assessed value {self.formatValue('TotalValue', totals['TotalValue']) or '$0'}"
+        )
+
+        self.tableWidget.clear()
+        columns = list(stats.columns)
+        self.tableWidget.setColumnCount(len(columns) + 1)
+        self.tableWidget.setHorizontalHeaderLabels([group_by] + columns)
+        self.tableWidget.setRowCount(len(stats))
+
+        for row, (key, values) in enumerate(stats.iterrows()):
+            self.tableWidget.setItem(row, 0, QTableWidgetItem(key or "(none)"))
+            for col, column in enumerate(columns, start=1):
+                item = QTableWidgetItem(self.formatValue(column, values[column]))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.tableWidget.setItem(row, col, item)
+
+        self.tableWidget.resizeColumnsToContents()
+
+    def rebuildSummaries(self):
+        """Recompute every summary from scratch (only needed if master.db was edited by hand)."""
+        try:
+            rebuild_summaries()
+        except Exception as e:
+            QMessageBox.critical(self, "DB Error", f"Error rebuilding summaries:\n{e}")
+            return
+        self.loadData()
@@ -1,16 +1,20 @@
 import os
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QMessageBox
+
+from pidpal.thumbnails import load_preview, load_full, image_size
 
 class ParcelCardDialog(QDialog):
     """
     A simple dialog ("card") for displaying Parcel info.
     Here, we show the ParcelID as a title and an optional screenshot.
+    The screenshot opens as a downscaled preview; "Full Size" decodes the original.
     """
     def __init__(self, parcel_id: str, screenshot_path: str = None, parent=None):
         super().__init__(parent)
         self.parcel_id = parcel_id
         self.screenshot_path = screenshot_path
+        self.zoomed = False
 
         self.setWindowTitle(f"Parcel Card: {parcel_id}")
         self.initUI()
@@ -22,12 +26,29 @@ class ParcelCardDialog(QDialog):
         label_title = QLabel(f"<h3>Parcel: {self.parcel_id}</h3>")
         layout.addWidget(label_title)
 
-        # If there's a screenshot_path, load that image
+        # If there's a screenshot_path, load its preview
         if self.screenshot_path and os.path.exists(self.screenshot_path):
-            pixmap = QPixmap(self.screenshot_path)
-            lbl_img = QLabel()
-            lbl_img.setPixmap(pixmap)
-            layout.addWidget(lbl_img)
+            self.lbl_img = QLabel()
+            self.lbl_img.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+            scrollArea = QScrollArea()
+            scrollArea.setWidget(self.lbl_img)
+            scrollArea.setWidgetResizable(True)
+            layout.addWidget(scrollArea)
+
+            # Zoom toggle between the preview and the full-resolution image
+            size = image_size(self.screenshot_path)
+            self.lbl_size = QLabel(f"Original: {size.width()} x {size.height()} px")
+            self.zoomButton = QPushButton("Full Size")
+            self.zoomButton.clicked.connect(self.toggleZoom)
+
+            zoomLayout = QHBoxLayout()
+            zoomLayout.addWidget(self.lbl_size)
+            zoomLayout.addStretch()
+            zoomLayout.addWidget(self.zoomButton)
+            layout.addLayout(zoomLayout)
+
+            self.showImage()
         else:
             layout.addWidget(QLabel("No screenshot found for this parcel."))
 
@@ -35,3 +56,21 @@ class ParcelCardDialog(QDialog):
         # you could add more widgets here.
 
         self.setLayout(layout)
+        self.resize(960, 720)
+
+    def showImage(self):
+        """Show the preview, or the full image when zoomed."""
+        try:
+            if self.zoomed:
+                pixmap = load_full(self.screenshot_path)
+            else:
+                pixmap = load_preview(self.screenshot_path)
+        except Exception as e:
+            QMessageBox.warning(self, "Image Error", f"Could not load screenshot:\n{e}")
+            return
+        self.lbl_img.setPixmap(pixmap)
+
+    def toggleZoom(self):
+        self.zoomed = not self.zoomed
+        self.zoomButton.setText("Preview" if self.zoomed else "Full Size")
+        self.showImage()
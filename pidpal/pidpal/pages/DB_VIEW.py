@@ -1,22 +1,186 @@
 # DB_VIEW.py
 
 import os
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QTableWidget, QTableWidgetItem, QPushButton, QLabel,
-    QMessageBox, QLineEdit, QComboBox, QFormLayout
+    QTableView, QPushButton, QLabel,
+    QMessageBox, QLineEdit, QComboBox, QFormLayout,
+    QFileDialog, QProgressDialog
 )
 from PyQt6.QtGui import QBrush, QColor, QFont
 
 # Your DB helpers (adjust the actual import path if needed)
-from pidpal.db_func import query_parcels, get_screenshot_path
+from pidpal.db_func import query_parcels_page, get_screenshot_path
+from pidpal.export import export_parcels, ExportCancelled
 # Import the separate card dialog
 from pidpal.pages.CARD_DIALOG import ParcelCardDialog
 
+# Search box modes -> query_parcels search_mode
+SEARCH_MODE_LABELS = [
+    ("Words", "token"),
+    ("Starts with", "prefix"),
+    ("Contains", "substring"),
+]
+
+
+class ParcelTableModel(QAbstractTableModel):
+    """
+    Read-only model over query_parcels_page. Rows are pulled from the DB one page at a time
+    as the view scrolls (canFetchMore/fetchMore), so only what has been scrolled into view
+    is ever loaded, and no per-cell item objects are created.
+    """
+
+    COLUMNS = [
+        "ParcelID", "State", "County", "LandValue", "BuildingValue",
+        "TotalValue", "AssessmentYear", "LastScraped", "PropertyID", "Owner"
+    ]
+    PARCEL_ID_COL = 0
+    PAGE_SIZE = 500
+
+    def __init__(self, filters=None, sort_by=None, sort_order="ASC",
+                 search=None, search_mode="token", first_page=None, parent=None):
+        super().__init__(parent)
+        self.filters = filters or {}
+        self.sort_by = sort_by
+        self.sort_order = sort_order
+        self.search = search
+        self.search_mode = search_mode
+
+        self.rows = []          # tuples in COLUMNS order
+        self._after = None      # keyset cursor for the next page
+        self._exhausted = False
+
+        # ParcelID is styled like a hyperlink (see data())
+        self._link_brush = QBrush(QColor("blue"))
+        self._link_font = QFont()
+        self._link_font.setUnderline(True)
+
+        # Load the first page right away so the caller can tell if there's any data
+        # (or take the (page, after) a PageLoadWorker already fetched)
+        if first_page is None:
+            self.fetchMore(QModelIndex())
+        else:
+            self.addPage(*first_page)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.rows[index.row()][index.column()])
+
+        if index.column() == self.PARCEL_ID_COL:
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return self._link_brush
+            if role == Qt.ItemDataRole.FontRole:
+                return self._link_font
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return str(section + 1)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self._exhausted:
+            return
+
+        page, self._after = query_parcels_page(
+            filters=self.filters,
+            sort_by=self.sort_by,
+            sort_order=self.sort_order,
+            page_size=self.PAGE_SIZE,
+            after=self._after,
+            search=self.search,
+            search_mode=self.search_mode
+        )
+        self.addPage(page, self._after)
+
+    def addPage(self, page, after):
+        """Append a page of query_parcels_page rows; `after` is the cursor for the next one."""
+        self._after = after
+        self._exhausted = after is None
+
+        if page:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self.rows.extend(tuple(row.get(col) for col in self.COLUMNS) for row in page)
+            self.endInsertRows()
+
+    def parcelIdAt(self, row):
+        return self.rows[row][self.PARCEL_ID_COL]
+
+
+class PageLoadWorker(QThread):
+    """
+    Runs the first query_parcels_page off the GUI thread, so the page shows before the query
+    finishes. Emits loaded(page, after) or failed(message).
+    """
+
+    loaded = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, query_args, parent=None):
+        super().__init__(parent)
+        self.query_args = query_args
+
+    def run(self):
+        try:
+            page, after = query_parcels_page(page_size=ParcelTableModel.PAGE_SIZE, **self.query_args)
+        except Exception as e:
+            self.failed.emit(f"Error fetching data:\n{e}")
+        else:
+            self.loaded.emit(page, after)
+
+
+class ExportWorker(QThread):
+    """
+    Runs export_parcels off the GUI thread. Emits progress(rows_written, total_rows), then
+    either finishedExport(rows_written) or failed(message). requestInterruption() cancels.
+    """
+
+    progress = pyqtSignal(int, int)
+    finishedExport = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, query_args, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.query_args = query_args
+
+    def run(self):
+        try:
+            rows = export_parcels(
+                self.path,
+                progress=self.progress.emit,
+                cancelled=self.isInterruptionRequested,
+                **self.query_args
+            )
+        except ExportCancelled:
+            self.failed.emit("Export cancelled.")
+        except Exception as e:
+            self.failed.emit(f"Error exporting data:\n{e}")
+        else:
+            self.finishedExport.emit(rows)
+
+
 class DBViewPage(QWidget):
     """
-    A page that queries the DB (Parcels, etc.) and displays results in a QTableWidget.
+    A page that queries the DB (Parcels, etc.) and displays results in a QTableView
+    backed by a lazily-paged ParcelTableModel.
     If user double-clicks on ParcelID, it opens a 'card' dialog with more details.
     """
     def __init__(self, parent=None):
@@ -45,6 +209,21 @@ class DBViewPage(QWidget):
         filterGroupBox = QGroupBox("Filters (Exact Match)")
         filterGroupBox.setLayout(filterForm)
 
+        # Full-text search over ParcelID, Owner, County and PropertyID
+        self.searchInput = QLineEdit()
+        self.searchInput.setPlaceholderText("Search ParcelID, Owner, County, PropertyID")
+        self.searchInput.returnPressed.connect(self.loadData)
+
+        self.searchModeCombo = QComboBox()
+        for label, mode in SEARCH_MODE_LABELS:
+            self.searchModeCombo.addItem(label, mode)
+
+        searchLayout = QHBoxLayout()
+        searchLayout.addWidget(self.searchInput)
+        searchLayout.addWidget(self.searchModeCombo)
+        searchGroupBox = QGroupBox("Search")
+        searchGroupBox.setLayout(searchLayout)
+
         # Sorting options
         self.sortColumnCombo = QComboBox()
         self.sortColumnCombo.addItem("No Sorting")
@@ -67,20 +246,25 @@ class DBViewPage(QWidget):
         self.searchButton.clicked.connect(self.loadData)
         self.clearButton = QPushButton("Clear Filters")
         self.clearButton.clicked.connect(self.clearFilters)
+        self.exportButton = QPushButton("Export...")
+        self.exportButton.clicked.connect(self.exportData)
+        self.exportWorker = None
 
         buttonLayout = QHBoxLayout()
         buttonLayout.addWidget(self.searchButton)
         buttonLayout.addWidget(self.clearButton)
         buttonLayout.addStretch()
+        buttonLayout.addWidget(self.exportButton)
 
-        # The table
-        self.tableWidget = QTableWidget()
-        self.tableWidget.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.tableWidget.cellDoubleClicked.connect(self.onCellDoubleClicked)
+        # The table (model is set by loadData)
+        self.tableView = QTableView()
+        self.tableView.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.tableView.doubleClicked.connect(self.onCellDoubleClicked)
+        self.model = None
 
         tableGroupBox = QGroupBox("Query Results")
         tableLayout = QVBoxLayout()
-        tableLayout.addWidget(self.tableWidget)
+        tableLayout.addWidget(self.tableView)
         tableGroupBox.setLayout(tableLayout)
 
         # Main layout
@@ -92,20 +276,22 @@ class DBViewPage(QWidget):
         topRowLayout.addWidget(sortGroupBox)
 
         mainLayout.addLayout(topRowLayout)
+        mainLayout.addWidget(searchGroupBox)
         mainLayout.addLayout(buttonLayout)
         mainLayout.addWidget(tableGroupBox)
 
         self.setLayout(mainLayout)
 
-        # Optionally auto-load
+        # Auto-load (in the background; the table fills in when the query returns)
+        self.loadWorker = None
         self.loadData()
 
         # Enable the row index column (vertical header).
-        self.tableWidget.setCornerButtonEnabled(True)
-        self.tableWidget.verticalHeader().setVisible(True)
+        self.tableView.setCornerButtonEnabled(True)
+        self.tableView.verticalHeader().setVisible(True)
 
          # Lighter gray for horizontal header
-        self.tableWidget.horizontalHeader().setStyleSheet("""
+        self.tableView.horizontalHeader().setStyleSheet("""
             QHeaderView::section {
                 background-color: #777; /* a medium gray */
                 color: white;           /* white text for contrast */
@@ -115,7 +301,7 @@ class DBViewPage(QWidget):
         """)
 
         # Slightly different gray for vertical header
-        self.tableWidget.verticalHeader().setStyleSheet("""
+        self.tableView.verticalHeader().setStyleSheet("""
             QHeaderView::section {
                 background-color: #888; /* slightly different gray */
                 color: white;           /* white text */
@@ -138,73 +324,107 @@ class DBViewPage(QWidget):
             filters["County"] = self.countyInput.text().strip()
         return filters
 
-    def loadData(self):
-        """Fetch and display data in the table."""
-        self.tableWidget.clearContents()
-        self.tableWidget.setRowCount(0)
-        self.tableWidget.setColumnCount(0)
-
-        # Build filters
-        filters = self.buildFilters()
-
+    def buildQueryArgs(self):
+        """
+        Return the query_parcels keyword arguments (filters, sorting, search) for the current inputs.
+        """
         # Sorting
         selected_sort_col = self.sortColumnCombo.currentText()
         if selected_sort_col == "No Sorting":
             sort_by = None
         else:
             sort_by = selected_sort_col
-        sort_order = self.sortOrderCombo.currentText()
 
-        try:
-            data_list = query_parcels(filters=filters, sort_by=sort_by, sort_order=sort_order)
-        except Exception as e:
-            QMessageBox.critical(self, "DB Error", f"Error fetching data:\n{e}")
-            return
+        return {
+            "filters": self.buildFilters(),
+            "sort_by": sort_by,
+            "sort_order": self.sortOrderCombo.currentText(),
+            # Search (empty box means no search)
+            "search": self.searchInput.text().strip() or None,
+            "search_mode": self.searchModeCombo.currentData(),
+        }
 
-        if not data_list:
-            QMessageBox.information(self, "No Data", "No records found in the database.")
+    def loadData(self):
+        """Fetch the first page in the background and display it; more pages load as the table scrolls."""
+        worker = PageLoadWorker(self.buildQueryArgs(), self)
+        worker.loaded.connect(self.onPageLoaded)
+        worker.failed.connect(self.onLoadFailed)
+        worker.finished.connect(worker.deleteLater)
+        self.loadWorker = worker
+        worker.start()
+
+    def onLoadFailed(self, message):
+        if self.sender() is self.loadWorker:
+            QMessageBox.critical(self, "DB Error", message)
+
+    def onPageLoaded(self, page, after):
+        # Results of an older query (the inputs changed while it ran) are dropped
+        worker = self.sender()
+        if worker is not self.loadWorker:
             return
 
-        # Store for later reference
-        self.current_data = data_list
+        model = ParcelTableModel(parent=self, first_page=(page, after), **worker.query_args)
+        self.tableView.setModel(model)
+        if self.model is not None:
+            self.model.deleteLater()
+        self.model = model
 
-        columns = list(data_list[0].keys())  # e.g. ["ParcelID","State","County",...,"Owner"]
-        self.tableWidget.setColumnCount(len(columns))
-        self.tableWidget.setHorizontalHeaderLabels(columns)
-
-        # Identify ParcelID column
-        self.parcel_id_col_idx = columns.index("ParcelID") if "ParcelID" in columns else -1
-
-        # Insert rows
-        for row_idx, row_dict in enumerate(data_list):
-            self.tableWidget.insertRow(row_idx)
-            for col_idx, col_name in enumerate(columns):
-                val = str(row_dict.get(col_name, ""))
-                item = QTableWidgetItem(val)
-
-                # If it's ParcelID, style as hyperlink
-                if col_idx == self.parcel_id_col_idx:
-                    self.makeHyperlink(item)
+        if model.rowCount() == 0:
+            QMessageBox.information(self, "No Data", "No records found in the database.")
+            return
 
-                self.tableWidget.setItem(row_idx, col_idx, item)
+        # Only the first page is loaded at this point, so this stays cheap
+        self.tableView.resizeColumnsToContents()
 
-        self.tableWidget.resizeColumnsToContents()
+    def exportData(self):
+        """Export every row matching the current filters/search to CSV, XLSX or Parquet."""
+        if self.exportWorker is not None:
+            return
 
-    def makeHyperlink(self, item):
-        """Visually style the item like a hyperlink."""
-        item.setForeground(QBrush(QColor("blue")))
-        font = item.font()
-        font.setUnderline(True)
-        item.setFont(font)
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Query Results",
+            "parcels.csv",
+            "CSV Files (*.csv);;Excel Files (*.xlsx);;Parquet Files (*.parquet)"
+        )
+        if not path:
+            return
 
-    def onCellDoubleClicked(self, row, col):
+        self.exportProgress = QProgressDialog("Exporting...", "Cancel", 0, 100, self)
+        self.exportProgress.setWindowTitle("Export")
+        self.exportProgress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.exportProgress.setMinimumDuration(0)
+
+        self.exportWorker = ExportWorker(path, self.buildQueryArgs(), self)
+        self.exportWorker.progress.connect(self.onExportProgress)
+        self.exportWorker.finishedExport.connect(
+            lambda rows: QMessageBox.information(self, "Export", f"Exported {rows:,} rows to:\n{path}")
+        )
+        self.exportWorker.failed.connect(lambda message: QMessageBox.warning(self, "Export", message))
+        self.exportWorker.finished.connect(self.onExportFinished)
+        self.exportProgress.canceled.connect(self.exportWorker.requestInterruption)
+
+        self.exportButton.setEnabled(False)
+        self.exportWorker.start()
+
+    def onExportProgress(self, written, total):
+        self.exportProgress.setMaximum(max(total, 1))
+        self.exportProgress.setValue(written)
+        self.exportProgress.setLabelText(f"Exported {written:,} of {total:,} rows...")
+
+    def onExportFinished(self):
+        self.exportProgress.close()
+        self.exportWorker.deleteLater()
+        self.exportWorker = None
+        self.exportButton.setEnabled(True)
+
+    def onCellDoubleClicked(self, index):
         """Open the ParcelCardDialog if user double-clicks the ParcelID column."""
-        if not hasattr(self, "current_data"):
+        if self.model is None or not index.isValid():
             return
 
-        if col == self.parcel_id_col_idx and self.parcel_id_col_idx >= 0:
-            row_data = self.current_data[row]
-            parcel_id = row_data.get("ParcelID", "")
+        if index.column() == ParcelTableModel.PARCEL_ID_COL:
+            parcel_id = self.model.parcelIdAt(index.row())
             # Optionally get the screenshot path
             screenshot_path = get_screenshot_path(parcel_id)
 
@@ -219,6 +439,8 @@ class DBViewPage(QWidget):
         self.parcelIDInput.clear()
         self.stateInput.clear()
         self.countyInput.clear()
+        self.searchInput.clear()
+        self.searchModeCombo.setCurrentIndex(0)  # "Words"
         self.sortColumnCombo.setCurrentIndex(0)  # "No Sorting"
         self.sortOrderCombo.setCurrentIndex(0)   # "ASC"
         self.loadData()
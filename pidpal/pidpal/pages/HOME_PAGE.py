@@ -1,14 +1,17 @@
 # home_page.py
 
-from PyQt6.QtCore import Qt
+import os
+
+from PyQt6.QtCore import Qt, QUrl
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout,
     QGroupBox, QVBoxLayout
 )
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 
-# Import our leaflet map generator
-from pidpal.scrapers.working_county_map import generate_leaflet_map_html
+# Import our leaflet map generator and the local server for its assets and tiles
+from pidpal.scrapers.working_county_map import leaflet_map_file
+from pidpal.map_server import map_server
 
 class HomePage(QWidget):
     def __init__(self, parent=None):
@@ -44,11 +47,13 @@ class HomePage(QWidget):
         navLayout.addWidget(self.dbViewButton)
         navLayout.addStretch()
 
-        # Generate the Leaflet map HTML (pointing to your CSV file)
-        map_html = generate_leaflet_map_html(r"Resources\PidPal Counties Tracker.csv")
+        # The Leaflet map HTML for your CSV file (cached on disk, rebuilt only when the CSV changes)
+        map_file = leaflet_map_file(r"Resources\PidPal Counties Tracker.csv")
 
+        # Served from 127.0.0.1 together with the bundled Leaflet files and the tile cache,
+        # so the map doesn't wait on the network (and still shows cached tiles offline)
         self.mapView = QWebEngineView()
-        self.mapView.setHtml(map_html)
+        self.mapView.load(QUrl(map_server(os.path.dirname(map_file)).url_for(map_file)))
 
         # Put the map in a group box
         mapGroupBox = QGroupBox("Parcel Map")
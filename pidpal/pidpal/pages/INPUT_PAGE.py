@@ -1,22 +1,107 @@
 import os
 import csv
-from itertools import islice
 
-# For Excel support
 import pandas as pd
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QPushButton,
-    QLabel, QFileDialog, QMessageBox, QTableWidget, QTableWidgetItem,
+    QLabel, QFileDialog, QMessageBox, QTableView,
     QHeaderView
 )
+from PyQt6.QtGui import QBrush, QColor
 
-# Import custom modules
-from pidpal.scrapers.scrape_all import scrape_all_counties
-from pidpal.db_func import insert_initial_parcels, insert_scraped_data
-from pidpal.func import clean_record
+# Import custom modules (the scrapers, and with them Selenium, are imported when Go! runs)
+from pidpal.db_func import insert_initial_parcels, insert_scraped_data, insert_scrape_failures
+from pidpal.func import DataBatch
+from pidpal.parcel_import import (
+    IMPORT_COLUMNS, IMPORT_FORMATS, load_parcel_batch, append_batch, empty_batch, batch_records
+)
+from pidpal.parcel_ids import check_parcel_batch, valid_rows, rejected_rows
+
+# Seconds Go! waits for the browser (started by the first Go!) before giving up
+BROWSER_TIMEOUT = 60
+
+
+class ParcelBatchModel(QAbstractTableModel):
+    """
+    Editable model over an imported parcel batch (a DataFrame with IMPORT_COLUMNS, see
+    pidpal.parcel_import). Cells are read from the batch when the view paints them, so no
+    per-cell item objects exist and the batch is the only copy of the data.
+    Batches are run through check_parcel_batch, and rows with an Issue are shown in red.
+    """
+
+    COLUMNS = IMPORT_COLUMNS + ["Issue"]
+    ISSUE_COL = len(IMPORT_COLUMNS)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.batch = check_parcel_batch(empty_batch())
+        self._issue_brush = QBrush(QColor("red"))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.batch)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self.COLUMNS[index.column()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.batch[column].iat[index.row()]
+        if role == Qt.ItemDataRole.ForegroundRole and self.batch["Issue"].iat[index.row()]:
+            return self._issue_brush
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        if index.column() == self.ISSUE_COL:
+            return super().flags(index)
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or index.column() == self.ISSUE_COL:
+            return False
+        row = index.row()
+        column = self.COLUMNS[index.column()]
+        value = str(value).strip()
+        values = self.batch[column]
+        if isinstance(values.dtype, pd.CategoricalDtype) and value not in values.cat.categories:
+            self.batch[column] = values.cat.add_categories([value])
+        self.batch.loc[row, column] = value
+
+        # Re-check the edited row (the ParcelID may be normalized, the Issue may clear)
+        checked = check_parcel_batch(self.batch.loc[[row], IMPORT_COLUMNS])
+        for col in ("ParcelID", "ScraperKey", "Issue"):
+            self.batch.loc[row, col] = checked.at[row, col]
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.ISSUE_COL))
+        return True
+
+    def appendBatch(self, batch):
+        """Check another imported batch and add its rows after the current ones."""
+        if not len(batch):
+            return
+        first = len(self.batch)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        self.batch = append_batch(self.batch, check_parcel_batch(batch))
+        self.endInsertRows()
+
+    def setBatch(self, batch):
+        """Replace the rows with an already checked batch."""
+        self.beginResetModel()
+        self.batch = batch.reset_index(drop=True)
+        self.endResetModel()
 
+    def clear(self):
+        self.setBatch(check_parcel_batch(empty_batch()))
 
 
 class ImportPage(QWidget):
@@ -40,13 +125,12 @@ class ImportPage(QWidget):
         self.importButton = QPushButton("Import Spreadsheet")
         self.importButton.clicked.connect(self.addRowToTable)
 
-        # TableWidget
-        self.tableWidget = QTableWidget()
-        self.tableWidget.setColumnCount(5)
-        self.tableWidget.setHorizontalHeaderLabels(["ParcelID", "County", "State", "PropertyID", "Owner"])
-        header = self.tableWidget.horizontalHeader()
+        # Table (a view over the imported batch)
+        self.model = ParcelBatchModel(self)
+        self.tableView = QTableView()
+        self.tableView.setModel(self.model)
+        header = self.tableView.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.tableWidget.setRowCount(0)
 
         # Go! button
         self.goButton = QPushButton("Go!")
@@ -56,7 +140,7 @@ class ImportPage(QWidget):
         # GroupBox for the table
         tableGroupBox = QGroupBox("Parcel Information")
         tableLayout = QVBoxLayout()
-        tableLayout.addWidget(self.tableWidget)
+        tableLayout.addWidget(self.tableView)
         tableGroupBox.setLayout(tableLayout)
 
         # Layout: Top buttons
@@ -95,7 +179,7 @@ class ImportPage(QWidget):
 
     def addRowToTable(self):
         """
-        Prompts user to select CSV or XLSX, then populates the table.
+        Prompts user to select CSV or XLSX, then adds its rows to the table.
         """
         importedSpreadsheet = self.browse()
         if not importedSpreadsheet:
@@ -103,69 +187,29 @@ class ImportPage(QWidget):
             return
 
         file_ext = os.path.splitext(importedSpreadsheet)[1].lower()
-
-        # -- CSV --
-        if file_ext == '.csv':
-            try:
-                with open(importedSpreadsheet, 'r', encoding='utf-8-sig') as file:
-                    csv_reader = csv.reader(file)
-                    # Skip header row
-                    for row in islice(csv_reader, 1, None):
-                        parcelID   = row[0] if len(row) > 0 else ""
-                        county     = row[1] if len(row) > 1 else ""
-                        state      = row[2] if len(row) > 2 else ""
-                        propertyID = row[3] if len(row) > 3 else ""
-                        owner      = row[4] if len(row) > 4 else ""
-
-                        rowPos = self.tableWidget.rowCount()
-                        self.tableWidget.insertRow(rowPos)
-                        self.tableWidget.setItem(rowPos, 0, QTableWidgetItem(parcelID))
-                        self.tableWidget.setItem(rowPos, 1, QTableWidgetItem(county))
-                        self.tableWidget.setItem(rowPos, 2, QTableWidgetItem(state))
-                        self.tableWidget.setItem(rowPos, 3, QTableWidgetItem(propertyID))
-                        self.tableWidget.setItem(rowPos, 4, QTableWidgetItem(owner))
-
-                QMessageBox.information(
-                    self, "Import Successful",
-                    f"Successfully imported CSV from:\n{importedSpreadsheet}"
-                )
-
-            except Exception as e:
-                QMessageBox.critical(self, "Import Error", f"Failed to read CSV file:\n{e}")
-
-        # -- XLSX --
-        elif file_ext == '.xlsx':
-            try:
-                df = pd.read_excel(importedSpreadsheet)
-                for _, row in df.iterrows():
-                    parcelID   = str(row[0]) if 0 in row else ""
-                    county     = str(row[1]) if 1 in row else ""
-                    state      = str(row[2]) if 2 in row else ""
-                    propertyID = str(row[3]) if 3 in row else ""
-                    owner      = str(row[4]) if 4 in row else ""
-
-                    rowPos = self.tableWidget.rowCount()
-                    self.tableWidget.insertRow(rowPos)
-                    self.tableWidget.setItem(rowPos, 0, QTableWidgetItem(parcelID))
-                    self.tableWidget.setItem(rowPos, 1, QTableWidgetItem(county))
-                    self.tableWidget.setItem(rowPos, 2, QTableWidgetItem(state))
-                    self.tableWidget.setItem(rowPos, 3, QTableWidgetItem(propertyID))
-                    self.tableWidget.setItem(rowPos, 4, QTableWidgetItem(owner))
-
-                QMessageBox.information(
-                    self, "Import Successful",
-                    f"Successfully imported Excel file from:\n{importedSpreadsheet}"
-                )
-
-            except Exception as e:
-                QMessageBox.critical(self, "Import Error", f"Failed to read Excel file:\n{e}")
-
-        # -- Otherwise --
-        else:
+        if file_ext not in IMPORT_FORMATS:
             QMessageBox.warning(
                 self, "Unsupported File",
                 "Unsupported file extension. Please select a CSV or XLSX file."
             )
+            return
+
+        kind = "CSV" if file_ext == '.csv' else "Excel file"
+        try:
+            batch = load_parcel_batch(importedSpreadsheet)
+        except Exception as e:
+            QMessageBox.critical(self, "Import Error", f"Failed to read {kind}:\n{e}")
+            return
+
+        self.model.appendBatch(batch)
+        rejected = len(rejected_rows(self.model.batch))
+        message = f"Successfully imported {len(batch):,} rows from {kind}:\n{importedSpreadsheet}"
+        if rejected:
+            message += (
+                f"\n\n{rejected:,} rows have an issue (shown in red) and will be skipped "
+                "unless fixed."
+            )
+        QMessageBox.information(self, "Import Successful", message)
 
     def downloadCSVTemplate(self):
         """
@@ -197,52 +241,71 @@ class ImportPage(QWidget):
 
     def processAllRows(self):
         """
-        Reads all rows, calls scrape & DB functions, then clears the table.
+        Takes the imported batch, calls scrape & DB functions, then clears the table.
+        Rows with an Issue (unsupported county, malformed ParcelID) are left out and stay
+        in the table to be fixed; rows deferred because their county site was down stay in
+        the table too, to run again later.
         """
-        row_count = self.tableWidget.rowCount()
-        data_list = []
-
-        for row in range(row_count):
-            parcelID = self.tableWidget.item(row, 0).text() if self.tableWidget.item(row, 0) else ""
-            county   = self.tableWidget.item(row, 1).text() if self.tableWidget.item(row, 1) else ""
-            state    = self.tableWidget.item(row, 2).text() if self.tableWidget.item(row, 2) else ""
-            propID   = self.tableWidget.item(row, 3).text() if self.tableWidget.item(row, 3) else ""
-            owner    = self.tableWidget.item(row, 4).text() if self.tableWidget.item(row, 4) else ""
-
-            data_list.append({
-                "ParcelID": parcelID,
-                "County": county,
-                "State": state,
-                "PropertyID": propID,
-                "Owner": owner
-            })
+        data_list = batch_records(valid_rows(self.model.batch))
+        rejected = rejected_rows(self.model.batch)
+        if not data_list:
+            QMessageBox.warning(self, "Nothing to Scrape", "No rows without an issue to scrape.")
+            return
+
+        # The app's browser: started by the first Go!, then kept for the next ones
+        from pidpal.scrapers.scrape_all import scrape_all_counties
+        from pidpal.scrapers.driver_pool import shared_pool
+        pool = shared_pool(headless=False)
+        try:
+            driver = pool.acquire(timeout=BROWSER_TIMEOUT)
+        except Exception as e:
+            QMessageBox.critical(self, "Browser Error", f"Could not start the browser for scraping:\n{e}")
+            return
 
         # Insert into DB
-        insert_initial_parcels(data_list)
+        try:
+            insert_initial_parcels(data_list)
+        except Exception:
+            pool.release(driver)
+            raise
 
         # Scrape data
-        all_scraped_data = scrape_all_counties(data_list, screenshot_dir="Screenshots")
-
-        for data_obj in all_scraped_data:
-            # Convert to a dict
-            record = data_obj.to_dict()
-            clean_record(record)
-            # Optionally write the cleaned values back to the DataObject
-            # so that data_obj is updated too:
-            data_obj.LandValue = record["LandValue"]
-            data_obj.BuildingValue = record["BuildingValue"]
-            data_obj.TotalValue = record["TotalValue"]
-            data_obj.AssessmentYear = record["AssessmentYear"]
-            # if you store LastScraped or PropertyID in the DataObject, do that too
-
-        # Insert scraped data
-        insert_scraped_data(all_scraped_data)
-
-        QMessageBox.information(self, "Scrape Complete", "Data scraped and inserted.")
+        broken = True
+        deferred = []
+        failures = []
+        try:
+            all_scraped_data = scrape_all_counties(data_list, screenshot_dir="Screenshots", driver=driver,
+                                                   deferred=deferred, failures=failures)
+            broken = False
+        finally:
+            pool.release(driver, parcels=len(data_list), broken=broken)
+
+        # Clean the scraped values column-wise into one batch (numbers as floats, AssessmentYear as int)
+        places = {row["ParcelID"]: (row["County"], row["State"]) for row in data_list}
+        scraped_batch = DataBatch.from_objects(all_scraped_data, places)
+        del all_scraped_data
+
+        # Insert scraped data, and record what failed (for `python -m pidpal.cli --retry`)
+        insert_scraped_data(scraped_batch)
+        insert_scrape_failures(failures)
+
+        message = "Data scraped and inserted."
+        if len(rejected):
+            message += f"\n{len(rejected):,} rows with an issue were skipped and left in the table."
+        failed = {}
+        for failure in failures:
+            failed[failure["Class"]] = failed.get(failure["Class"], 0) + 1
+        if failed:
+            counts = ", ".join(f"{count:,} {name.replace('_', ' ')}" for name, count in failed.items())
+            message += f"\nFailed parcels ({counts}) were recorded in ScrapeFailures."
+        if deferred:
+            message += (f"\n{len(deferred):,} parcels were deferred because their county site is down;"
+                        " they were left in the table to run again later.")
+        QMessageBox.information(self, "Scrape Complete", message)
 
         # Debug prints (optional)
         print("\nScraped Data Objects:")
-        for obj in all_scraped_data:
+        for obj in scraped_batch:
             print(f"ParcelID: {obj.ParcelID}")
             print(f"  LandValue: {obj.LandValue}")
             print(f"  BuildingValue: {obj.BuildingValue}")
@@ -251,5 +314,7 @@ class ImportPage(QWidget):
             print(f"  ScreenshotPath: {obj.ScreenshotPath}")
             print("-----")
 
-        # Clear table
-        self.tableWidget.setRowCount(0)
+        # Clear table (keeping only the skipped and deferred rows)
+        batch = self.model.batch
+        deferred_ids = {row["ParcelID"] for row in deferred}
+        self.model.setBatch(batch[(batch["Issue"] != "") | batch["ParcelID"].isin(deferred_ids)])
@@ -0,0 +1,123 @@
+# Pre-flight checks for imported parcel lists.
+#
+# Every row is matched to its scraper key (county_data/county_mapping.py) and its ParcelID is
+# normalized and checked against the county's format (county_data/parcel_id_formats.py), all as
+# column operations over the batch. Rows with no scraper or a malformed ID are flagged in an
+# "Issue" column so they can be fixed or left out before a scrape, instead of each one failing
+# in the browser after a WebDriverWait timeout.
+import re
+
+import numpy as np
+import pandas as pd
+
+from county_data.county_mapping import COUNTY_MAPPING, TEMPLATE_SCRAPER_KEYS
+from county_data.cpt_urls import CPT_URL_MAPPING
+from county_data.patriot_urls import PATRIOT_URL_MAPPING
+from county_data.parcel_id_formats import PARCEL_ID_FORMATS
+
+# Keys that some scraper in scrape_all can handle
+SUPPORTED_KEYS = frozenset(TEMPLATE_SCRAPER_KEYS) | frozenset(PATRIOT_URL_MAPPING) | frozenset(CPT_URL_MAPPING)
+
+# Counties without an entry in PARCEL_ID_FORMATS: letters/digits with common separators
+GENERIC_PATTERN = r"[0-9A-Za-z][0-9A-Za-z .\-/]*"
+MAX_PARCEL_ID_LENGTH = 40
+
+_KEY_SEPARATOR = "\x1f"
+# Casefolded like county_data.county_mapping.county_key
+_KEY_LOOKUP = {
+    f"{county.casefold()}{_KEY_SEPARATOR}{state.casefold()}": key for (county, state), key in COUNTY_MAPPING.items()
+}
+
+
+def _template_regex(template):
+    """"##-###" -> (r"^(\d{2})(\d{3})$", r"\1-\2", 5): digits-only ID -> template layout."""
+    groups = re.findall(r"#+", template)
+    separators = re.split(r"#+", template)[1:-1]
+    replacement = r"\1"
+    for i, separator in enumerate(separators, start=2):
+        replacement += separator + f"\\{i}"
+    pattern = "^" + "".join(f"(\\d{{{len(g)}}})" for g in groups) + "$"
+    return pattern, replacement, sum(len(g) for g in groups)
+
+
+def scraper_keys(batch):
+    """COUNTY_MAPPING key of each row (NaN where the County/State pair isn't mapped)."""
+    combo = (
+        batch["County"].astype(str).str.strip().str.casefold()
+        + _KEY_SEPARATOR
+        + batch["State"].astype(str).str.strip().str.casefold()
+    )
+    return combo.map(_KEY_LOOKUP)
+
+
+def normalize_parcel_ids(parcel_ids, keys):
+    """
+    Normalized ParcelIDs: trimmed, inner whitespace collapsed, then the county's upper-casing,
+    separator replacements and template layout (PARCEL_ID_FORMATS) applied.
+    """
+    ids = parcel_ids.astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+    for key, spec in PARCEL_ID_FORMATS.items():
+        mask = keys == key
+        if not mask.any():
+            continue
+        sub = ids[mask]
+        if spec.get("uppercase"):
+            sub = sub.str.upper()
+        if spec.get("separators"):
+            sub = sub.str.translate(str.maketrans(spec["separators"]))
+        if spec.get("template"):
+            pattern, replacement, n_digits = _template_regex(spec["template"])
+            digits = sub.str.replace(r"\D", "", regex=True)
+            # Only IDs made of digits and separators, with the right digit count, are re-laid out
+            fits = sub.str.fullmatch(r"[0-9 .\-/_]+") & (digits.str.len() == n_digits)
+            sub = sub.where(~fits, digits.str.replace(pattern, replacement, regex=True))
+        ids[mask] = sub
+    return ids
+
+
+def check_parcel_batch(batch):
+    """
+    Returns a copy of an imported batch (see pidpal.parcel_import) with ParcelID normalized and
+    two added columns: ScraperKey (the county key, "" if unmapped) and Issue ("" for rows that
+    can be scraped, otherwise why not).
+    """
+    batch = batch.copy()
+    keys = scraper_keys(batch)
+    ids = normalize_parcel_ids(batch["ParcelID"], keys)
+
+    valid_id = ids.str.fullmatch(GENERIC_PATTERN) & (ids.str.len() <= MAX_PARCEL_ID_LENGTH)
+    bad_format = pd.Series("", index=batch.index)
+    for key, spec in PARCEL_ID_FORMATS.items():
+        mask = keys == key
+        if mask.any():
+            valid_id[mask] = ids[mask].str.fullmatch(spec["pattern"])
+            bad_format[mask] = f"ParcelID doesn't match the {key} format (e.g. {spec['example']})"
+    bad_format[bad_format == ""] = "ParcelID has unexpected characters"
+
+    mapped = keys.notna()
+    supported = keys.isin(SUPPORTED_KEYS)
+    missing = ids == ""
+
+    batch["ParcelID"] = ids
+    batch["ScraperKey"] = keys.fillna("")
+    batch["Issue"] = np.select(
+        [missing, ~mapped, ~supported, ~valid_id.astype(bool)],
+        [
+            "Missing ParcelID",
+            "No scraper for this County/State",
+            "County is mapped but has no scraper yet",
+            bad_format,
+        ],
+        default="",
+    )
+    return batch
+
+
+def valid_rows(batch):
+    """Rows of a checked batch with no Issue."""
+    return batch[batch["Issue"] == ""]
+
+
+def rejected_rows(batch):
+    """Rows of a checked batch with an Issue."""
+    return batch[batch["Issue"] != ""]
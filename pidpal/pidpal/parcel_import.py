@@ -0,0 +1,147 @@
+# Spreadsheet import for the Import page.
+#
+# CSV and XLSX files are read in chunks into DataFrames with the five template columns
+# (ParcelID, County, State, PropertyID, Owner), mapped by position like the CSV template, and
+# concatenated into one batch. County and State are stored as categoricals, so a 50k-row list
+# of a handful of counties keeps one copy of each name. The batch is what the Import page shows
+# (through a model, no per-cell widgets) and what Go! hands to the DB and the scrapers.
+import os
+import csv
+from itertools import islice
+
+import pandas as pd
+
+IMPORT_COLUMNS = ["ParcelID", "County", "State", "PropertyID", "Owner"]
+
+# Rows parsed per step
+IMPORT_CHUNK_SIZE = 20000
+
+IMPORT_FORMATS = (".csv", ".xlsx")
+
+# Low-cardinality columns kept as categoricals
+CATEGORY_COLUMNS = ("County", "State")
+
+
+def empty_batch():
+    """A batch with no rows (the Import page's starting point)."""
+    return _finish(pd.DataFrame({col: pd.Series(dtype=object) for col in IMPORT_COLUMNS}))
+
+
+def _map_columns(frame):
+    """
+    Takes the first five columns of a raw chunk, by position, as IMPORT_COLUMNS (missing ones are
+    blank), with every value as a stripped string and empty cells as "".
+    """
+    frame = frame.iloc[:, :len(IMPORT_COLUMNS)]
+    frame.columns = IMPORT_COLUMNS[:frame.shape[1]]
+    frame = frame.reindex(columns=IMPORT_COLUMNS)
+    for col in IMPORT_COLUMNS:
+        values = frame[col]
+        if not pd.api.types.is_string_dtype(values):
+            # Excel hands back numbers for numeric-looking IDs; 1234.0 should read as "1234"
+            values = values.map(_cell_text, na_action="ignore")
+        frame[col] = values.fillna("").astype(str).str.strip()
+    return frame
+
+
+def _cell_text(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _finish(frame):
+    for col in CATEGORY_COLUMNS:
+        frame[col] = frame[col].astype("category")
+    return frame.reset_index(drop=True)
+
+
+def _records_chunks(rows, chunk_size):
+    """Groups an iterator of row sequences into mapped DataFrames of up to chunk_size rows."""
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        frame = pd.DataFrame.from_records(chunk)
+        # Fully empty rows (blank lines, trailing Excel formatting) are skipped
+        frame = frame[~(frame.isna() | frame.eq("")).all(axis=1)]
+        if len(frame):
+            yield _map_columns(frame)
+
+
+def _csv_chunks(path, chunk_size):
+    # csv.reader tolerates short and ragged rows, like the original row-by-row import did
+    with open(path, "r", encoding="utf-8-sig", newline="") as file:
+        rows = csv.reader(file)
+        next(rows, None)  # header row (columns are mapped by position)
+        yield from _records_chunks(rows, chunk_size)
+
+
+def _xlsx_chunks(path, chunk_size):
+    from openpyxl import load_workbook
+
+    # read_only streams the sheet instead of loading it all
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(min_row=2, max_col=len(IMPORT_COLUMNS), values_only=True)
+        yield from _records_chunks(rows, chunk_size)
+    finally:
+        workbook.close()
+
+
+def read_parcel_chunks(path, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Yields DataFrames of up to chunk_size rows with IMPORT_COLUMNS as stripped strings,
+    from a CSV or XLSX file whose first row is a header. Raises ValueError for other files.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return _csv_chunks(path, chunk_size)
+    if ext == ".xlsx":
+        return _xlsx_chunks(path, chunk_size)
+    raise ValueError(f"Unsupported file extension '{ext}'. Please select a CSV or XLSX file.")
+
+
+def load_parcel_batch(path, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+    """
+    Reads a whole CSV/XLSX file into one batch DataFrame (see read_parcel_chunks).
+    :param progress: optional callback(rows_read), called after every chunk.
+    """
+    chunks = []
+    rows = 0
+    for chunk in read_parcel_chunks(path, chunk_size):
+        chunks.append(chunk)
+        rows += len(chunk)
+        if progress:
+            progress(rows)
+    if not chunks:
+        return empty_batch()
+    return _finish(pd.concat(chunks, ignore_index=True))
+
+
+def records_batch(records):
+    """A batch from dicts with (some of) IMPORT_COLUMNS, e.g. rows posted to the service."""
+    if not records:
+        return empty_batch()
+    frame = pd.DataFrame.from_records(
+        [{col: str(record.get(col) or "").strip() for col in IMPORT_COLUMNS} for record in records],
+        columns=IMPORT_COLUMNS
+    )
+    return _finish(frame)
+
+
+def append_batch(batch, more):
+    """Adds the rows of `more` after `batch` (importing a second file appends to the table)."""
+    if not len(batch):
+        return more
+    combined = pd.concat(
+        [batch.astype({col: object for col in CATEGORY_COLUMNS}),
+         more.astype({col: object for col in CATEGORY_COLUMNS})],
+        ignore_index=True
+    )
+    return _finish(combined)
+
+
+def batch_records(batch):
+    """The batch as the list of dicts insert_initial_parcels and scrape_all_counties expect."""
+    return batch[IMPORT_COLUMNS].astype({col: object for col in CATEGORY_COLUMNS}).to_dict("records")
@@ -0,0 +1,152 @@
+# Persistent Chrome profiles for the scrape drivers, and cache-hit metrics.
+#
+# By default create_driver starts Chrome with a throwaway profile, so every run downloads each
+# county site's scripts, stylesheets and images again (the CPT Angular app most of all) and
+# loses the cookies from its disclaimers. Given a profile directory, the driver keeps its
+# user-data-dir there instead: a disk cache bounded by DISK_CACHE_SIZE, and cookies. Chrome
+# only keeps persistent cookies between runs; session cookies (most disclaimer cookies) are
+# saved to SESSION_COOKIES_FILE in the profile after each batch and when the driver is closed,
+# and put back when the next one starts.
+#
+# Chrome locks its user-data-dir, so each worker (CLI or service thread) gets its own
+# directory under PROFILE_ROOT, named by worker_profile().
+#
+# CacheStats counts, for every page the scrapers load, how many of its resources came from
+# the cache (Resource Timing: transferSize 0 with a body), per site, with the site's first page
+# load in the process kept apart: that is the one a warm profile should mostly serve locally.
+# Cross-origin resources whose server sends no Timing-Allow-Origin report no sizes at all;
+# they are counted as "opaque" and left out of the hit rates.
+import os
+import json
+import threading
+
+PROFILE_ROOT = os.path.join("Resources", "chrome_profiles")
+
+# Upper bound of each profile's HTTP disk cache, in bytes
+DISK_CACHE_SIZE = 256 * 1024 * 1024
+
+SESSION_COOKIES_FILE = "pidpal_session_cookies.json"
+
+# Fields of a Network.getAllCookies cookie that Network.setCookies accepts back
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "priority")
+
+# Resource Timing entries of the current document: [transferSize, encodedBodySize] each
+_RESOURCE_TIMING_JS = """
+    return performance.getEntriesByType('navigation')
+        .concat(performance.getEntriesByType('resource'))
+        .map(function (entry) { return [entry.transferSize, entry.encodedBodySize]; });
+"""
+
+
+def worker_profile(worker, root=None):
+    """The profile directory of worker number (or name) `worker`, under `root` (PROFILE_ROOT)."""
+    return os.path.abspath(os.path.join(root or PROFILE_ROOT, f"worker-{worker}"))
+
+
+def profile_arguments(profile_dir):
+    """Chrome command-line arguments for a persistent profile in `profile_dir`."""
+    os.makedirs(profile_dir, exist_ok=True)
+    return [
+        f"--user-data-dir={profile_dir}",
+        f"--disk-cache-size={DISK_CACHE_SIZE}",
+        "--no-first-run",
+        # No component or safe-browsing downloads filling the cache
+        "--disable-background-networking",
+    ]
+
+
+def restore_session_cookies(driver, profile_dir):
+    """Puts back the session cookies the profile's last driver saved, if any."""
+    path = os.path.join(profile_dir, SESSION_COOKIES_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cookies = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if cookies:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    return len(cookies)
+
+
+def save_session_cookies(driver, profile_dir):
+    """Saves the driver's session cookies into its profile (Chrome drops them on exit)."""
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    session = [
+        {field: cookie[field] for field in _COOKIE_FIELDS if field in cookie}
+        for cookie in cookies if cookie.get("session")
+    ]
+    path = os.path.join(profile_dir, SESSION_COOKIES_FILE)
+    tmp_path = f"{path}.part"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(session, f)
+    os.replace(tmp_path, path)
+    return len(session)
+
+
+class CacheStats:
+    """Resources loaded and served from the browser cache, per site. Thread-safe."""
+
+    def __init__(self):
+        self._sites = {}        # site -> counters (see _counters)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _counters():
+        return {"pages": 0, "resources": 0, "cache_hits": 0, "opaque": 0, "bytes_downloaded": 0,
+                "bytes_cached": 0, "first_load": None}
+
+    def record_page(self, site, entries):
+        """
+        Adds one loaded page's [transferSize, encodedBodySize] entries to the counts for `site`
+        (the first page recorded for a site is also kept as its "first_load").
+        """
+        resources = hits = opaque = downloaded = cached = 0
+        for transfer_size, body_size in entries:
+            if not transfer_size and not body_size:
+                opaque += 1
+                continue
+            resources += 1
+            if transfer_size == 0:
+                hits += 1
+                cached += body_size
+            else:
+                downloaded += transfer_size
+        with self._lock:
+            counters = self._sites.setdefault(site, self._counters())
+            counters["pages"] += 1
+            counters["resources"] += resources
+            counters["cache_hits"] += hits
+            counters["opaque"] += opaque
+            counters["bytes_downloaded"] += downloaded
+            counters["bytes_cached"] += cached
+            if counters["pages"] == 1:
+                counters["first_load"] = {"resources": resources, "cache_hits": hits,
+                                          "hit_rate": round(hits / resources, 3) if resources else None}
+
+    def summary(self):
+        """{site: counters with the overall hit_rate} for logs, the CLI summary and /health."""
+        with self._lock:
+            sites = {site: dict(counters) for site, counters in self._sites.items()}
+        for counters in sites.values():
+            resources = counters["resources"]
+            counters["hit_rate"] = round(counters["cache_hits"] / resources, 3) if resources else None
+        return sites
+
+
+def page_resources(driver):
+    """[transferSize, encodedBodySize] of the current page and each resource it loaded."""
+    entries = driver.execute_script(_RESOURCE_TIMING_JS)
+    return entries if isinstance(entries, list) else []
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def cache_stats():
+    """The process-wide CacheStats."""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = CacheStats()
+        return _stats
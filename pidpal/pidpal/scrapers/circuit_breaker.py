@@ -0,0 +1,110 @@
+# Per-host circuit breakers for the county scrapers.
+#
+# When a county site is down, every parcel would otherwise wait out its WebDriverWait timeouts
+# and save an error screenshot, one by one. Each site host gets one breaker, shared by every
+# scraper and driver in the process (CLI workers, service workers, repeated Go! clicks):
+#   closed     parcels are scraped normally; FAILURE_THRESHOLD consecutive failures trip it
+#   open       parcels for the host are deferred at once, without touching the browser
+#   half-open  after RESET_TIMEOUT seconds one parcel is let through as a probe: success
+#              closes the breaker, failure opens it again for another RESET_TIMEOUT
+import time
+import threading
+from urllib.parse import urlparse
+
+# Consecutive failed parcels that trip a host's breaker
+FAILURE_THRESHOLD = 5
+
+# Seconds an open breaker waits before letting a probe parcel through
+RESET_TIMEOUT = 120
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Failure counter and state for one site host. Thread-safe."""
+
+    def __init__(self, host, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0               # consecutive failures
+        self.opened_at = None
+        self._probing = False           # a half-open probe is in flight
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        True if a parcel may be scraped now. While open, returns True once per RESET_TIMEOUT
+        (the half-open probe) and False otherwise.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"CircuitBreaker: {self.host} is answering again, closing the breaker")
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"CircuitBreaker: {self.host} failed {self.failures} times in a row, "
+                          f"deferring its parcels for {self.reset_timeout}s")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def record_neutral(self):
+        """A parcel that failed for a reason unrelated to the site: neither counts, ends a probe."""
+        with self._lock:
+            self._probing = False
+
+    def status(self):
+        with self._lock:
+            return {"host": self.host, "state": self.state, "failures": self.failures}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def site_host(url):
+    """The host a breaker is kept for, from a site URL (or a bare host name)."""
+    return (urlparse(url).hostname or url).lower()
+
+
+def breaker_for(url):
+    """The process-wide CircuitBreaker for the host of `url`, created on first use."""
+    host = site_host(url)
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def breaker_status():
+    """State of every breaker created so far (for logs and the service's /health)."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.status() for breaker in breakers]
+
+
+def reset_breakers():
+    """Forgets every breaker (e.g. before a deliberate retry of deferred parcels)."""
+    with _breakers_lock:
+        _breakers.clear()
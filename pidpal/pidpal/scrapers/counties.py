@@ -1,11 +1,73 @@
 import time
 import os
+from collections import deque
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 
 from pidpal.func import take_screenshot, DataObject
+from pidpal.scrapers.circuit_breaker import HALF_OPEN, breaker_for, site_host
+from pidpal.scrapers.timeouts import latency_model
+from pidpal.scrapers.browser_profile import cache_stats, page_resources
+from pidpal.scrapers.network_capture import NetworkCapture, find_record
+from pidpal.scrapers.failures import ParcelNotFound, classify_failure
+
+# Failure classes that count against a site's circuit breaker (the others mean it answered).
+# A timeout only counts while the site is being opened or a whole page is loading (the site's
+# pages aren't arriving): a timed-out element wait is usually one slow moment, and one on the
+# search results is a parcel the search has no match for (ParcelNotFound).
+BREAKER_CLASSES = ("site_down",)
+
+# Failure classes that say nothing about the site either way (our browser failed)
+NEUTRAL_CLASSES = ("browser",)
+
+# Wait steps whose timeout means the page itself didn't load
+PAGE_STEPS = ("page_load",)
+
+# BaseCountyScraper.navigate: flag the old document, then load the URL without waiting
+_NAVIGATE_JS = """
+    var url = new URL(arguments[0], location.href).href;
+    var samePage = location.href.split('#')[0] === url.split('#')[0];
+    window.pidpalLeaving = true;
+    location.href = url;
+    if (samePage) { location.reload(); }
+"""
+
+
+class TimedWait:
+    """
+    A WebDriverWait for one named step of a scraper, with its timeout from the latency model
+    (see timeouts.py). until() records how long the condition took to become true, or a miss.
+    A not_found wait (the one on a parcel's search results) raises ParcelNotFound when it
+    times out.
+    """
+
+    def __init__(self, driver, site, step, default, optional, not_found=False):
+        self.driver = driver
+        self.site = site
+        self.step = step
+        self.default = default
+        self.optional = optional
+        self.not_found = not_found
+
+    def until(self, condition):
+        model = latency_model()
+        timeout = model.timeout(self.site, self.step, self.default)
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout).until(condition)
+        except TimeoutException as e:
+            # An optional element (a disclaimer that is not always shown) being absent says
+            # nothing about the site; a required one is a miss (see timeouts.py)
+            if not self.optional:
+                model.record_miss(self.site, self.step)
+            if self.not_found:
+                raise ParcelNotFound(f"No search results ({self.step} not shown within {timeout:.0f}s)") from e
+            raise
+        model.record(self.site, self.step, time.monotonic() - start)
+        return result
 
 
 class BaseCountyScraper:
@@ -14,9 +76,22 @@ class BaseCountyScraper:
     Defines a template method pattern for scraping parcels.
     """
 
+    # Name used in log lines
+    name = "County"
+
+    # Tabs per driver for the pipelined loop (1 = one parcel at a time)
+    tabs = 1
+
     def __init__(self, driver, screenshot_dir):
         self.driver = driver
         self.screenshot_dir = screenshot_dir
+        # Parcel IDs skipped because the site's circuit breaker was open (to retry later)
+        self.deferred = []
+        # (parcel ID, failure class, step, message) of every parcel that failed
+        self.failures = []
+        # Name of the last wait started for the current parcel, recorded with a failure
+        self.step = None
+        self._site_open = False
 
     def scrape_county(self, parcel_ids):
         """
@@ -25,10 +100,15 @@ class BaseCountyScraper:
         2) Handle disclaimers
         3) Scrape all parcels
         4) Return the resulting data (list of DataObject)
+        Steps 1) and 2) run inside scrape_parcels, before the first parcel the site's
+        circuit breaker lets through.
         """
+        return self.scrape_parcels(parcel_ids)
+
+    def open_site(self):
+        """Steps 1) and 2): main page and disclaimers, done again after a failed parcel."""
         self.go_to_main_page()
         self.handle_disclaimers()
-        return self.scrape_parcels(parcel_ids)
 
     def go_to_main_page(self):
         """
@@ -46,13 +126,220 @@ class BaseCountyScraper:
 
     def scrape_parcels(self, parcel_ids):
         """
-        (Abstract) The main loop for each parcel:
-            - potentially call search_for_parcel(...)
-            - parse and collect data
-            - screenshots, if needed
-            - return a list of DataObject
+        The main loop: scrape_parcel(...) for each parcel, collecting the DataObjects (or the
+        pipelined loop below, with tabs > 1 on a scraper that supports it).
+        A failed parcel is classified (failures.py), logged with an error screenshot and added
+        to self.failures. Network errors, and timeouts while opening the site or loading a page,
+        count against the site's circuit breaker;
+        while the breaker is open, the remaining parcels are deferred (added to self.deferred)
+        instead of each waiting out its timeouts.
+        """
+        breaker = breaker_for(self.base_url)
+
+        if self.tabs > 1 and self.can_pipeline():
+            all_data = self._scrape_pipelined(parcel_ids, breaker)
+        else:
+            all_data = []
+            for parcel_id in parcel_ids:
+                if not breaker.allow():
+                    self.deferred.append(parcel_id)
+                    continue
+                self.step = None
+                ok, results = self._attempt(parcel_id, breaker, self._open_site_and(self.scrape_parcel))
+                if ok:
+                    all_data.extend(results)
+
+        if self.deferred:
+            print(f"{self.name}: {breaker.host} is down, deferred {len(self.deferred)} parcels")
+        latency_model().save()
+        return all_data
+
+    def _open_site_and(self, action):
+        """`action`, preceded by open_site() if the site is not open (first parcel, after a failure)."""
+        def run(parcel_id):
+            if not self._site_open:
+                self.open_site()
+                self._site_open = True
+                self.record_cache()
+            return action(parcel_id)
+        return run
+
+    def _attempt(self, parcel_id, breaker, action, finished=True):
+        """
+        Runs action(parcel_id) and returns (True, its result), or handles the failure and returns
+        (False, None). A success counts for the breaker only if it `finished` the parcel.
+        """
+        opening = not self._site_open
+        try:
+            result = action(parcel_id)
+        except Exception as e:
+            failure_class = classify_failure(e)
+            self.failures.append((parcel_id, failure_class, self.step, str(e).strip()[:500]))
+            # A timeout counts if open_site failed (the site is still not open) or a page didn't load
+            site_failed = failure_class == "timeout" and (
+                (opening and not self._site_open) or self.step in PAGE_STEPS
+            )
+            if failure_class in BREAKER_CLASSES or site_failed:
+                breaker.record_failure()
+            elif failure_class in NEUTRAL_CLASSES:
+                breaker.record_neutral()
+            else:
+                # The site answered (just not with what we wanted)
+                breaker.record_success()
+            # The page is in an unknown state: start over from the main page
+            self._site_open = False
+            self.handle_error(parcel_id, e, failure_class)
+            return False, None
+        if finished:
+            breaker.record_success()
+        return True, result
+
+    def scrape_parcel(self, parcel_id):
+        """
+        (Abstract) Search for one parcel, parse its values and take the screenshot.
+        Returns a list of DataObject (some sites list several properties per parcel);
+        raises if the parcel could not be scraped.
+        Scrapers that support pipelining implement start_parcel and finish_parcel instead.
+        """
+        self.start_parcel(parcel_id)
+        return self.finish_parcel(parcel_id)
+
+    # -- pipelining ---------------------------------------------------------
+    #
+    # Most of a parcel's time is spent waiting on the county site. With tabs = K, the driver
+    # keeps K tabs: the first page of parcel i+1 (up to i+K-1), the site's search page, is
+    # started in another tab, and loads there, while parcel i is finished in its own. Only that
+    # page load overlaps: finishing a parcel (searching it, waiting for its results, extracting
+    # and screenshotting) still runs one parcel after another, as the driver drives one tab at
+    # a time. Only scrapers whose every parcel starts from a fresh navigation can do this (a
+    # scraper working through one search page, like Pierce or Lake, can't); they implement the
+    # two halves below.
+
+    def start_parcel(self, parcel_id):
+        """
+        (Hook) First half of a parcel in the current tab: kick off the page loads (see
+        navigate) and return without waiting for them.
+        """
+        raise NotImplementedError("Subclasses must implement scrape_parcel() or start_parcel()")
+
+    def finish_parcel(self, parcel_id):
+        """(Hook) Second half: wait for the started page, extract the values and take the screenshot."""
+        raise NotImplementedError("Subclasses must implement scrape_parcel() or finish_parcel()")
+
+    def can_pipeline(self):
+        return type(self).start_parcel is not BaseCountyScraper.start_parcel
+
+    def navigate(self, url):
+        """
+        Starts loading `url` in the current tab without waiting for it (unlike driver.get);
+        finish_parcel calls wait_for_page() before touching the page. The old document is
+        flagged so it is never mistaken for the new one, and a URL that differs from the
+        current one only by its #fragment is reloaded (so single-page apps start fresh).
+        """
+        self.driver.execute_script(_NAVIGATE_JS, url)
+
+    def wait_for_page(self, default=20):
+        """Waits until the page started by navigate() has loaded."""
+        self.wait("page_load", default).until(
+            lambda driver: driver.execute_script(
+                "return !window.pidpalLeaving && document.readyState === 'complete';"
+            )
+        )
+        self.record_cache()
+
+    def record_cache(self):
+        """
+        Counts the current page's resources, and those served from cache, in cache_stats()
+        (unless the page is not on this county's site, e.g. a go_to_main_page that loads nothing).
         """
-        raise NotImplementedError("Subclasses must implement scrape_parcels()")
+        try:
+            if site_host(self.driver.current_url) != site_host(self.base_url):
+                return
+            entries = page_resources(self.driver)
+        except Exception:
+            # Metrics only: never fail a parcel over them
+            return
+        if entries:
+            cache_stats().record_page(self.base_url, entries)
+
+    def _scrape_pipelined(self, parcel_ids, breaker):
+        all_data = []
+        home = self.driver.current_window_handle
+        tabs = [home]
+        in_flight = deque()     # (tab, parcel ID, step reached), oldest first
+        idle = []               # tabs waiting on the outcome of a half-open probe
+        pending = deque(parcel_ids)
+
+        def start_next(tab):
+            # Starts the next parcel the breaker lets through in `tab`, if any are left
+            self.driver.switch_to.window(tab)
+            while pending:
+                if not breaker.allow():
+                    if breaker.state == HALF_OPEN and in_flight:
+                        # The probe is still loading in another tab: wait for its outcome
+                        # before deferring the rest
+                        idle.append(tab)
+                        return
+                    self.deferred.append(pending.popleft())
+                    continue
+                parcel_id = pending.popleft()
+                self.step = None
+                ok, _ = self._attempt(parcel_id, breaker, self._open_site_and(self.start_parcel), finished=False)
+                if ok:
+                    in_flight.append((tab, parcel_id, self.step))
+                    return
+
+        try:
+            for _ in range(self.tabs - 1):
+                self.driver.switch_to.new_window("tab")
+                tabs.append(self.driver.current_window_handle)
+            for tab in tabs:
+                start_next(tab)
+
+            while in_flight:
+                tab, parcel_id, self.step = in_flight.popleft()
+                self.driver.switch_to.window(tab)
+                ok, results = self._attempt(parcel_id, breaker, self.finish_parcel)
+                if ok:
+                    all_data.extend(results)
+                start_next(tab)
+                while idle and (not in_flight or breaker.state != HALF_OPEN):
+                    start_next(idle.pop())
+        finally:
+            # Leave the driver as it was (one tab) for the next county or batch
+            for tab in tabs[1:]:
+                try:
+                    self.driver.switch_to.window(tab)
+                    self.driver.close()
+                except Exception:
+                    pass
+            try:
+                self.driver.switch_to.window(home)
+            except Exception:
+                pass
+
+        return all_data
+
+    def wait(self, step, default=10, optional=False, not_found=False):
+        """
+        A wait for `step` on this county's site: `default` seconds until the step has enough
+        recorded waits, then a timeout adapted to them. optional=True for elements that may
+        legitimately never appear (their timeouts are not recorded). not_found=True for the
+        wait on what a parcel search shows for a match: the site answered the search (its page
+        loaded), so if the match doesn't come the site has no such parcel, and the timeout is
+        raised as ParcelNotFound instead (not retried).
+        """
+        self.step = step
+        return TimedWait(self.driver, self.base_url, step, default, optional, not_found)
+
+    def handle_error(self, parcel_id, error, failure_class):
+        print(f"{self.name}: Error processing parcel ID {parcel_id} ({failure_class} at {self.step}): {error}")
+        error_shot = os.path.join(self.screenshot_dir, f"error_{parcel_id}.png")
+        try:
+            self.driver.save_screenshot(error_shot)
+        except Exception:
+            # The browser itself is gone; nothing to capture
+            pass
 
 
 # ----------------------------------------------------------------------------
@@ -63,6 +350,8 @@ class PierceWIScraper(BaseCountyScraper):
     Scraper for Pierce County, WI.
     """
 
+    name = "PierceWI"
+
     def __init__(self, driver, screenshot_dir):
         super().__init__(driver, screenshot_dir)
         self.base_url = 'https://internal.co.pierce.wi.us/gcswebportal/'
@@ -74,105 +363,79 @@ class PierceWIScraper(BaseCountyScraper):
         self.driver.get(self.base_url)
         self.driver.implicitly_wait(10)
 
-        # Accept disclaimers
+        # Accept disclaimers (already accepted if a persistent profile kept the session cookie)
         disclaimer_button_xpath = '//*[@id="ctl00_cphMainApp_btnEntryPageAccept"]'
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, disclaimer_button_xpath))
-        ).click()
-
-
-    def scrape_county(self, parcel_ids):
+        try:
+            self.wait("disclaimer", optional=True).until(
+                EC.element_to_be_clickable((By.XPATH, disclaimer_button_xpath))
+            ).click()
+        except TimeoutException:
+            pass
+
+    def scrape_parcel(self, parcel_id):
         """
-        The 'template method' that orchestrates the entire scraping flow:
-        1) Go to the county's main page, accept disclaimers ONCE
-        2) Then scrape all parcels in a loop
+        Scrape one parcel, reusing the session without re-invoking disclaimers each time.
         """
-        # 1) Go to main page, accept disclaimers once
-        self.go_to_main_page()
+        print("\nDEBUG: Processing parcel:", parcel_id)
 
-        # 2) Now do the per-parcel logic in scrape_parcels
-        return self.scrape_parcels(parcel_ids)
+        # 1) Search for the parcel
+        search_box_xpath = '//*[@id="mtxtParcelNumber"]'
+        search_box = self.wait("search_box").until(
+            EC.presence_of_element_located((By.XPATH, search_box_xpath))
+        )
 
-    def scrape_parcels(self, parcel_ids):
-        """
-        Scrape parcel data for all parcels, reusing the session
-        without re-invoking disclaimers each time.
-        """
-        all_data = []
+        # Clear + set value by JS to handle any masked input
+        self.driver.execute_script(
+            "arguments[0].value = arguments[1];", search_box, parcel_id
+        )
+        time.sleep(1)
 
-        for parcel_id in parcel_ids:
-            parcel_data = None
-            try:
-                print("\nDEBUG: Processing parcel:", parcel_id)
+        # Some sites require a button click instead of ENTER, but let's try ENTER first
+        search_box.send_keys(Keys.ENTER)
 
-                # 1) Search for the parcel
-                search_box_xpath = '//*[@id="mtxtParcelNumber"]'
-                search_box = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, search_box_xpath))
-                )
 
-                # Clear + set value by JS to handle any masked input
-                self.driver.execute_script(
-                    "arguments[0].value = arguments[1];", search_box, parcel_id
-                )
-                time.sleep(1)
-
-                # Some sites require a button click instead of ENTER, but let's try ENTER first
-                search_box.send_keys(Keys.ENTER)
-    
-
-                # 2) Navigate to the assessment page
-                assessment_page_link_xpath = '//*[@id="LinkButtonAssessments"]'
-                WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, assessment_page_link_xpath))
-                ).click()
-
-                # 3) Check if current year is assessed, if not, select previous year
-                not_assessed_xpath = '//*[@id="LabelViewValuationsNotAllowed"]'
-                year_dropdown_xpath = '//*[@id="ddlTaxYear"]'
-
-                if self.driver.find_elements(By.XPATH, not_assessed_xpath):
-                    year_dropdown = Select(
-                        self.driver.find_element(By.XPATH, year_dropdown_xpath)
-                    )
-                    year_dropdown.select_by_index(1)
-
-                # 4) Extract values
-                land_value_xpath = '//*[@id="lblLand"]'
-                building_value_xpath  = '//*[@id="lblImprovements"]'
-                total_value_xpath = '//*[@id="lblTotal"]'
-                assyear_value_xpath = '//*[@id="LabelCurrentYearValuationsRE"]'
-
-                assyear = self.driver.find_element(By.XPATH, assyear_value_xpath).text
-                assyear_value = assyear.split()[0]
-                land_value = self.driver.find_element(By.XPATH, land_value_xpath).text
-                building_value = self.driver.find_element(By.XPATH, building_value_xpath).text
-                total_value = self.driver.find_element(By.XPATH, total_value_xpath).text
-
-                # 4.5) Take screenshot
-                screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
+        # 2) Navigate to the assessment page (only shown once the search found the parcel)
+        assessment_page_link_xpath = '//*[@id="LinkButtonAssessments"]'
+        self.wait("assessment_link", not_found=True).until(
+            EC.element_to_be_clickable((By.XPATH, assessment_page_link_xpath))
+        ).click()
 
-                # 5) Create DataObject
-                parcel_data = DataObject(
-                    ParcelID=parcel_id,
-                    LandValue=land_value,
-                    BuildingValue=building_value,
-                    TotalValue=total_value,
-                    AssessmentYear=assyear_value,  # Extract if available
-                    ScreenshotPath=screenshot_path
-                )
+        # 3) Check if current year is assessed, if not, select previous year
+        not_assessed_xpath = '//*[@id="LabelViewValuationsNotAllowed"]'
+        year_dropdown_xpath = '//*[@id="ddlTaxYear"]'
 
-                
+        if self.driver.find_elements(By.XPATH, not_assessed_xpath):
+            year_dropdown = Select(
+                self.driver.find_element(By.XPATH, year_dropdown_xpath)
+            )
+            year_dropdown.select_by_index(1)
 
-                all_data.append(parcel_data)
+        # 4) Extract values
+        land_value_xpath = '//*[@id="lblLand"]'
+        building_value_xpath  = '//*[@id="lblImprovements"]'
+        total_value_xpath = '//*[@id="lblTotal"]'
+        assyear_value_xpath = '//*[@id="LabelCurrentYearValuationsRE"]'
 
-            except Exception as e:
-                print(f"PierceWI: Error processing parcel ID {parcel_id}: {e}")
-                # Optionally do an error screenshot
-                error_shot = os.path.join(self.screenshot_dir, f"error_{parcel_id}.png")
-                self.driver.save_screenshot(error_shot)
+        assyear = self.driver.find_element(By.XPATH, assyear_value_xpath).text
+        assyear_value = assyear.split()[0]
+        land_value = self.driver.find_element(By.XPATH, land_value_xpath).text
+        building_value = self.driver.find_element(By.XPATH, building_value_xpath).text
+        total_value = self.driver.find_element(By.XPATH, total_value_xpath).text
 
-        return all_data
+        # 4.5) Take screenshot
+        screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
+
+        # 5) Create DataObject
+        parcel_data = DataObject(
+            ParcelID=parcel_id,
+            LandValue=land_value,
+            BuildingValue=building_value,
+            TotalValue=total_value,
+            AssessmentYear=assyear_value,  # Extract if available
+            ScreenshotPath=screenshot_path
+        )
+
+        return [parcel_data]
 
 
 # ----------------------------------------------------------------------------
@@ -183,73 +446,70 @@ class HennepinMNScraper(BaseCountyScraper):
     Scraper for Hennepin County, MN.
     """
 
+    name = "HennepinMN"
+    base_url = 'https://www16.co.hennepin.mn.us/pins/?articleId=by_pid#by_pid'
+
     def go_to_main_page(self):
         """
-        In Hennepin's case, we directly navigate in scrape_parcels below,
+        In Hennepin's case, we directly navigate in scrape_parcel below,
         so you can leave this blank or implement the main landing page.
         """
         pass
 
-    def scrape_parcels(self, parcel_ids):
+    def start_parcel(self, parcel_id):
+        # 1) Go to the Hennepin site
+        self.navigate(self.base_url)
+
+    def finish_parcel(self, parcel_id):
         """
         Implementation of the Hennepin County logic from your original 'HennepinMN' method.
         """
-        all_data = []
-        for parcel_id in parcel_ids:
-            try:
-                # 1) Go to the Hennepin site
-                self.driver.get('https://www16.co.hennepin.mn.us/pins/?articleId=by_pid#by_pid')
-
-                # 2) Wait for input to be clickable, then type parcel ID
-                WebDriverWait(self.driver, 20).until(
-                    EC.element_to_be_clickable((By.ID, "pid"))
-                ).click()
-                pid_text = self.driver.find_element(By.ID, "pid")
-                pid_text.send_keys(parcel_id, Keys.ENTER)
-
-                # 3) Gather fields
-                land_val = self.driver.find_element(
-                    By.XPATH, "/html/body/div[3]/section/div/div[2]/article[4]/div[2]/div[3]/div[2]"
-                ).text
-                bldg_val = self.driver.find_element(
-                    By.XPATH, "/html/body/div[3]/section/div/div[2]/article[4]/div[2]/div[4]/div[2]"
-                ).text
-                total_val = self.driver.find_element(
-                    By.XPATH, "/html/body/div[3]/section/div/div[2]/article[4]/div[2]/div[6]/div[2]"
-                ).text
-
-                # 4) Assessment year
-                select_element = self.driver.find_element(By.ID, 'year')
-                select = Select(select_element)
-                assessment_year = select.first_selected_option.text
-
-                # 5) Create DataObject
-                parcel_data = DataObject(
-                    ParcelID=parcel_id,
-                    LandValue=land_val,
-                    BuildingValue=bldg_val,
-                    TotalValue=total_val,
-                    AssessmentYear=assessment_year,
-                    ScreenshotPath=""
-                )
+        self.wait_for_page()
 
-                # 6) Take screenshot
-                screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
-                parcel_data.ScreenshotPath = screenshot_path
-
-                print(
-                    f"HennepinMN -> {parcel_id}: Land={land_val}, Building={bldg_val}, "
-                    f"Total={total_val}, Year={assessment_year}"
-                )
-                all_data.append(parcel_data)
-
-            except Exception as e:
-                print(f"HennepinMN: Error processing parcel ID {parcel_id}: {e}")
-                # Optionally do an error screenshot
-                error_shot = os.path.join(self.screenshot_dir, f"error_{parcel_id}.png")
-                self.driver.save_screenshot(error_shot)
-
-        return all_data
+        # 2) Wait for input to be clickable, then type parcel ID
+        self.wait("search_box", 20).until(
+            EC.element_to_be_clickable((By.ID, "pid"))
+        ).click()
+        pid_text = self.driver.find_element(By.ID, "pid")
+        pid_text.send_keys(parcel_id, Keys.ENTER)
+
+        # 3) Gather fields, once the parcel's values are shown
+        land_val = self.wait("search_results", 20, not_found=True).until(
+            EC.presence_of_element_located(
+                (By.XPATH, "/html/body/div[3]/section/div/div[2]/article[4]/div[2]/div[3]/div[2]")
+            )
+        ).text
+        bldg_val = self.driver.find_element(
+            By.XPATH, "/html/body/div[3]/section/div/div[2]/article[4]/div[2]/div[4]/div[2]"
+        ).text
+        total_val = self.driver.find_element(
+            By.XPATH, "/html/body/div[3]/section/div/div[2]/article[4]/div[2]/div[6]/div[2]"
+        ).text
+
+        # 4) Assessment year
+        select_element = self.driver.find_element(By.ID, 'year')
+        select = Select(select_element)
+        assessment_year = select.first_selected_option.text
+
+        # 5) Create DataObject
+        parcel_data = DataObject(
+            ParcelID=parcel_id,
+            LandValue=land_val,
+            BuildingValue=bldg_val,
+            TotalValue=total_val,
+            AssessmentYear=assessment_year,
+            ScreenshotPath=""
+        )
+
+        # 6) Take screenshot
+        screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
+        parcel_data.ScreenshotPath = screenshot_path
+
+        print(
+            f"HennepinMN -> {parcel_id}: Land={land_val}, Building={bldg_val}, "
+            f"Total={total_val}, Year={assessment_year}"
+        )
+        return [parcel_data]
 
 
 # ----------------------------------------------------------------------------
@@ -260,6 +520,9 @@ class LakeMNScraper(BaseCountyScraper):
     Scraper for Lake County, MN, based on your 'scrape_lake_mn' method.
     """
 
+    name = "LakeMN"
+    base_url = 'https://parcelinfo.com/'
+
     def __init__(self, driver, screenshot_dir):
         super().__init__(driver, screenshot_dir)
         # Hardcoded or optional config:
@@ -277,100 +540,92 @@ class LakeMNScraper(BaseCountyScraper):
         self.driver.implicitly_wait(10)
 
         # "Lake County Users Click Here" link
-        WebDriverWait(self.driver, 10).until(
+        self.wait("county_link").until(
             EC.element_to_be_clickable((By.XPATH, self.lake_county_link))
         ).click()
 
         # Now to the parcel search page
-        WebDriverWait(self.driver, 10).until(
+        self.wait("parcel_info_link").until(
             EC.element_to_be_clickable((By.XPATH, self.parcel_info_link))
         ).click()
 
-    def scrape_parcels(self, parcel_ids):
+    def scrape_parcel(self, parcel_id):
         """
-        Reuse self.driver, do not quit. Each parcel is processed in a loop.
+        Reuse self.driver, do not quit. We are already on the search page after go_to_main_page
+        (or after the previous parcel returned to it).
         """
         all_data = []
 
-        for parcel_id in parcel_ids:
-            try:
-                # 1) We are already on the search page after go_to_main_page,
-                #    but if you need to "reset" each time, you could call go_to_main_page() again.
-                #    For now, let's assume we stay on the search page.
-
-                # same logic as your existing code
-                search_box_xpath = "//form[@action='parcelresults1.php']//input[@name='searchvalue' and @type='text']"
-                search_button_xpath = "//form[@action='parcelresults1.php']//button[@type='submit']"
-                result_table_xpath = "//table[@summary='search results']/tbody/tr[@class='results']"
-                additional_info_link = "/html/body/div[3]/table/tbody/tr[4]/td[1]/a"
-                return_to_searchpage_path = "/html/body/div[1]/table[2]/tbody/tr/td[1]/a"
-
-                # 2) Search
-                search_box = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, search_box_xpath))
-                )
-                search_box.clear()
-                search_box.send_keys(parcel_id)
-
-                # hidden value for search type
-                search_field = self.driver.find_element(By.XPATH, "//input[@name='searchfield' and @type='hidden']")
-                self.driver.execute_script(
-                    "arguments[0].setAttribute('value','parcelnumber')", search_field
-                )
+        # same logic as your existing code
+        search_box_xpath = "//form[@action='parcelresults1.php']//input[@name='searchvalue' and @type='text']"
+        search_button_xpath = "//form[@action='parcelresults1.php']//button[@type='submit']"
+        result_table_xpath = "//table[@summary='search results']/tbody/tr[@class='results']"
+        additional_info_link = "/html/body/div[3]/table/tbody/tr[4]/td[1]/a"
+        return_to_searchpage_path = "/html/body/div[1]/table[2]/tbody/tr/td[1]/a"
+
+        # 2) Search
+        search_box = self.wait("search_box").until(
+            EC.presence_of_element_located((By.XPATH, search_box_xpath))
+        )
+        search_box.clear()
+        search_box.send_keys(parcel_id)
+
+        # hidden value for search type
+        search_field = self.driver.find_element(By.XPATH, "//input[@name='searchfield' and @type='hidden']")
+        self.driver.execute_script(
+            "arguments[0].setAttribute('value','parcelnumber')", search_field
+        )
+
+        # Click search
+        self.wait("search_button").until(
+            EC.element_to_be_clickable((By.XPATH, search_button_xpath))
+        ).click()
 
-                # Click search
-                WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, search_button_xpath))
-                ).click()
-
-                WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-
-                # 3) Extract table rows
-                rows = self.driver.find_elements(By.XPATH, result_table_xpath)
-
-                for row in rows:
-                    cols = row.find_elements(By.TAG_NAME, "td")
-                    # Build a DataObject
-                    parcel_data = DataObject(
-                        ParcelID=parcel_id,
-                        LandValue=cols[7].text,
-                        BuildingValue=cols[8].text,
-                        TotalValue=cols[9].text,
-                    )
-
-                    # Additional info link -> assessment year
-                    WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, additional_info_link))
-                    ).click()
-
-                    # Scrape assessment year
-                    assessed_year_element = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.XPATH, "/html/body/div[2]/h2"))
-                    )
-                    assessed_text = assessed_year_element.text.strip()
-                    assessed_year = assessed_text.split(" ")[0]  # e.g. "2023 Assessment..."
-                    parcel_data.AssessmentYear = assessed_year
-
-                    # Screenshot
-                    screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
-                    parcel_data.ScreenshotPath = screenshot_path
-
-                    print(
-                        f"LakeMN -> {parcel_id}: Land={parcel_data.LandValue}, "
-                        f"Bldg={parcel_data.BuildingValue}, Total={parcel_data.TotalValue}, "
-                        f"Year={assessed_year}"
-                    )
-                    all_data.append(parcel_data)
-
-                    # Return to search page
-                    WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, return_to_searchpage_path))
-                    ).click()
-
-            except Exception as e:
-                print(f"LakeMN: Error processing parcel ID {parcel_id}: {e}")
-                error_shot = os.path.join(self.screenshot_dir, f"error_{parcel_id}.png")
-                self.driver.save_screenshot(error_shot)
+        self.wait("results_page").until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+        # 3) Extract table rows
+        rows = self.driver.find_elements(By.XPATH, result_table_xpath)
+        if not rows:
+            raise ParcelNotFound(f"No search results for {parcel_id}")
+
+        for row in rows:
+            cols = row.find_elements(By.TAG_NAME, "td")
+            # Build a DataObject
+            parcel_data = DataObject(
+                ParcelID=parcel_id,
+                LandValue=cols[7].text,
+                BuildingValue=cols[8].text,
+                TotalValue=cols[9].text,
+            )
+
+            # Additional info link -> assessment year
+            self.wait("info_link").until(
+                EC.element_to_be_clickable((By.XPATH, additional_info_link))
+            ).click()
+
+            # Scrape assessment year
+            assessed_year_element = self.wait("assessment_year").until(
+                EC.presence_of_element_located((By.XPATH, "/html/body/div[2]/h2"))
+            )
+            assessed_text = assessed_year_element.text.strip()
+            assessed_year = assessed_text.split(" ")[0]  # e.g. "2023 Assessment..."
+            parcel_data.AssessmentYear = assessed_year
+
+            # Screenshot
+            screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
+            parcel_data.ScreenshotPath = screenshot_path
+
+            print(
+                f"LakeMN -> {parcel_id}: Land={parcel_data.LandValue}, "
+                f"Bldg={parcel_data.BuildingValue}, Total={parcel_data.TotalValue}, "
+                f"Year={assessed_year}"
+            )
+            all_data.append(parcel_data)
+
+            # Return to search page
+            self.wait("back_to_search").until(
+                EC.element_to_be_clickable((By.XPATH, return_to_searchpage_path))
+            ).click()
 
         return all_data
 
@@ -384,6 +639,8 @@ class PatriotScraper(BaseCountyScraper):
     instantiating this scraper with its unique 'base_url' if needed.
     """
 
+    name = "Patriot"
+
     def __init__(self, driver, screenshot_dir, base_url):
         super().__init__(driver, screenshot_dir)
         self.base_url = base_url
@@ -392,101 +649,93 @@ class PatriotScraper(BaseCountyScraper):
         # If the Patriot site is always the same, or if each county has a different URL:
         self.driver.get(self.base_url)
 
-    def scrape_parcels(self, parcel_ids):
+    def start_parcel(self, parcel_id):
+        # 1) Go to the base URL
+        self.navigate(self.base_url)
+
+    def finish_parcel(self, parcel_id):
         """
         Re-implements your 'scrape_patriot_properties' logic.
         """
-        all_data = []
-        for parcel_id in parcel_ids:
-            try:
-                # 1) Go to the base URL
-                self.go_to_main_page()
-
-                parcel_data = DataObject(ParcelID=parcel_id)
-
-                # 2) Switch frames, search for parcel
-                WebDriverWait(self.driver, 10).until(
-                    EC.frame_to_be_available_and_switch_to_it((By.NAME, 'middle'))
-                )
-                search_box = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.NAME, 'SearchParcel'))
-                )
-                search_box.clear()
-                search_box.send_keys(parcel_id)
-                search_box.send_keys(Keys.RETURN)
-
-                # 3) Switch to bottom frame
-                self.driver.switch_to.default_content()
-                WebDriverWait(self.driver, 10).until(
-                    EC.frame_to_be_available_and_switch_to_it((By.NAME, 'bottom'))
-                )
-
-                # 4) Parcel detail link
-                parcel_link = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, 'Summary.asp?AccountNumber')]"))
-                )
-                parcel_link.click()
-
-                # 5) Switch again
-                self.driver.switch_to.default_content()
-                WebDriverWait(self.driver, 10).until(
-                    EC.frame_to_be_available_and_switch_to_it((By.NAME, 'bottom'))
-                )
-
-                # 6) Extract fields
-                try:
-                    land = self.driver.find_element(
-                        By.XPATH, "//td[normalize-space()='Land Value']/following-sibling::td/font"
-                    ).text
-                    parcel_data.LandValue = land
-                except:
-                    parcel_data.LandValue = ""
-
-                try:
-                    bldg = self.driver.find_element(
-                        By.XPATH, "//td[normalize-space()='Building Value']/following-sibling::td/font"
-                    ).text
-                    parcel_data.BuildingValue = bldg
-                except:
-                    parcel_data.BuildingValue = ""
-
-                try:
-                    total = self.driver.find_element(
-                        By.XPATH, "//td[normalize-space()='Total Value']/following-sibling::td/font/b"
-                    ).text
-                    parcel_data.TotalValue = total
-                except:
-                    parcel_data.TotalValue = ""
-
-                try:
-                    assessed_year = self.driver.find_element(
-                        By.XPATH, "//td[normalize-space()='Year']/following-sibling::td/font/b"
-                    ).text
-                    parcel_data.AssessmentYear = assessed_year
-                except:
-                    parcel_data.AssessmentYear = ""
-
-                # 7) Screenshot
-                screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
-                parcel_data.ScreenshotPath = screenshot_path
-
-                print(f"Patriot -> {parcel_id}: {parcel_data.LandValue}, {parcel_data.BuildingValue}, {parcel_data.TotalValue}")
-                all_data.append(parcel_data)
-
-                # short pause
-                time.sleep(2)
-
-                # Switch back if needed:
-                self.driver.switch_to.default_content()
-
-            except Exception as e:
-                print(f"Patriot error with {parcel_id}: {e}")
-                error_shot = os.path.join(self.screenshot_dir, f"error_{parcel_id}.png")
-                self.driver.save_screenshot(error_shot)
-
-                # Optionally continue or break depending on your preference.
-
-        return all_data
+        self.wait_for_page()
+
+        parcel_data = DataObject(ParcelID=parcel_id)
+
+        # 2) Switch frames, search for parcel
+        self.wait("search_frame").until(
+            EC.frame_to_be_available_and_switch_to_it((By.NAME, 'middle'))
+        )
+        search_box = self.wait("search_box").until(
+            EC.presence_of_element_located((By.NAME, 'SearchParcel'))
+        )
+        search_box.clear()
+        search_box.send_keys(parcel_id)
+        search_box.send_keys(Keys.RETURN)
+
+        # 3) Switch to bottom frame
+        self.driver.switch_to.default_content()
+        self.wait("results_frame").until(
+            EC.frame_to_be_available_and_switch_to_it((By.NAME, 'bottom'))
+        )
+
+        # 4) Parcel detail link
+        parcel_link = self.wait("parcel_link", not_found=True).until(
+            EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, 'Summary.asp?AccountNumber')]"))
+        )
+        parcel_link.click()
+
+        # 5) Switch again
+        self.driver.switch_to.default_content()
+        self.wait("summary_frame").until(
+            EC.frame_to_be_available_and_switch_to_it((By.NAME, 'bottom'))
+        )
+
+        # 6) Extract fields
+        try:
+            land = self.driver.find_element(
+                By.XPATH, "//td[normalize-space()='Land Value']/following-sibling::td/font"
+            ).text
+            parcel_data.LandValue = land
+        except:
+            parcel_data.LandValue = ""
+
+        try:
+            bldg = self.driver.find_element(
+                By.XPATH, "//td[normalize-space()='Building Value']/following-sibling::td/font"
+            ).text
+            parcel_data.BuildingValue = bldg
+        except:
+            parcel_data.BuildingValue = ""
+
+        try:
+            total = self.driver.find_element(
+                By.XPATH, "//td[normalize-space()='Total Value']/following-sibling::td/font/b"
+            ).text
+            parcel_data.TotalValue = total
+        except:
+            parcel_data.TotalValue = ""
+
+        try:
+            assessed_year = self.driver.find_element(
+                By.XPATH, "//td[normalize-space()='Year']/following-sibling::td/font/b"
+            ).text
+            parcel_data.AssessmentYear = assessed_year
+        except:
+            parcel_data.AssessmentYear = ""
+
+        # 7) Screenshot
+        screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
+        parcel_data.ScreenshotPath = screenshot_path
+
+        print(f"Patriot -> {parcel_id}: {parcel_data.LandValue}, {parcel_data.BuildingValue}, {parcel_data.TotalValue}")
+
+        # short pause
+        time.sleep(2)
+
+        # Switch back if needed:
+        self.driver.switch_to.default_content()
+
+        return [parcel_data]
 
 
 # ----------------------------------------------------------------------------
@@ -498,124 +747,220 @@ class CPTScraper(BaseCountyScraper):
     share this same approach but have distinct starting URLs.
     """
 
+    name = "CPT"
+
+    # Read the values from the portal's JSON responses instead of the Appraisal Summary tab
+    # (see network_capture.py). Needs a driver from create_driver(network_log=True); without
+    # one, or when the JSON doesn't come, the tab is read as usual.
+    capture_network = False
+
+    # The portal's JSON field names (the same as its table columns, mat-column-landValue and
+    # col-id="parcelNum" etc.). Values and years are only read from records of the parcel.
+    JSON_VALUE_FIELDS = {"LandValue": "landValue", "BuildingValue": "buildValue", "TotalValue": "totalValue"}
+    JSON_YEAR_FIELDS = ("assessmentYear", "assessYear", "taxYear")
+    JSON_PARCEL_FIELDS = ("parcelNum", "parcelNumber", "parcelId")
+
+    # Parcels in a row without the JSON after which capture is given up for this run
+    CAPTURE_MISSES = 3
+
     def __init__(self, driver, screenshot_dir, base_url):
         super().__init__(driver, screenshot_dir)
         self.base_url = base_url
+        self._capture = None
+        self._capture_misses = 0
+        self._payloads = []
 
     def go_to_main_page(self):
         self.driver.get(self.base_url)
 
-    def scrape_parcels(self, parcel_ids):
+    def start_parcel(self, parcel_id):
+        # 1) Go to the base URL
+        self.navigate(self.base_url)
+
+    def finish_parcel(self, parcel_id):
         """
         Re-implements your 'scrape_cpt_counties' logic.
         """
-        all_data = []
-        for parcel_id in parcel_ids:
-            try:
-                # 1) Go to the base URL
-                self.go_to_main_page()
-                wait = WebDriverWait(self.driver, 10)
-
-                # 2) Affirm/Continue disclaimers
-                try:
-                    affirm_button = wait.until(EC.presence_of_element_located((By.ID, "affirm")))
-                    affirm_button.click()
-                except:
-                    pass
-
-                try:
-                    continue_button = wait.until(EC.presence_of_element_located((By.ID, "continueButton")))
-                    continue_button.click()
-                except:
-                    pass
-
-                # 3) Search for parcel
-                parcel_input = wait.until(EC.presence_of_element_located((By.ID, "parcelBox")))
-                parcel_input.clear()
-                parcel_input.send_keys(parcel_id)
-
-                search_button = wait.until(EC.element_to_be_clickable((By.ID, "parcelButton")))
-                search_button.click()
-
-                # 4) Click matching row
-                parcelNum_xpath = f'//div[@col-id="parcelNum" and normalize-space()="{parcel_id}"]'
-                parcel_cell = wait.until(EC.element_to_be_clickable((By.XPATH, parcelNum_xpath)))
-                parcel_cell.click()
-
-                # 5) Appraisal summary tab
-                appraisal_tab = wait.until(
-                    EC.element_to_be_clickable((By.XPATH, "//div[@role='tab' and contains(., 'Appraisal Summary')]"))
-                )
-                appraisal_tab.click()
-                time.sleep(1)  # let it load
-
-                # 6) Screenshot
+        self.wait_for_page()
+
+        # 2) Affirm/Continue disclaimers
+        try:
+            affirm_button = self.wait("affirm", optional=True).until(EC.presence_of_element_located((By.ID, "affirm")))
+            affirm_button.click()
+        except:
+            pass
+
+        try:
+            continue_button = self.wait("continue", optional=True).until(EC.presence_of_element_located((By.ID, "continueButton")))
+            continue_button.click()
+        except:
+            pass
+
+        capturing = self.capturing()
+        if capturing:
+            if self._capture is None:
+                self._capture = NetworkCapture(self.driver)
+            self._capture.clear()
+            self._payloads = []
+
+        # 3) Search for parcel
+        parcel_input = self.wait("search_box").until(EC.presence_of_element_located((By.ID, "parcelBox")))
+        parcel_input.clear()
+        parcel_input.send_keys(parcel_id)
+
+        search_button = self.wait("search_button").until(EC.element_to_be_clickable((By.ID, "parcelButton")))
+        search_button.click()
+
+        # 4) Click matching row
+        parcelNum_xpath = f'//div[@col-id="parcelNum" and normalize-space()="{parcel_id}"]'
+        parcel_cell = self.wait("search_results", not_found=True).until(
+            EC.element_to_be_clickable((By.XPATH, parcelNum_xpath))
+        )
+        parcel_cell.click()
+
+        if capturing:
+            values = self.read_captured_values(parcel_id)
+            if values is not None:
+                # The screenshot shows the values the JSON gave
+                self.open_appraisal_tab()
                 screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
+                return [DataObject(ParcelID=parcel_id, ScreenshotPath=screenshot_path, **values)]
 
-                # 7) Land / building / total / year
-                try:
-                    land_val = wait.until(
-                        EC.presence_of_element_located(
-                            (By.XPATH, "//mat-cell[contains(@class, 'mat-column-landValue')]")
-                        )
-                    ).text.strip()
-                except:
-                    land_val = ""
-
-                try:
-                    build_val = wait.until(
-                        EC.presence_of_element_located(
-                            (By.XPATH, "//mat-cell[contains(@class, 'mat-column-buildValue')]")
-                        )
-                    ).text.strip()
-                except:
-                    build_val = ""
+        return self.read_appraisal_tab(parcel_id)
 
-                try:
-                    total_val = wait.until(
-                        EC.presence_of_element_located(
-                            (By.XPATH, "//mat-cell[contains(@class, 'mat-column-totalValue')]")
-                        )
-                    ).text.strip()
-                except:
-                    total_val = ""
+    def capturing(self):
+        return (self.capture_network and getattr(self.driver, "pidpal_network_log", False)
+                and self._capture_misses < self.CAPTURE_MISSES)
 
-                try:
-                    assessment_elem = wait.until(
-                        EC.presence_of_element_located(
-                            (By.XPATH, "//mat-card-title/span[contains(@class, 'darkBlueText')]")
-                        )
-                    )
-                    assessment_year = assessment_elem.text.split("/")[0].strip()  # e.g. "2023/2024"
-                except:
-                    assessment_year = ""
-
-                parcel_data = DataObject(
-                    ParcelID=parcel_id,
-                    LandValue=land_val,
-                    BuildingValue=build_val,
-                    TotalValue=total_val,
-                    AssessmentYear=assessment_year,
-                    ScreenshotPath=screenshot_path
+    def read_captured_values(self, parcel_id):
+        """
+        The parcel's values from the JSON the portal fetched after the parcel was opened, as
+        DataObject fields, or None if no record of this parcel arrived in time.
+        """
+        try:
+            values = self.wait("appraisal_json", optional=True).until(
+                lambda driver: self._captured_values(parcel_id)
+            )
+        except TimeoutException:
+            self._capture_misses += 1
+            if self._capture_misses == self.CAPTURE_MISSES:
+                print(f"{self.name}: no appraisal JSON from {site_host(self.base_url)} for "
+                      f"{self._capture_misses} parcels, reading the Appraisal Summary tab instead")
+            return None
+        self._capture_misses = 0
+        return values
+
+    def _captured_values(self, parcel_id):
+        self._payloads.extend(payload for _, payload in self._capture.responses())
+        mine = (self.JSON_PARCEL_FIELDS, parcel_id)
+        for payload in self._payloads:
+            record = find_record(payload, self.JSON_VALUE_FIELDS.values(), *mine)
+            if record is not None:
+                break
+        else:
+            return False
+
+        values = {
+            name: "" if record[field] is None else str(record[field])
+            for name, field in self.JSON_VALUE_FIELDS.items()
+        }
+        self.check_values(parcel_id, values, "the appraisal JSON")
+        # The year is usually on the same record, else on another of the parcel's records so far
+        values["AssessmentYear"] = ""
+        for field in self.JSON_YEAR_FIELDS:
+            holders = [record] + [find_record(payload, (field,), *mine) for payload in self._payloads]
+            year = next((holder[field] for holder in holders if holder and holder.get(field) is not None), None)
+            if year is not None:
+                values["AssessmentYear"] = str(year).split("/")[0].strip()  # e.g. "2023/2024"
+                break
+        return values
+
+    @staticmethod
+    def check_values(parcel_id, values, source):
+        """Raises ValueError (a parse_error) if none of the parcel's values could be read."""
+        if not any(values.get(name) for name in ("LandValue", "BuildingValue", "TotalValue")):
+            raise ValueError(f"No land, building or total value for {parcel_id} in {source}")
+
+    def open_appraisal_tab(self):
+        """Clicks the opened parcel's Appraisal Summary tab and waits until its values are shown."""
+        appraisal_tab = self.wait("appraisal_tab").until(
+            EC.element_to_be_clickable((By.XPATH, "//div[@role='tab' and contains(., 'Appraisal Summary')]"))
+        )
+        appraisal_tab.click()
+        self.wait("appraisal_values").until(
+            EC.visibility_of_element_located((By.XPATH, "//mat-cell[contains(@class, 'mat-column-totalValue')]"))
+        )
+
+    def read_appraisal_tab(self, parcel_id):
+        """Opens the parcel's Appraisal Summary tab and reads the values from the page."""
+        # 5) Appraisal summary tab
+        self.open_appraisal_tab()
+
+        # 6) Screenshot
+        screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
+
+        # 7) Land / building / total / year
+        try:
+            land_val = self.wait("land_value").until(
+                EC.presence_of_element_located(
+                    (By.XPATH, "//mat-cell[contains(@class, 'mat-column-landValue')]")
                 )
-                all_data.append(parcel_data)
+            ).text.strip()
+        except:
+            land_val = ""
+
+        try:
+            build_val = self.wait("building_value").until(
+                EC.presence_of_element_located(
+                    (By.XPATH, "//mat-cell[contains(@class, 'mat-column-buildValue')]")
+                )
+            ).text.strip()
+        except:
+            build_val = ""
+
+        try:
+            total_val = self.wait("total_value").until(
+                EC.presence_of_element_located(
+                    (By.XPATH, "//mat-cell[contains(@class, 'mat-column-totalValue')]")
+                )
+            ).text.strip()
+        except:
+            total_val = ""
+
+        try:
+            assessment_elem = self.wait("assessment_year").until(
+                EC.presence_of_element_located(
+                    (By.XPATH, "//mat-card-title/span[contains(@class, 'darkBlueText')]")
+                )
+            )
+            assessment_year = assessment_elem.text.split("/")[0].strip()  # e.g. "2023/2024"
+        except:
+            assessment_year = ""
 
-            except Exception as e:
-                print(f"CPT error with {parcel_id}: {e}")
-                error_shot = os.path.join(self.screenshot_dir, f"error_{parcel_id}.png")
-                self.driver.save_screenshot(error_shot)
+        values = {"LandValue": land_val, "BuildingValue": build_val, "TotalValue": total_val}
+        self.check_values(parcel_id, values, "the Appraisal Summary tab")
+
+        parcel_data = DataObject(
+            ParcelID=parcel_id,
+            LandValue=land_val,
+            BuildingValue=build_val,
+            TotalValue=total_val,
+            AssessmentYear=assessment_year,
+            ScreenshotPath=screenshot_path
+        )
+        return [parcel_data]
 
-        return all_data
-    
 
 # ----------------------------------------------------------------------------
-# 6) Spokane WA 
+# 6) Spokane WA
 # ----------------------------------------------------------------------------
 class SpokaneWAScraper(BaseCountyScraper):
     """
     Scraper for Spokane County, WA.
     """
 
+    name = "SpokaneWA"
+
     def __init__(self, driver, screenshot_dir):
         super().__init__(driver, screenshot_dir)
         self.base_url = 'https://cp.spokanecounty.org/scout/propertyinformation/'
@@ -626,195 +971,83 @@ class SpokaneWAScraper(BaseCountyScraper):
         """
         self.driver.get(self.base_url)
 
-    def scrape_parcels(self, parcel_ids):
+    def start_parcel(self, parcel_id):
+        # 1) Go to the Spokane site
+        self.navigate(self.base_url)
+
+    def finish_parcel(self, parcel_id):
         """
         Implementation of the Spokane County logic.
         """
-        all_data = []
-        for parcel_id in parcel_ids:
-            try:
-                # 1) Go to the Spokane site
-                self.go_to_main_page()
-
-                # 2) Wait for input to be clickable, then type parcel ID
-                search_box = WebDriverWait(self.driver, 20).until(
-                    EC.element_to_be_clickable((By.XPATH, '//*[@id="txtSearch"]'))
-                )
-                search_box.clear()
-                search_box.send_keys(parcel_id)
+        self.wait_for_page()
+
+        # 2) Wait for input to be clickable, then type parcel ID
+        search_box = self.wait("search_box", 20).until(
+            EC.element_to_be_clickable((By.XPATH, '//*[@id="txtSearch"]'))
+        )
+        search_box.clear()
+        search_box.send_keys(parcel_id)
+
+        # Click search button
+        search_button = self.driver.find_element(By.XPATH, '//*[@id="MainContent_btnSearch"]')
+        search_button.click()
+
+        # 3) Gather fields
+        assessment_year = self.wait("assessed_values", 20, not_found=True).until(
+            EC.presence_of_element_located((By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[1]/td[1]'))
+        ).text
+
+        land_value = self.driver.find_element(
+            By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[1]/td[4]'
+        ).text
+
+        # Expand building value dropdown
+        expand_button = self.driver.find_element(
+            By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[1]/td[1]/span'
+        )
+        expand_button.click()
+
+        building_value = self.wait("building_value", 20).until(
+            EC.presence_of_element_located((By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[2]/td/div/div[1]/div[2]'))
+        ).text
+
+        total_value = self.driver.find_element(
+            By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[1]/td[3]'
+        ).text
+
+        # 4) Create DataObject
+        parcel_data = DataObject(
+            ParcelID=parcel_id,
+            LandValue=land_value,
+            BuildingValue=building_value,
+            TotalValue=total_value,
+            AssessmentYear=assessment_year,
+            ScreenshotPath=""
+        )
+
+        # 5) Take screenshot
+        screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
+        parcel_data.ScreenshotPath = screenshot_path
+
+        print(
+            f"SpokaneWA -> {parcel_id}: Land={land_value}, Building={building_value}, "
+            f"Total={total_value}, Year={assessment_year}"
+        )
+        return [parcel_data]
 
-                # Click search button
-                search_button = self.driver.find_element(By.XPATH, '//*[@id="MainContent_btnSearch"]')
-                search_button.click()
-
-                # 3) Gather fields
-                assessment_year = WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[1]/td[1]'))
-                ).text
-
-                land_value = self.driver.find_element(
-                    By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[1]/td[4]'
-                ).text
-
-                # Expand building value dropdown
-                expand_button = self.driver.find_element(
-                    By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[1]/td[1]/span'
-                )
-                expand_button.click()
-
-                building_value = WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[2]/td/div/div[1]/div[2]'))
-                ).text
-
-                total_value = self.driver.find_element(
-                    By.XPATH, '//*[@id="MainContent_AssessedValue_GridView4"]/tbody/tr[1]/td[3]'
-                ).text
-
-                # 4) Create DataObject
-                parcel_data = DataObject(
-                    ParcelID=parcel_id,
-                    LandValue=land_value,
-                    BuildingValue=building_value,
-                    TotalValue=total_value,
-                    AssessmentYear=assessment_year,
-                    ScreenshotPath=""
-                )
-
-                # 5) Take screenshot
-                screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
-                parcel_data.ScreenshotPath = screenshot_path
-
-                print(
-                    f"SpokaneWA -> {parcel_id}: Land={land_value}, Building={building_value}, "
-                    f"Total={total_value}, Year={assessment_year}"
-                )
-                all_data.append(parcel_data)
-
-            except Exception as e:
-                print(f"SpokaneWA: Error processing parcel ID {parcel_id}: {e}")
-                # Optionally do an error screenshot
-                error_shot = os.path.join(self.screenshot_dir, f"error_{parcel_id}.png")
-                self.driver.save_screenshot(error_shot)
-
-        return all_data
-    
 # ----------------------------------------------------------------------------
 # 7) WI (MAYBE OTHER) COUNTIES
 # ----------------------------------------------------------------------------
 
-class WIScraper(BaseCountyScraper):
+class WIScraper(PierceWIScraper):
     """
     Generic WI approach. Each county using WI can be handled by
     instantiating this scraper with its unique 'base_url'.
+    The portal is the same one Pierce County uses, so the steps are PierceWIScraper's.
     """
 
+    name = "WI"
+
     def __init__(self, driver, screenshot_dir, base_url):
         super().__init__(driver, screenshot_dir)
         self.base_url = base_url
-
-
-    def go_to_main_page(self):
-        # If the WI site is always the same, or if each county has a different URL:
-        self.driver.get(self.base_url)
-        self.driver.implicitly_wait(10)
-
-        # Accept disclaimers
-        disclaimer_button_xpath = '//*[@id="ctl00_cphMainApp_btnEntryPageAccept"]'
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, disclaimer_button_xpath))
-        ).click()
-
-
-    def scrape_county(self, parcel_ids):
-        """
-        The 'template method' that orchestrates the entire scraping flow:
-        1) Go to the county's main page, accept disclaimers ONCE
-        2) Then scrape all parcels in a loop
-        """
-        # 1) Go to main page, accept disclaimers once
-        self.go_to_main_page()
-
-        # 2) Now do the per-parcel logic in scrape_parcels
-        return self.scrape_parcels(parcel_ids)
-    
-
-    def scrape_parcels(self, parcel_ids):
-        """
-        Scrape parcel data for all parcels, reusing the session
-        without re-invoking disclaimers each time.
-        """
-        all_data = []
-
-        for parcel_id in parcel_ids:
-            parcel_data = None
-            try:
-                print("\nDEBUG: Processing parcel:", parcel_id)
-
-                # 1) Search for the parcel
-                search_box_xpath = '//*[@id="mtxtParcelNumber"]'
-                search_box = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, search_box_xpath))
-                )
-
-                # Clear + set value by JS to handle any masked input
-                self.driver.execute_script(
-                    "arguments[0].value = arguments[1];", search_box, parcel_id
-                )
-                time.sleep(1)
-
-                # Some sites require a button click instead of ENTER, but let's try ENTER first
-                search_box.send_keys(Keys.ENTER)
-    
-
-                # 2) Navigate to the assessment page
-                assessment_page_link_xpath = '//*[@id="LinkButtonAssessments"]'
-                WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.XPATH, assessment_page_link_xpath))
-                ).click()
-
-                # 3) Check if current year is assessed, if not, select previous year
-                not_assessed_xpath = '//*[@id="LabelViewValuationsNotAllowed"]'
-                year_dropdown_xpath = '//*[@id="ddlTaxYear"]'
-
-                if self.driver.find_elements(By.XPATH, not_assessed_xpath):
-                    year_dropdown = Select(
-                        self.driver.find_element(By.XPATH, year_dropdown_xpath)
-                    )
-                    year_dropdown.select_by_index(1)
-
-                # 4) Extract values
-                land_value_xpath = '//*[@id="lblLand"]'
-                building_value_xpath  = '//*[@id="lblImprovements"]'
-                total_value_xpath = '//*[@id="lblTotal"]'
-                assyear_value_xpath = '//*[@id="LabelCurrentYearValuationsRE"]'
-
-                assyear = self.driver.find_element(By.XPATH, assyear_value_xpath).text
-                assyear_value = assyear.split()[0]
-                land_value = self.driver.find_element(By.XPATH, land_value_xpath).text
-                building_value = self.driver.find_element(By.XPATH, building_value_xpath).text
-                total_value = self.driver.find_element(By.XPATH, total_value_xpath).text
-
-                # 4.5) Take screenshot
-                screenshot_path = take_screenshot(self.driver, self.screenshot_dir, f"{parcel_id}.png")
-
-                # 5) Create DataObject
-                parcel_data = DataObject(
-                    ParcelID=parcel_id,
-                    LandValue=land_value,
-                    BuildingValue=building_value,
-                    TotalValue=total_value,
-                    AssessmentYear=assyear_value,  # Extract if available
-                    ScreenshotPath=screenshot_path
-                )
-
-                
-
-                all_data.append(parcel_data)
-
-            except Exception as e:
-                print(f"PierceWI: Error processing parcel ID {parcel_id}: {e}")
-                # Optionally do an error screenshot
-                error_shot = os.path.join(self.screenshot_dir, f"error_{parcel_id}.png")
-                self.driver.save_screenshot(error_shot)
-
-        return all_data
\ No newline at end of file
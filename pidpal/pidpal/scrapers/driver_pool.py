@@ -0,0 +1,246 @@
+# A pool of prewarmed Chrome drivers for the scrapers.
+#
+# Starting Chrome (and resolving chromedriver) takes seconds, and used to be paid on every Go!
+# click and by every CLI or service worker. A DriverPool starts its drivers in the background
+# as soon as it is created (the app's first Go!, the CLI run or the service starting up), so
+# a scrape usually finds one ready, and keeps them for later scrapes:
+#   acquire()   the next idle driver, health-checked first (a dead one is replaced)
+#   release()   gives it back with the number of parcels it handled. A driver that broke, has
+#               handled max_parcels parcels or whose Chrome processes use over max_memory_mb is recycled:
+#               quit and replaced in the background, which limits what long runs can leak.
+#               A reused driver gets its implicit wait set back to 0 (Pierce and Lake raise it).
+# Each slot of the pool keeps its own persistent profile (see browser_profile.py), if the pool
+# was given a profiles folder; a replacement only starts once the driver it replaces has quit.
+import time
+import queue
+import threading
+
+from pidpal.scrapers.browser_profile import worker_profile
+
+# Parcels a driver handles before it is replaced
+MAX_PARCELS = 500
+
+# Memory of a driver's Chrome processes (resident set of the browser, renderers and helpers,
+# in MB) above which it is replaced
+MAX_MEMORY_MB = 2048
+
+# Seconds before a slot tries again after Chrome failed to start
+RETRY_DELAY = 5
+
+
+class DriverPool:
+    """Drivers started ahead of time and shared by the scrape workers. Thread-safe."""
+
+    def __init__(self, size=1, headless=True, profiles=None, name=None,
+                 max_parcels=MAX_PARCELS, max_memory_mb=MAX_MEMORY_MB, network_log=False):
+        self.size = max(1, size)
+        self.headless = headless
+        self.profiles = profiles
+        self.network_log = network_log
+        self.name = name
+        self.max_parcels = max_parcels
+        self.max_memory_mb = max_memory_mb
+
+        self._idle = queue.Queue()      # (slot, driver or the exception that stopped it starting)
+        self._leased = {}               # id(driver) -> slot
+        self._handled = {}              # id(driver) -> parcels handled so far
+        self._lock = threading.Lock()
+        self._closed = False
+        self._starting = []             # threads quitting / starting drivers
+        self.stats = {"started": 0, "recycled": 0, "unhealthy": 0, "start_failures": 0}
+
+        for slot in range(self.size):
+            self._spawn(slot)
+
+    # -- driver lifecycle (background threads) ------------------------------
+
+    def _profile(self, slot):
+        if not self.profiles:
+            return None
+        return worker_profile(f"{self.name}-{slot}" if self.name else slot, self.profiles)
+
+    def _spawn(self, slot, old=None):
+        """Quits `old` (if any) and starts the slot's next driver, in a background thread."""
+        thread = threading.Thread(target=self._replace, args=(slot, old), name=f"driver-pool-{slot}", daemon=True)
+        with self._lock:
+            self._starting = [t for t in self._starting if t.is_alive()] + [thread]
+            thread.start()
+
+    def _replace(self, slot, old):
+        try:
+            from pidpal.scrapers.scrape_all import create_driver, close_driver
+
+            if old is not None:
+                try:
+                    close_driver(old)
+                except Exception:
+                    pass
+            if self._closed:
+                return
+            driver = create_driver(headless=self.headless, profile_dir=self._profile(slot),
+                                   network_log=self.network_log)
+        except Exception as e:
+            with self._lock:
+                self.stats["start_failures"] += 1
+            self._idle.put((slot, e))
+            return
+        with self._lock:
+            self.stats["started"] += 1
+        if self._closed:
+            close_driver(driver)
+            return
+        self._idle.put((slot, driver))
+
+    @staticmethod
+    def healthy(driver):
+        """True if the driver's browser still answers."""
+        try:
+            return driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def memory_mb(driver):
+        """
+        The resident memory of the driver's Chrome processes in MB: the chromedriver service's
+        child processes, or the ones Chrome lists (CDP SystemInfo.getProcessInfo) if the driver
+        has no local service. None without psutil or if the processes can't be read.
+        """
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            service = getattr(getattr(driver, "service", None), "process", None)
+            if service is not None:
+                processes = psutil.Process(service.pid).children(recursive=True)
+            else:
+                info = driver.execute_cdp_cmd("SystemInfo.getProcessInfo", {})
+                processes = [psutil.Process(p["id"]) for p in info.get("processInfo", [])]
+        except Exception:
+            return None
+
+        used = 0
+        for process in processes:
+            try:
+                used += process.memory_info().rss
+            except psutil.Error:
+                pass    # exited in the meantime
+        return used / (1024 * 1024) if processes else None
+
+    # -- leasing -------------------------------------------------------------
+
+    def acquire(self, timeout=None):
+        """
+        A healthy driver for the caller's exclusive use, until release(). Blocks while all are
+        leased or starting. Raises the error if the driver for a slot could not be started (the
+        slot tries again in the background).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("the driver pool is closed")
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                slot, driver = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError(f"no driver became free in {timeout}s") from None
+            if isinstance(driver, Exception):
+                retry = threading.Timer(RETRY_DELAY, self._spawn, args=(slot,))
+                retry.daemon = True
+                retry.start()
+                raise driver
+            if not self.healthy(driver):
+                print(f"DriverPool: driver {slot} stopped answering, starting a new one")
+                with self._lock:
+                    self.stats["unhealthy"] += 1
+                self._spawn(slot, driver)
+                continue
+            with self._lock:
+                self._leased[id(driver)] = slot
+            return driver
+
+    def release(self, driver, parcels=0, broken=False):
+        """
+        Returns an acquired driver after it handled `parcels` more parcels. A `broken` driver
+        (its batch failed in the browser) or a worn one is recycled instead of reused.
+        """
+        with self._lock:
+            slot = self._leased.pop(id(driver))
+            handled = self._handled.pop(id(driver), 0) + parcels
+        reason = None
+        if broken:
+            reason = "its batch failed"
+        elif handled >= self.max_parcels:
+            reason = f"it handled {handled} parcels"
+        else:
+            memory = self.memory_mb(driver)
+            if memory is not None and memory > self.max_memory_mb:
+                reason = f"its Chrome processes reached {memory:.0f} MB"
+        if not reason and not self._closed:
+            # Scrapers that set an implicit wait (Pierce, Lake) would slow every element lookup
+            # of the next scraper that gets this driver
+            try:
+                driver.implicitly_wait(0)
+            except Exception:
+                reason = "it stopped answering"
+        if reason or self._closed:
+            if reason:
+                print(f"DriverPool: recycling driver {slot} ({reason})")
+                with self._lock:
+                    self.stats["recycled"] += 1
+            self._spawn(slot, driver)
+            return
+        with self._lock:
+            self._handled[id(driver)] = handled
+        self._idle.put((slot, driver))
+
+    def status(self):
+        """Sizes and counters, for logs and the service's /health."""
+        with self._lock:
+            return {"size": self.size, "idle": self._idle.qsize(), "leased": len(self._leased), **self.stats}
+
+    def close(self):
+        """
+        Quits the idle drivers (after any still starting); leased ones are quit when they are
+        released.
+        """
+        from pidpal.scrapers.scrape_all import close_driver
+
+        self._closed = True
+        with self._lock:
+            starting = list(self._starting)
+        for thread in starting:
+            thread.join()
+        while True:
+            try:
+                _, driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(driver, Exception):
+                try:
+                    close_driver(driver)
+                except Exception:
+                    pass
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool(**pool_args):
+    """The process-wide DriverPool (the GUI's), created with `pool_args` on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DriverPool(**pool_args)
+        return _shared
+
+
+def close_shared_pool():
+    """Closes the process-wide DriverPool, if one was created (e.g. when the app quits)."""
+    global _shared
+    with _shared_lock:
+        pool, _shared = _shared, None
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,58 @@
+# Classification of failed parcel scrapes, as recorded in the ScrapeFailures table:
+#   not_found       the site answered but has no such parcel (retrying won't help)
+#   timeout         a page or element did not arrive in time (often just a slow moment)
+#   layout_changed  an element the scraper relies on is gone (the scraper needs updating)
+#   site_down       the site could not be reached, or its circuit breaker was open
+#   browser         our own browser failed (crashed, session lost, chrome not reachable)
+#   parse_error     the page was there but its values could not be read
+# Only RETRYABLE_CLASSES are picked up by `python -m pidpal.cli --retry`.
+FAILURE_CLASSES = ("not_found", "timeout", "layout_changed", "site_down", "browser", "parse_error")
+
+RETRYABLE_CLASSES = ("timeout", "site_down", "browser")
+
+# Chrome network error codes (in WebDriverException messages) that mean the site is unreachable
+_NETWORK_ERRORS = ("net::ERR_", "ERR_CONNECTION", "ERR_NAME_NOT_RESOLVED", "ERR_INTERNET_DISCONNECTED")
+
+
+class ParcelNotFound(Exception):
+    """
+    Raised by a scraper when the site's search has no match for the parcel, or shows none in
+    time (see BaseCountyScraper.wait).
+    """
+
+
+def classify_failure(error):
+    """The FAILURE_CLASSES entry for an exception raised while scraping a parcel."""
+    from selenium.common.exceptions import (
+        TimeoutException, NoSuchElementException, NoSuchFrameException,
+        StaleElementReferenceException, ElementNotInteractableException,
+        InvalidSelectorException, WebDriverException
+    )
+
+    if isinstance(error, ParcelNotFound):
+        return "not_found"
+    if isinstance(error, TimeoutException):
+        return "timeout"
+    if isinstance(error, (NoSuchElementException, NoSuchFrameException, StaleElementReferenceException,
+                          ElementNotInteractableException, InvalidSelectorException)):
+        return "layout_changed"
+    if isinstance(error, WebDriverException):
+        message = str(error)
+        if any(code in message for code in _NETWORK_ERRORS):
+            return "site_down"
+        # The browser itself failed (crashed, session lost): worth another try, but it says
+        # nothing about the site
+        return "browser"
+    return "parse_error"
+
+
+def failure_record(row, failure_class, step=None, message=None):
+    """A ScrapeFailures row (for insert_scrape_failures) for one input row of a scrape."""
+    return {
+        "ParcelID": row["ParcelID"],
+        "County": row.get("County"),
+        "State": row.get("State"),
+        "Class": failure_class,
+        "Step": step,
+        "Message": message,
+    }
@@ -0,0 +1,112 @@
+# JSON responses captured from the browser's own network traffic.
+#
+# Single-page portals (the CPT PTaxPortal) fetch a parcel's values as JSON and only then render
+# them. With Chrome's performance log on (create_driver(network_log=True)), the DevTools
+# Network events of every tab are buffered by chromedriver: NetworkCapture reads them, keeps
+# the XHR/fetch responses with a JSON body, and fetches those bodies with
+# Network.getResponseBody, so a scraper can read the values the moment the response arrives
+# instead of waiting for the page to render them. Events are kept per tab (the log's
+# "webview" is the tab's window handle), so pipelined tabs don't read each other's responses.
+import json
+import base64
+
+# Resource types whose responses are captured (not documents, scripts or images)
+CAPTURED_TYPES = ("XHR", "Fetch")
+
+
+class NetworkCapture:
+    """The JSON responses a driver's tabs received, from its performance log."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._loading = {}      # request ID -> (tab, URL): JSON response still loading
+        self._loaded = {}       # tab -> [(request ID, URL)]: body not read yet
+
+    def _read_log(self):
+        for entry in self.driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            tab = message.get("webview")
+            event = message.get("message", {})
+            method = event.get("method")
+            params = event.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                if params.get("type") in CAPTURED_TYPES and "json" in response.get("mimeType", ""):
+                    self._loading[request_id] = (tab, response.get("url"))
+            elif method == "Network.loadingFinished" and request_id in self._loading:
+                tab, url = self._loading.pop(request_id)
+                self._loaded.setdefault(tab, []).append((request_id, url))
+            elif method == "Network.loadingFailed":
+                self._loading.pop(request_id, None)
+
+    def _take_loaded(self):
+        # Loaded responses of the current tab (and any the log didn't tie to a tab); with one
+        # tab open, all of them
+        if len(self.driver.window_handles) == 1:
+            loaded = [response for responses in self._loaded.values() for response in responses]
+            self._loaded.clear()
+            return loaded
+        tab = self.driver.current_window_handle
+        return self._loaded.pop(tab, []) + self._loaded.pop(None, [])
+
+    def clear(self):
+        """Forgets the current tab's responses so far (e.g. before searching the next parcel)."""
+        self._read_log()
+        self._take_loaded()
+        if len(self.driver.window_handles) == 1:
+            self._loading.clear()
+            return
+        tab = self.driver.current_window_handle
+        self._loading = {request_id: (request_tab, url) for request_id, (request_tab, url) in self._loading.items()
+                         if request_tab != tab}
+
+    def responses(self):
+        """[(URL, parsed JSON)] of the current tab's responses that arrived since the last call."""
+        self._read_log()
+        ready = self._take_loaded()
+        payloads = []
+        for request_id, url in ready:
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            except Exception:
+                # No longer in Chrome's buffer
+                continue
+            text = body.get("body", "")
+            if body.get("base64Encoded"):
+                text = base64.b64decode(text).decode("utf-8", "replace")
+            try:
+                payloads.append((url, json.loads(text)))
+            except ValueError:
+                continue
+        return payloads
+
+
+def _same_id(a, b):
+    return str(a).strip().casefold() == str(b).strip().casefold()
+
+
+def find_record(payload, fields, id_fields=(), id_value=None):
+    """
+    The first dict in `payload` (depth first, in document order) that has every one of `fields`.
+    With `id_fields`, only a dict that belongs to `id_value` counts: the dict itself, or the
+    nearest dict around it with one of `id_fields`, must hold `id_value` there (ignoring case
+    and surrounding spaces). A response listing several parcels then gives the right one, and
+    one about another parcel gives None.
+    """
+    stack = [(payload, not id_fields)]
+    while stack:
+        node, owned = stack.pop()
+        if isinstance(node, dict):
+            ids = [node[field] for field in id_fields if node.get(field) is not None]
+            if ids:
+                owned = any(_same_id(value, id_value) for value in ids)
+            if owned and all(field in node for field in fields):
+                return node
+            stack.extend((child, owned) for child in reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend((child, owned) for child in reversed(node))
+    return None
@@ -6,180 +6,108 @@ from selenium.webdriver.chrome.options import Options
 from pidpal.scrapers.counties import *
 from county_data.patriot_urls import PATRIOT_URL_MAPPING
 from county_data.cpt_urls import CPT_URL_MAPPING
+from county_data.county_mapping import county_key
+from pidpal.scrapers.failures import failure_record
+from pidpal.scrapers.browser_profile import profile_arguments, restore_session_cookies, save_session_cookies
 
 
-def scrape_all_counties(data_list, screenshot_dir="Screenshots"):
+def create_driver(headless=False, profile_dir=None, network_log=False):
+    """
+    A Chrome driver with the options every scrape uses (headless for servers / the CLI).
+    With a `profile_dir`, Chrome keeps its cache and cookies there between runs (see
+    browser_profile.py; one directory per driver at a time). With network_log=True, its
+    DevTools Network events are logged for NetworkCapture (network_capture.py).
+    Close it with close_driver().
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    if profile_dir:
+        for argument in profile_arguments(profile_dir):
+            chrome_options.add_argument(argument)
+    if network_log:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.pidpal_profile = profile_dir
+    driver.pidpal_network_log = network_log
+    if profile_dir:
+        try:
+            restore_session_cookies(driver, profile_dir)
+        except Exception as e:
+            print(f"create_driver: could not restore the session cookies in {profile_dir}: {e}")
+    return driver
+
+
+def save_profile(driver):
+    """Saves a create_driver() driver's session cookies into its profile, if it has one."""
+    profile_dir = getattr(driver, "pidpal_profile", None)
+    if profile_dir:
+        try:
+            save_session_cookies(driver, profile_dir)
+        except Exception as e:
+            print(f"save_profile: could not save the session cookies in {profile_dir}: {e}")
+
+
+def close_driver(driver):
+    """Quits a create_driver() driver, saving its session cookies first."""
+    try:
+        save_profile(driver)
+    finally:
+        driver.quit()
+
+
+def scrape_all_counties(data_list, screenshot_dir="Screenshots", driver=None, deferred=None, failures=None,
+                        tabs=1, profile_dir=None, capture_network=False):
     """
     Creates ONE driver, uses the new template-method scrapers for each county,
     and returns all combined DataObjects.
+    A `driver` passed in is used instead (and left open, so a caller can reuse it for
+    several batches).
+    Rows of `data_list` skipped because their site's circuit breaker was open are appended
+    to the `deferred` list, if one is given, for a later retry.
+    Every parcel that failed or was deferred is appended to the `failures` list, if one is
+    given, as a ScrapeFailures row (see failures.py and db_func.insert_scrape_failures).
+    With tabs > 1, scrapers that support it keep that many tabs open and load the next
+    parcels' search pages while the current one is searched and extracted (see
+    BaseCountyScraper's pipelining).
+    A `profile_dir` gives the driver created here a persistent profile (see create_driver).
+    With capture_network=True, the CPT scrapers read the values from the portal's JSON
+    responses (on a `driver` created with network_log=True, or the one created here).
     """
 
-    # 1) Map (County, State) to "key" (e.g. "HennepinMN") 
-    county_mapping = {
-        ("Hennepin", "MN"): "HennepinMN",
-        ("Lake", "MN"): "LakeMN",
-        ("Pierce", "WI"): "PierceWI",
-        ("Falmouth", "MA"): "FalmouthMA",
-        ("Dover", "MA"): "DoverMA",
-        ("Acushnet", "MA"): "AcushnetMA",
-        ("Agawam", "MA"): "AgawamMA",
-        ("Andover", "MA"): "AndoverMA",
-        ("Arlington", "MA"): "ArlingtonMA",
-        ("Ashfield", "MA"): "AshfieldMA",
-        ("Auburn", "ME"): "AuburnME",
-        ("Barnard", "VT"): "BarnardVT",
-        ("Barton", "VT"): "BartonVT",
-        ("Bedford", "MA"): "BedfordMA",
-        ("Belchertown", "MA"): "BelchertownMA",
-        ("Bellingham", "MA"): "BellinghamMA",
-        ("Beverly", "MA"): "BeverlyMA",
-        ("Billerica", "MA"): "BillericaMA",
-        ("Blandford", "MA"): "BlandfordMA",
-        ("Braintree", "MA"): "BraintreeMA",
-        ("Brentwood", "NH"): "BrentwoodNH",
-        ("Brimfield", "MA"): "BrimfieldMA",
-        ("Burlington", "MA"): "BurlingtonMA",
-        ("Carlisle", "MA"): "CarlisleMA",
-        ("Castleton", "VT"): "CastletonVT",
-        ("Charlton", "MA"): "CharltonMA",
-        ("Clarksburg", "MA"): "ClarksburgMA",
-        ("Cohasset", "MA"): "CohassetMA",
-        ("Coventry", "VT"): "CoventryVT",
-        ("Cummington", "MA"): "CummingtonMA",
-        ("Dalton", "MA"): "DaltonMA",
-        ("Danvers", "MA"): "DanversMA",
-        ("Deerfield", "MA"): "DeerfieldMA",
-        ("Derby", "VT"): "DerbyVT",
-        ("Douglas", "MA"): "DouglasMA",
-        ("Dunstable", "MA"): "DunstableMA",
-        ("Essex", "MA"): "EssexMA",
-        ("Everett", "MA"): "EverettMA",
-        ("Fairhaven", "MA"): "FairhavenMA",
-        ("Fall River", "MA"): "Fall RiverMA",
-        ("Framingham", "MA"): "FraminghamMA",
-        ("Franklin", "MA"): "FranklinMA",
-        ("Great Barrington", "MA"): "Great BarringtonMA",
-        ("Groveland", "MA"): "GrovelandMA",
-        ("Hamilton", "MA"): "HamiltonMA",
-        ("Hardwick", "MA"): "HardwickMA",
-        ("Hatfield", "MA"): "HatfieldMA",
-        ("Haverhill", "MA"): "HaverhillMA",
-        ("Holbrook", "MA"): "HolbrookMA",
-        ("Holyoke", "MA"): "HolyokeMA",
-        ("Hopedale", "MA"): "HopedaleMA",
-        ("Hopkinton", "MA"): "HopkintonMA",
-        ("Hull", "MA"): "HullMA",
-        ("Ipswich", "MA"): "IpswichMA",
-        ("Jamaica", "VT"): "JamaicaVT",
-        ("Jay", "VT"): "JayVT",
-        ("Lancaster County", "SC"): "Lancaster CountySC",
-        ("Leicester", "MA"): "LeicesterMA",
-        ("Littleton", "MA"): "LittletonMA",
-        ("Lynn", "MA"): "LynnMA",
-        ("Lynnfield", "MA"): "LynnfieldMA",
-        ("Malden", "MA"): "MaldenMA",
-        ("Manchester-by-the-Sea", "MA"): "Manchester-by-the-SeaMA",
-        ("Marblehead", "MA"): "MarbleheadMA",
-        ("Marshfield", "MA"): "MarshfieldMA",
-        ("Marshfield", "VT"): "MarshfieldVT",
-        ("Maynard", "MA"): "MaynardMA",
-        ("Medway", "MA"): "MedwayMA",
-        ("Melrose", "MA"): "MelroseMA",
-        ("Merrimac", "MA"): "MerrimacMA",
-        ("Methuen", "MA"): "MethuenMA",
-        ("Middleton", "MA"): "MiddletonMA",
-        ("Milford", "MA"): "MilfordMA",
-        ("Millville", "MA"): "MillvilleMA",
-        ("Milton", "MA"): "MiltonMA",
-        ("Montague", "MA"): "MontagueMA",
-        ("Montgomery", "MA"): "MontgomeryMA",
-        ("Montpelier", "VT"): "MontpelierVT",
-        ("Nahant", "MA"): "NahantMA",
-        ("New Ashford", "MA"): "New AshfordMA",
-        ("Newbury", "MA"): "NewburyMA",
-        ("North Adams", "MA"): "North AdamsMA",
-        ("North Andover", "MA"): "North AndoverMA",
-        ("Northborough", "MA"): "NorthboroughMA",
-        ("Northfield", "MA"): "NorthfieldMA",
-        ("Norwich", "VT"): "NorwichVT",
-        ("Orange", "MA"): "OrangeMA",
-        ("Pembroke", "MA"): "PembrokeMA",
-        ("Pepperell", "MA"): "PepperellMA",
-        ("Peru", "MA"): "PeruMA",
-        ("Plainville", "MA"): "PlainvilleMA",
-        ("Plymouth", "MA"): "PlymouthMA",
-        ("Raynham", "MA"): "RaynhamMA",
-        ("Reading", "MA"): "ReadingMA",
-        ("Revere", "MA"): "RevereMA",
-        ("Rochester", "NH"): "RochesterNH",
-        ("Salem", "MA"): "SalemMA",
-        ("Salisbury", "MA"): "SalisburyMA",
-        ("Saugus", "MA"): "SaugusMA",
-        ("Shelburne", "MA"): "ShelburneMA",
-        ("Sherborn", "MA"): "SherbornMA",
-        ("Shirley", "MA"): "ShirleyMA",
-        ("Somersworth", "NH"): "SomersworthNH",
-        ("Southborough", "MA"): "SouthboroughMA",
-        ("Springfield", "VT"): "SpringfieldVT",
-        ("Stoneham", "MA"): "StonehamMA",
-        ("Stoughton", "MA"): "StoughtonMA",
-        ("Swampscott", "MA"): "SwampscottMA",
-        ("Tolland", "MA"): "TollandMA",
-        ("Topsfield", "MA"): "TopsfieldMA",
-        ("Townsend", "MA"): "TownsendMA",
-        ("Tyngsborough", "MA"): "TyngsboroughMA",
-        ("Upton", "MA"): "UptonMA",
-        ("Uxbridge", "MA"): "UxbridgeMA",
-        ("Wakefield", "MA"): "WakefieldMA",
-        ("Waltham", "MA"): "WalthamMA",
-        ("Warwick", "MA"): "WarwickMA",
-        ("Watertown", "MA"): "WatertownMA",
-        ("Wendell", "MA"): "WendellMA",
-        ("Wenham", "MA"): "WenhamMA",
-        ("West Bridgewater", "MA"): "West BridgewaterMA",
-        ("West Newbury", "MA"): "West NewburyMA",
-        ("West Tisbury", "MA"): "West TisburyMA",
-        ("Westborough", "MA"): "WestboroughMA",
-        ("Westford", "MA"): "WestfordMA",
-        ("Whitman", "MA"): "WhitmanMA",
-        ("Williamsburg", "MA"): "WilliamsburgMA",
-        ("Williamstown", "MA"): "WilliamstownMA",
-        ("Winchester", "MA"): "WinchesterMA",
-        ("Worthington", "MA"): "WorthingtonMA",
-        ("Douglas", "MN"): "DouglasMN",
-        ("Grant", "MN"): "GrantMN",
-        ("Kandiyohi", "MN"): "KandiyohiMN",
-        ("Lincoln", "MN"): "LincolnMN",
-        ("Meeker", "MN"): "MeekerMN",
-        ("Mille Lacs", "MN"): "Mille LacsMN",
-        ("Pope ", "MN"): "Pope MN",
-        ("Renville", "MN"): "RenvilleMN",
-        ("Sibley", "MN"): "SibleyMN",
-        ("Yellow Medicine", "MN"): "Yellow MedicineMN",
-        ("Spokane", "WA"): "SpokaneWA",
-        ("Douglas", "WI"): "DouglasWI"
-    }
-
+    # 1) Map (County, State) to "key" (e.g. "HennepinMN") with county_key (county_data/county_mapping.py)
     # 2) Group parcel IDs by the "key"
     cnum = {}
+    rows = {}
     for item in data_list:
         parcel_id = item["ParcelID"].strip()
-        state = item["State"].strip().upper()
-        county = item["County"].strip().title()
-        key = county_mapping.get((county, state))
+        key = county_key(item["County"], item["State"])
         if key:
             cnum.setdefault(key, []).append(parcel_id)
+            rows[(key, parcel_id)] = item
 
     all_data = []
 
-    # 3) Initialize ONE Selenium driver
-    chrome_options = Options()
-    # chrome_options.add_argument("--headless=new")  # optional if you want headless
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-
-    driver = webdriver.Chrome(options=chrome_options)
+    def run(key, scraper):
+        scraper.tabs = tabs
+        all_data.extend(scraper.scrape_county(cnum[key]))
+        if deferred is not None:
+            deferred.extend(rows[(key, parcel_id)] for parcel_id in scraper.deferred)
+        if failures is not None:
+            for parcel_id, failure_class, step, message in scraper.failures:
+                failures.append(failure_record(rows[(key, parcel_id)], failure_class, step, message))
+            for parcel_id in scraper.deferred:
+                failures.append(failure_record(rows[(key, parcel_id)], "site_down",
+                                               message="Deferred: the site's circuit breaker was open"))
+
+    # 3) Initialize ONE Selenium driver (unless the caller brought one)
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver(profile_dir=profile_dir, network_log=capture_network)
 
     try:
         # --------------------------------------------------------------------
@@ -188,57 +116,49 @@ def scrape_all_counties(data_list, screenshot_dir="Screenshots"):
 
         # Hennepin, MN
         if "HennepinMN" in cnum:
-            scraper = HennepinMNScraper(driver, screenshot_dir)
-            results = scraper.scrape_county(cnum["HennepinMN"])
-            all_data.extend(results)
+            run("HennepinMN", HennepinMNScraper(driver, screenshot_dir))
 
         # Lake, MN
         if "LakeMN" in cnum:
-            scraper = LakeMNScraper(driver, screenshot_dir)
-            results = scraper.scrape_county(cnum["LakeMN"])
-            all_data.extend(results)
+            run("LakeMN", LakeMNScraper(driver, screenshot_dir))
 
         # Pierce, WI
         if "PierceWI" in cnum:
-            scraper = PierceWIScraper(driver, screenshot_dir)
-            results = scraper.scrape_county(cnum["PierceWI"])
-            all_data.extend(results)
-        
+            run("PierceWI", PierceWIScraper(driver, screenshot_dir))
+
         # Spokane, WA
         if "SpokaneWA" in cnum:
-            scraper = SpokaneWAScraper(driver, screenshot_dir)
-            results = scraper.scrape_county(cnum["SpokaneWA"])
-            all_data.extend(results)
-        
+            run("SpokaneWA", SpokaneWAScraper(driver, screenshot_dir))
+
         # Douglas, WI
         if "DouglasWI" in cnum:
-            scraper = DouglasWIScraper(driver, screenshot_dir)
-            results = scraper.scrape_county(cnum["DouglasWI"])
-            all_data.extend(results)
+            run("DouglasWI", DouglasWIScraper(driver, screenshot_dir))
 
         # --------------------------------------------------------------------
         # 5) Patriot counties
         #    For each key found in cnum that also matches your PATRIOT_URL_MAPPING,
         #    create a PatriotScraper and call `scrape_county`.
         # --------------------------------------------------------------------
-        for county_key, base_url in PATRIOT_URL_MAPPING.items():
-            if county_key in cnum and cnum[county_key]:
-                patriot_scraper = PatriotScraper(driver, screenshot_dir, base_url)
-                result = patriot_scraper.scrape_county(cnum[county_key])
-                all_data.extend(result)
+        for key, base_url in PATRIOT_URL_MAPPING.items():
+            if key in cnum and cnum[key]:
+                run(key, PatriotScraper(driver, screenshot_dir, base_url))
 
         # --------------------------------------------------------------------
         # 6) CPT counties
         #    Same pattern, using the CPTScraper.
         # --------------------------------------------------------------------
-        for county_key, base_url in CPT_URL_MAPPING.items():
-            if county_key in cnum and cnum[county_key]:
-                cpt_scraper = CPTScraper(driver, screenshot_dir, base_url)
-                result = cpt_scraper.scrape_county(cnum[county_key])
-                all_data.extend(result)
+        for key, base_url in CPT_URL_MAPPING.items():
+            if key in cnum and cnum[key]:
+                scraper = CPTScraper(driver, screenshot_dir, base_url)
+                scraper.capture_network = capture_network
+                run(key, scraper)
 
     finally:
-        # 7) Quit driver once at the end
-        driver.quit()
+        # 7) Quit driver once at the end (if we started it); a caller's driver may never be
+        #    closed cleanly (the service's), so its cookies are saved after every batch
+        if own_driver:
+            close_driver(driver)
+        else:
+            save_profile(driver)
 
     return all_data
@@ -0,0 +1,152 @@
+# Adaptive WebDriverWait timeouts for the county scrapers.
+#
+# Every wait a scraper makes is named by its site and step (e.g. the CPT Douglas URL and
+# "search_results"), and how long it took is recorded. Once a step has MIN_SAMPLES recent
+# observations, its timeout is the PERCENTILE of them times MARGIN, kept between MIN_TIMEOUT
+# and MAX_TIMEOUT; until then the scraper's own default (the old hardcoded 10 or 20 seconds)
+# is used. So a fast site fails a missing element in a few seconds, and a slow one is not cut
+# off under load. Only waits that succeeded are observations: a wait that times out (often a
+# parcel that simply isn't there) is counted as a miss, so a run of missing parcels doesn't
+# ratchet the step up towards MAX_TIMEOUT. But when half the recent waits at a step miss, the
+# adapted timeout is likely too short for the site as it is now (and no wait can succeed to
+# correct it), so the step backs off: at least its default, doubled for every further miss.
+# Observations and misses are kept in LATENCY_FILE between runs.
+import os
+import json
+import math
+import threading
+from collections import deque
+
+LATENCY_FILE = os.path.join("Resources", "scrape_latency.json")
+
+# Observations kept per (site, step); older ones are dropped
+WINDOW = 200
+
+# Observations needed before a step's timeout is adapted
+MIN_SAMPLES = 20
+
+PERCENTILE = 0.95
+MARGIN = 2.0
+
+# Bounds of an adapted timeout, in seconds
+MIN_TIMEOUT = 3.0
+MAX_TIMEOUT = 60.0
+
+# Share of a step's last MIN_SAMPLES waits that must have timed out for it to back off
+BACKOFF_MISS_RATE = 0.5
+
+
+class LatencyModel:
+    """Recent wait times per site and step, and the timeouts derived from them. Thread-safe."""
+
+    def __init__(self, path=LATENCY_FILE):
+        self.path = path
+        self._samples = {}      # site -> {step: deque of seconds}
+        self._outcomes = {}     # site -> {step: deque of True (missed) / False (succeeded)}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if "samples" not in stored:
+            # Written before misses were kept apart: its samples include timeouts, start over
+            return
+        for name, target in (("samples", self._samples), ("outcomes", self._outcomes)):
+            for site, steps in stored.get(name, {}).items():
+                for step, values in steps.items():
+                    target.setdefault(site, {})[step] = deque(values, maxlen=WINDOW)
+
+    def _add(self, target, site, step, value):
+        target.setdefault(site, {}).setdefault(step, deque(maxlen=WINDOW)).append(value)
+
+    def record(self, site, step, seconds):
+        """A wait at this step that succeeded after `seconds`."""
+        with self._lock:
+            self._add(self._samples, site, step, round(seconds, 3))
+            self._add(self._outcomes, site, step, False)
+            self._dirty = True
+
+    def record_miss(self, site, step):
+        """A wait at this step that timed out (counted in the miss rate, not the observations)."""
+        with self._lock:
+            self._add(self._outcomes, site, step, True)
+            self._dirty = True
+
+    def miss_rate(self, site, step):
+        """Share of the recent waits at this step that timed out, or None if there were none."""
+        with self._lock:
+            outcomes = self._outcomes.get(site, {}).get(step)
+            if not outcomes:
+                return None
+            return sum(outcomes) / len(outcomes)
+
+    def timeout(self, site, step, default):
+        """
+        Seconds to wait at this step: adapted from the observations, else `default`. While at
+        least BACKOFF_MISS_RATE of the recent waits missed, it is backed off instead: the larger
+        of the two, doubled for every further recent miss, up to MAX_TIMEOUT.
+        """
+        with self._lock:
+            samples = self._samples.get(site, {}).get(step)
+            ordered = sorted(samples) if samples and len(samples) >= MIN_SAMPLES else None
+            recent = list(self._outcomes.get(site, {}).get(step, ()))[-MIN_SAMPLES:]
+
+        timeout = default
+        if ordered:
+            high = ordered[max(0, math.ceil(PERCENTILE * len(ordered)) - 1)]
+            timeout = min(MAX_TIMEOUT, max(MIN_TIMEOUT, high * MARGIN))
+
+        backoff = sum(recent) - math.ceil(BACKOFF_MISS_RATE * MIN_SAMPLES)
+        if timeout is not None and len(recent) == MIN_SAMPLES and backoff >= 0:
+            timeout = min(MAX_TIMEOUT, max(timeout, default or 0) * 2 ** backoff)
+        return timeout
+
+    def summary(self):
+        """{site: {step: (observations, current timeout or None, miss rate or None)}} for logs."""
+        with self._lock:
+            sites = {site: {step: len(samples) for step, samples in steps.items()}
+                     for site, steps in self._samples.items()}
+            for site, steps in self._outcomes.items():
+                for step in steps:
+                    sites.setdefault(site, {}).setdefault(step, 0)
+        return {
+            site: {step: (count, self.timeout(site, step, None), self.miss_rate(site, step))
+                   for step, count in steps.items()}
+            for site, steps in sites.items()
+        }
+
+    def save(self):
+        """Writes the observations to self.path (if anything changed since the last save)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            stored = {
+                name: {site: {step: list(values) for step, values in steps.items()} for site, steps in target.items()}
+                for name, target in (("samples", self._samples), ("outcomes", self._outcomes))
+            }
+            self._dirty = False
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stored, f)
+        os.replace(tmp_path, self.path)
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def latency_model():
+    """The process-wide LatencyModel, loaded from LATENCY_FILE on first use."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = LatencyModel()
+        return _model
@@ -1,7 +1,174 @@
 # leaflet_map.py
-
-import pandas as pd
+#
+# The Home page map. The generated HTML is cached on disk, keyed by a hash of the tracker CSV's
+# content, so launches only rebuild it when the CSV changes. Markers ship as one compact JSON
+# array that the page turns into markers itself, clustered with Leaflet.markercluster so
+# hundreds of towns (or individual parcels) stay fast to render. The page loads Leaflet and the
+# tiles from pidpal.map_server (bundled assets and a local tile cache), not from the internet.
+
+import os
+import re
 import json
+import hashlib
+
+# Bump when the HTML template changes, so cached maps are rebuilt
+MAP_TEMPLATE_VERSION = 3
+
+# Cached maps live in a subfolder of the CSV's folder
+MAP_CACHE_DIR = "map_cache"
+
+# Columns of each marker entry in the JSON array, in order
+MARKER_COLUMNS = ["lat", "lon", "County/City", "State", "Status", "Link"]
+
+# Note: We do NOT use 'integrity' attributes, to avoid SRI mismatches in PyQt
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+  <head>
+    <meta charset="utf-8"/>
+    <title>Leaflet Map</title>
+    <style>
+      html, body {
+        margin: 0;
+        padding: 0;
+        height: 100%;
+        overflow: hidden;
+      }
+      #map {
+        height: 100%;
+        width: 100%;
+      }
+    </style>
+
+    <!-- Leaflet + Leaflet.markercluster CSS (bundled, served by pidpal.map_server) -->
+    <link rel="stylesheet" href="/assets/leaflet/leaflet.css"/>
+    <link rel="stylesheet" href="/assets/markercluster/MarkerCluster.css"/>
+    <link rel="stylesheet" href="/assets/markercluster/MarkerCluster.Default.css"/>
+  </head>
+  <body>
+    <div id="map"></div>
+
+    <!-- Leaflet + Leaflet.markercluster JS -->
+    <script src="/assets/leaflet/leaflet.js"></script>
+    <script src="/assets/markercluster/leaflet.markercluster.js"></script>
+
+    <script>
+      // [lat, lon, name, state, status, link] per marker
+      var points = {markers_json};
+
+      // Create the Leaflet map
+      var map = L.map('map', {preferCanvas: true});
+
+      // OpenStreetMap tiles through the local tile cache
+      L.tileLayer('/tiles/{z}/{x}/{y}.png', {
+        attribution: '© OpenStreetMap contributors',
+        maxZoom: 19
+      }).addTo(map);
+
+      function escapeHtml(text) {
+        return String(text).replace(/[&<>"']/g, function (c) {
+          return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+        });
+      }
+
+      // Popups are built when opened, not up front for every marker
+      function popupContent(p) {
+        var link = escapeHtml(p[5]);
+        return '<b>' + escapeHtml(p[2]) + ', ' + escapeHtml(p[3]) + '</b><br>' +
+               'Status: ' + escapeHtml(p[4]) + '<br>' +
+               '<a href="' + link + '" target="_blank">' + link + '</a>';
+      }
+
+      // Clustered markers (plain group if the plugin didn't load)
+      var markerGroup = L.markerClusterGroup
+        ? L.markerClusterGroup({chunkedLoading: true})
+        : L.featureGroup();
+
+      var markers = new Array(points.length);
+      for (var i = 0; i < points.length; i++) {
+        var p = points[i];
+        markers[i] = L.marker([p[0], p[1]]).bindPopup(popupContent.bind(null, p));
+      }
+      if (markerGroup.addLayers) {
+        markerGroup.addLayers(markers);
+      } else {
+        markers.forEach(function (m) { markerGroup.addLayer(m); });
+      }
+      markerGroup.addTo(map);
+
+      // Attempt to fit the map to the marker bounds
+      var bounds = points.length ? L.latLngBounds(points.map(function (p) { return [p[0], p[1]]; })) : null;
+      if (bounds && bounds.isValid()) {
+        map.fitBounds(bounds);
+      } else {
+        // Fallback: center on continental US if no valid markers
+        map.setView([37.0902, -95.7129], 4);
+      }
+    </script>
+  </body>
+</html>
+"""
+
+
+def csv_content_hash(csv_path):
+    """SHA-1 of the CSV's bytes (and the template version), read in blocks."""
+    digest = hashlib.sha1(f"v{MAP_TEMPLATE_VERSION}:".encode())
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def markers_json(df):
+    """
+    The marker entries of a tracker DataFrame as one compact JSON array, built column-wise:
+    rows without lat/lon are dropped and missing text becomes "".
+    """
+    import pandas as pd
+
+    df = df.reindex(columns=MARKER_COLUMNS)
+    df["lat"] = pd.to_numeric(df["lat"], errors="coerce").round(6)
+    df["lon"] = pd.to_numeric(df["lon"], errors="coerce").round(6)
+    df = df.dropna(subset=["lat", "lon"])
+    text_columns = MARKER_COLUMNS[2:]
+    df[text_columns] = df[text_columns].astype(object).fillna("").astype(str)
+    return json.dumps(df.to_numpy(dtype=object).tolist(), separators=(",", ":"), ensure_ascii=False)
+
+
+def build_leaflet_map_html(csv_path: str) -> str:
+    """Builds the map HTML from the CSV (no caching; see generate_leaflet_map_html)."""
+    # pandas is only needed when the CSV changed, not on a cached start
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    # "</" can't appear inside the inline script
+    data = markers_json(df).replace("</", "<\\/")
+    return HTML_TEMPLATE.replace("{markers_json}", data)
+
+
+def leaflet_map_file(csv_path: str) -> str:
+    """
+    Path of the cached map HTML for the CSV's current content, e.g.
+    Resources/map_cache/PidPal Counties Tracker-<hash>.html, building it (and removing the
+    stale copies for the same CSV) when the content has changed.
+    """
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    cache_dir = os.path.join(os.path.dirname(csv_path), MAP_CACHE_DIR)
+    cache_path = os.path.join(cache_dir, f"{name}-{csv_content_hash(csv_path)[:16]}.html")
+    if os.path.exists(cache_path):
+        return cache_path
+
+    html = build_leaflet_map_html(csv_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    stale = re.compile(re.escape(name) + r"-[0-9a-f]{16}\.html")
+    for filename in os.listdir(cache_dir):
+        if stale.fullmatch(filename):
+            os.remove(os.path.join(cache_dir, filename))
+    tmp_path = cache_path + ".part"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
 
 def generate_leaflet_map_html(csv_path: str) -> str:
     """
@@ -13,115 +180,9 @@ def generate_leaflet_map_html(csv_path: str) -> str:
       - lat
       - lon
 
-    Returns a Leaflet-based HTML string with pins
-    auto-zoomed to show all valid lat/lon entries.
-    """
-    # 1) Read the CSV
-    df = pd.read_csv(csv_path)
-    
-    # Optional debug checks
-    # print("DataFrame columns:", df.columns)
-    # print(df.head())
-
-    # 2) Basic HTML with Leaflet
-    # Note: We do NOT use 'integrity' attributes, to avoid SRI mismatches in PyQt
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-      <head>
-        <meta charset="utf-8"/>
-        <title>Leaflet Map</title>
-        <style>
-          html, body {
-            margin: 0;
-            padding: 0;
-            height: 100%;
-            overflow: hidden;
-          }
-          #map {
-            height: 100%;
-            width: 100%;
-          }
-        </style>
-
-        <!-- Leaflet CSS -->
-        <link
-          rel="stylesheet"
-          href="https://unpkg.com/leaflet@1.9.3/dist/leaflet.css"
-          crossorigin=""
-        />
-      </head>
-      <body>
-        <div id="map"></div>
-
-        <!-- Leaflet JS -->
-        <script
-          src="https://unpkg.com/leaflet@1.9.3/dist/leaflet.js"
-          crossorigin="">
-        </script>
-
-        <script>
-          // Create the Leaflet map
-          var map = L.map('map');
-
-          // Tile layer from OpenStreetMap (no curly braces for .format needed)
-          L.tileLayer('https://tile.openstreetmap.org/{z}/{x}/{y}.png', {
-            attribution: '© OpenStreetMap contributors',
-            maxZoom: 19
-          }).addTo(map);
-
-          // Create a feature group for markers
-          var markerGroup = L.featureGroup().addTo(map);
-
-          {markers_script}
-
-          // Attempt to fit the map to the marker bounds
-          var bounds = markerGroup.getBounds();
-          if (bounds.isValid()) {{
-            map.fitBounds(bounds);
-          }} else {{
-            // Fallback: center on continental US if no valid markers
-            map.setView([37.0902, -95.7129], 4);
-          }}
-        </script>
-      </body>
-    </html>
+    Returns a Leaflet-based HTML string with clustered pins
+    auto-zoomed to show all valid lat/lon entries (served from the on-disk cache).
+    The page expects to be loaded through pidpal.map_server, which serves its assets and tiles.
     """
-
-    # 3) Build the markers script
-    markers_script_lines = []
-    for i, row in df.iterrows():
-        county_city = row.get('County/City', '')
-        state       = row.get('State', '')
-        status      = row.get('Status', '')
-        link        = row.get('Link', '')
-        lat         = row.get('lat', None)
-        lon         = row.get('lon', None)
-
-        # Ensure lat/lon are valid
-        if pd.isna(lat) or pd.isna(lon):
-            continue  # skip this row if lat/lon is missing
-
-        # Build popup HTML
-        popup_content = (
-            f"<b>{county_city}, {state}</b><br>"
-            f"Status: {status}<br>"
-            f"<a href='{link}' target='_blank'>{link}</a>"
-        )
-
-        # Escape special chars (apostrophes, quotes) via json.dumps
-        popup_content_js = json.dumps(popup_content)
-
-        marker_line = f"""
-        L.marker([{lat}, {lon}])
-         .bindPopup({popup_content_js})
-         .addTo(markerGroup);
-        """
-        markers_script_lines.append(marker_line.strip())
-
-    # Join all marker lines into one JavaScript block
-    markers_script = "\n".join(markers_script_lines)
-
-    # 4) Insert the markers script into the HTML template
-    final_html = html_template.replace("{markers_script}", markers_script)
-    return final_html
+    with open(leaflet_map_file(csv_path), "r", encoding="utf-8") as f:
+        return f.read()
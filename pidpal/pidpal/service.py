@@ -0,0 +1,496 @@
+# Local HTTP service: one shared scrape queue and browser pool for several users.
+#   python -m pidpal.service --port 8765 --workers 4
+#
+#   POST /jobs                  submit parcels: {"parcels": [{"ParcelID", "County", "State",
+#                               "PropertyID", "Owner"}, ...], "freshness": "always", "max_age_days": 30}
+#   GET  /jobs                  every job's status
+#   GET  /jobs/<id>             one job's status
+#   GET  /jobs/<id>/results     per-parcel results as JSON lines, streamed until the job is done
+#                               (?wait=0 returns what is ready now)
+#   GET  /parcels               query_parcels_page over the DB: ParcelID/State/County filters,
+#                               sort_by, sort_order, search, search_mode, as_of, year,
+#                               page_size, after (the "after" returned with the previous page)
+#   GET  /health
+#
+# Submitted rows go through the same ParcelID checks as the Import page. Every valid parcel is
+# queued once: if a parcel is already queued or being scraped for another job, the new job just
+# waits on that scrape (coalescing), so the same parcel is never scraped twice at once. A fixed
+# set of worker threads takes parcels off the queue in batches, each batch on a driver from a
+# DriverPool started with the service (so the browsers are up before the first job comes in).
+# With --profiles, each browser keeps its cache and cookies between service runs.
+import sys
+import json
+import time
+import uuid
+import queue
+import argparse
+import threading
+import traceback
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from pidpal.db_func import (
+    DB_PATH, insert_initial_parcels, insert_scraped_data, insert_scrape_failures, query_parcels_page
+)
+from pidpal.func import DataBatch
+from pidpal.parcel_import import IMPORT_COLUMNS, batch_records, records_batch
+from pidpal.parcel_ids import check_parcel_batch, valid_rows, rejected_rows
+from pidpal.cli import FRESHNESS_POLICIES, DEFAULT_BATCH_SIZE, select_for_scrape
+from pidpal.scrapers.circuit_breaker import breaker_status
+from pidpal.scrapers.browser_profile import PROFILE_ROOT, cache_stats
+from pidpal.scrapers.driver_pool import MAX_MEMORY_MB, MAX_PARCELS, DriverPool
+from pidpal.scrapers.failures import classify_failure, failure_record
+
+DEFAULT_PORT = 8765
+
+# Finished jobs kept for status/results queries (oldest dropped first)
+JOB_RETENTION = 500
+
+# Longest a POST /jobs body may be, in bytes
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+PARCEL_FILTERS = ("ParcelID", "State", "County")
+
+
+def parcel_key(record):
+    """What makes two submitted rows the same scrape."""
+    return (record["ParcelID"], record["County"], record["State"])
+
+
+class Job:
+    """One submitted batch: its parcels, and the result of each as it comes in."""
+
+    def __init__(self, job_id, keys, rejected):
+        self.id = job_id
+        self.keys = keys                   # parcel keys still expected, in submit order
+        self.rejected = rejected           # [{"ParcelID", ..., "Issue"}] not queued
+        self.results = []                  # per-parcel result dicts, in completion order
+        self.coalesced = 0                 # parcels that joined another job's scrape
+        self.created = time.time()
+        self.finished = None
+        self.changed = threading.Condition()
+
+    @property
+    def status(self):
+        if self.finished is not None:
+            return "done"
+        return "running" if self.results else "queued"
+
+    def summary(self):
+        counts = {}
+        for result in self.results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total": len(self.keys),
+            "done": len(self.results),
+            "scraped": counts.get("scraped", 0),
+            "fresh": counts.get("fresh", 0),
+            "failed": counts.get("failed", 0),
+            "deferred": counts.get("deferred", 0),
+            "coalesced": self.coalesced,
+            "rejected": len(self.rejected),
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+    def add_result(self, result):
+        with self.changed:
+            self.results.append(result)
+            if len(self.results) >= len(self.keys):
+                self.finished = time.time()
+            self.changed.notify_all()
+
+
+class ScrapeService:
+    """
+    The job table, the shared parcel queue and the scrape workers behind the HTTP handler.
+    Parcels in flight (queued or being scraped) map to every job waiting on them.
+    """
+
+    def __init__(self, db_path=DB_PATH, workers=2, batch_size=DEFAULT_BATCH_SIZE,
+                 screenshot_dir="Screenshots", headless=True, tabs=1, profiles=None,
+                 max_parcels=MAX_PARCELS, max_memory_mb=MAX_MEMORY_MB, capture_network=False):
+        # Imported up front so a missing Selenium stops the service at startup
+        from pidpal.scrapers.scrape_all import scrape_all_counties
+        self._scrape = scrape_all_counties
+
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.screenshot_dir = screenshot_dir
+        self.tabs = tabs
+        self.capture_network = capture_network
+        # Named apart from the CLI's profiles, so a CLI run beside the service can't lock them
+        self.pool = DriverPool(max(1, workers), headless=headless, profiles=profiles, name="service",
+                               max_parcels=max_parcels, max_memory_mb=max_memory_mb, network_log=capture_network)
+
+        self.jobs = OrderedDict()          # job id -> Job
+        self._inflight = {}                # parcel key -> [Job, ...] waiting on it
+        self._lock = threading.Lock()      # jobs and _inflight
+        self._db_lock = threading.Lock()   # one writer at a time
+        self._queue = queue.Queue()        # records waiting for a worker
+        self.stats = {"submitted": 0, "coalesced": 0, "scraped": 0, "failed": 0, "deferred": 0}
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"scrape-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    # -- submitting --------------------------------------------------------
+
+    def submit(self, rows, freshness="always", max_age_days=30):
+        """Checks and queues submitted rows (dicts with IMPORT_COLUMNS); returns the Job."""
+        if freshness not in FRESHNESS_POLICIES:
+            raise ValueError(f"freshness must be one of {', '.join(FRESHNESS_POLICIES)}")
+        checked = check_parcel_batch(records_batch(rows))
+        valid = valid_rows(checked).drop_duplicates(["ParcelID", "County", "State"])
+        rejected = rejected_rows(checked)[IMPORT_COLUMNS + ["Issue"]]
+        rejected = rejected.astype(object).to_dict("records")
+
+        records = batch_records(valid)
+        with self._db_lock:
+            insert_initial_parcels(records, db_path=self.db_path)
+            to_scrape, _ = select_for_scrape(valid, freshness, max_age_days, self.db_path)
+        wanted = {parcel_key(record) for record in batch_records(to_scrape)}
+
+        job = Job(uuid.uuid4().hex[:12], [parcel_key(record) for record in records], rejected)
+        fresh = []
+        with self._lock:
+            self.jobs[job.id] = job
+            self._trim_jobs()
+            for record in records:
+                key = parcel_key(record)
+                if key not in wanted:
+                    fresh.append(key)
+                elif key in self._inflight:
+                    self._inflight[key].append(job)
+                    job.coalesced += 1
+                else:
+                    self._inflight[key] = [job]
+                    self._queue.put(record)
+            self.stats["submitted"] += len(records)
+            self.stats["coalesced"] += job.coalesced
+
+        for key in fresh:
+            job.add_result(self._result(key, "fresh"))
+        if not records:
+            job.finished = time.time()
+        return job
+
+    def _trim_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished is not None]
+        for job_id in finished[:max(0, len(finished) - JOB_RETENTION)]:
+            del self.jobs[job_id]
+
+    # -- scraping ----------------------------------------------------------
+
+    def _next_batch(self):
+        """Blocks for one queued record, then takes up to batch_size - 1 more that are ready."""
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        while True:
+            records = self._next_batch()
+            settled = set()
+            problem = None
+            try:
+                scraped, deferred, failures, error = self._scrape_batch(records)
+                self._finish_batch(records, scraped, deferred, failures, error, settled)
+            except Exception as e:
+                traceback.print_exc(file=sys.stderr)
+                problem = f"{type(e).__name__}: {e}"
+            finally:
+                # Whatever went wrong (the DB write, say), no job may wait on these forever
+                self._settle(records, settled, problem)
+
+    def _scrape_batch(self, records):
+        """Scrapes records on a pooled driver: (scraped, deferred, ScrapeFailures rows, error or None)."""
+        error = None
+        scraped = []
+        deferred = []
+        failures = []
+        driver = None
+        try:
+            driver = self.pool.acquire()
+            scraped = self._scrape(records, screenshot_dir=self.screenshot_dir, driver=driver,
+                                   deferred=deferred, failures=failures, tabs=self.tabs,
+                                   capture_network=self.capture_network)
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            error = f"{type(e).__name__}: {e}"
+            try:
+                failures = [failure_record(record, classify_failure(e), message=error) for record in records]
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+                failures = []
+        finally:
+            if driver is not None:
+                self.pool.release(driver, parcels=len(records), broken=error is not None)
+        return scraped, deferred, failures, error
+
+    def _finish_batch(self, records, scraped, deferred, failures, error, settled):
+        failed = {parcel_key(failure): failure for failure in failures}
+        deferred_keys = {parcel_key(record) for record in deferred}
+        # A scraped object only has its ParcelID: it belongs to the row of that ParcelID that
+        # didn't fail, if the same ID was also submitted for another county
+        places = {
+            record["ParcelID"]: (record["County"], record["State"]) for record in records
+            if parcel_key(record) not in failed and parcel_key(record) not in deferred_keys
+        }
+        batch = DataBatch.from_objects(scraped, places)
+        with self._db_lock:
+            if len(batch):
+                insert_scraped_data(batch, db_path=self.db_path)
+            if failures:
+                insert_scrape_failures(failures, db_path=self.db_path)
+
+        values = {}
+        for i, obj in enumerate(batch):
+            values[(obj.ParcelID, batch.County[i], batch.State[i])] = obj
+        for record in records:
+            key = parcel_key(record)
+            obj = values.get(key)
+            if obj is not None:
+                result = self._result(key, "scraped", obj)
+            elif key in deferred_keys:
+                result = self._result(key, "deferred", error="County site is down; submit again later")
+                result["failure"] = "site_down"
+            else:
+                failure = failed.get(key, {})
+                message = failure.get("Message") or error or "No result from the county site"
+                result = self._result(key, "failed", error=message)
+                result["failure"] = failure.get("Class")
+            self._post(key, result)
+            settled.add(key)
+
+    def _settle(self, records, settled, problem):
+        """Posts a "failed" result for every parcel of the batch that didn't get one."""
+        for record in records:
+            key = parcel_key(record)
+            if key in settled:
+                continue
+            settled.add(key)
+            try:
+                self._post(key, self._result(key, "failed", error=f"Could not finish the parcel: {problem}"))
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def _post(self, key, result):
+        with self._lock:
+            waiting = self._inflight.pop(key, [])
+            self.stats[result["status"]] += 1
+        for job in waiting:
+            job.add_result(result)
+
+    @staticmethod
+    def _result(key, status, obj=None, error=None):
+        parcel_id, county, state = key
+        result = {"ParcelID": parcel_id, "County": county, "State": state, "status": status}
+        if obj is not None:
+            result.update(
+                LandValue=obj.LandValue, BuildingValue=obj.BuildingValue, TotalValue=obj.TotalValue,
+                AssessmentYear=obj.AssessmentYear, ScreenshotPath=obj.ScreenshotPath
+            )
+        if error:
+            result["error"] = error
+        return result
+
+    # -- status ------------------------------------------------------------
+
+    def job(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def health(self):
+        with self._lock:
+            return {
+                "status": "ok",
+                "workers": len(self._workers),
+                "queued": self._queue.qsize(),
+                "inflight": len(self._inflight),
+                "jobs": len(self.jobs),
+                **self.stats,
+                "sites": breaker_status(),
+                "drivers": self.pool.status(),
+                "cache": cache_stats().summary(),
+            }
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    server_version = "PidPalService/1.0"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            if parts == ["health"]:
+                self._json(200, self.service.health())
+            elif parts == ["jobs"]:
+                with self.service._lock:
+                    jobs = list(self.service.jobs.values())
+                self._json(200, {"jobs": [job.summary() for job in jobs]})
+            elif len(parts) == 2 and parts[0] == "jobs":
+                job = self.service.job(parts[1])
+                if job is None:
+                    self._json(404, {"error": "No such job"})
+                else:
+                    self._json(200, {**job.summary(), "rejected_rows": job.rejected})
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "results":
+                job = self.service.job(parts[1])
+                if job is None:
+                    self._json(404, {"error": "No such job"})
+                else:
+                    self._stream_results(job, wait=params.get("wait", "1") != "0")
+            elif parts == ["parcels"]:
+                self._parcels(params)
+            else:
+                self._json(404, {"error": "Not found"})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except ValueError as e:
+            self._json(400, {"error": str(e)})
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            self._json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                self._json(413, {"error": "Request body too large"})
+                return
+            body = json.loads(self.rfile.read(length) or b"{}")
+            parcels = body.get("parcels")
+            if not isinstance(parcels, list) or not all(isinstance(row, dict) for row in parcels):
+                self._json(400, {"error": '"parcels" must be a list of objects'})
+                return
+            job = self.service.submit(
+                parcels, body.get("freshness", "always"), float(body.get("max_age_days", 30))
+            )
+        except (ValueError, TypeError) as e:
+            self._json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            self._json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._json(202, {**job.summary(), "rejected_rows": job.rejected})
+
+    def _parcels(self, params):
+        after = params.get("after")
+        rows, next_after = query_parcels_page(
+            filters={name: params[name] for name in PARCEL_FILTERS if params.get(name)},
+            sort_by=params.get("sort_by"),
+            sort_order=params.get("sort_order", "ASC"),
+            page_size=max(1, min(int(params.get("page_size", 500)), 5000)),
+            after=tuple(json.loads(after)) if after else None,
+            search=params.get("search"),
+            search_mode=params.get("search_mode", "token"),
+            as_of=params.get("as_of"),
+            year=int(params["year"]) if params.get("year") else None,
+            db_path=self.service.db_path,
+        )
+        self._json(200, {"rows": rows, "after": json.dumps(next_after) if next_after else None})
+
+    def _stream_results(self, job, wait):
+        """Writes results as JSON lines; with wait, keeps the response open until the job is done."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        sent = 0
+        while True:
+            with job.changed:
+                if wait:
+                    while sent == len(job.results) and job.finished is None:
+                        job.changed.wait(timeout=30)
+                pending = job.results[sent:]
+                finished = job.finished is not None
+            for result in pending:
+                self.wfile.write((json.dumps(result) + "\n").encode())
+            self.wfile.flush()
+            sent += len(pending)
+            if finished or not wait:
+                break
+
+    def _json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"{self.address_string()} - {format % args}\n")
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, **service_args):
+    """Starts the service and handles requests until interrupted."""
+    httpd = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    httpd.daemon_threads = True
+    httpd.service = ScrapeService(**service_args)
+    print(f"PidPal service on http://{host}:{httpd.server_address[1]}", file=sys.stderr)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        httpd.service.pool.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pidpal.service",
+                                     description="Local scrape service with a shared job queue.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"default {DEFAULT_PORT}")
+    parser.add_argument("--db", default=DB_PATH, help=f"SQLite database (default {DB_PATH})")
+    parser.add_argument("--workers", type=int, default=2, help="browsers shared by all jobs (default 2)")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help="tabs per browser: load the next parcels' search pages while one is "
+                             "searched and read; searches still run one at a time (default 1)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"parcels per worker hand-off (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--cpt-network", action="store_true",
+                        help="read CPT parcel values from the portal's JSON responses instead of its "
+                             "Appraisal Summary tab")
+    parser.add_argument("--recycle-parcels", type=int, default=MAX_PARCELS,
+                        help=f"parcels a browser handles before it is replaced (default {MAX_PARCELS})")
+    parser.add_argument("--max-memory-mb", type=float, default=MAX_MEMORY_MB,
+                        help=f"replace a browser whose Chrome processes use over this (default {MAX_MEMORY_MB} MB)")
+    parser.add_argument("--profiles", nargs="?", const=PROFILE_ROOT,
+                        help="keep each browser's cache and cookies between runs, in a profile per worker "
+                             f"under this folder (default {PROFILE_ROOT})")
+    parser.add_argument("--screenshots", default="Screenshots", help="screenshot folder (default Screenshots)")
+    parser.add_argument("--no-headless", action="store_true", help="show the browser windows")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, db_path=args.db, workers=args.workers, batch_size=args.batch_size,
+          screenshot_dir=args.screenshots, headless=not args.no_headless, tabs=max(1, args.tabs),
+          profiles=args.profiles, max_parcels=max(1, args.recycle_parcels), max_memory_mb=args.max_memory_mb,
+          capture_network=args.cpt_network)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Screenshot previews for the parcel cards.
+#
+# Full-page captures can be thousands of pixels tall, so cards open on a downscaled preview
+# instead. Previews are read at their target size with QImageReader.setScaledSize (PNG can't
+# scale while decoding, so that first read is scaled right after), written as small JPEGs next to
+# the screenshots so every later open skips the full decode, and kept as QPixmaps in an LRU
+# bounded by pixel memory. The full image is only decoded when a card is zoomed.
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QImageReader, QPixmap
+
+# Previews fit inside this box (wide enough to read, capped for very tall pages)
+PREVIEW_SIZE = QSize(900, 2400)
+
+# Previews live in a subfolder of each screenshot's folder
+THUMBNAIL_DIR = "thumbnails"
+
+# Decoded pixmaps kept in memory, in bytes (32-bit pixels)
+PIXMAP_CACHE_BYTES = 128 * 1024 * 1024
+
+_pixmap_cache = OrderedDict()   # (path, mtime, kind, ...) -> QPixmap
+_pixmap_cache_bytes = 0
+
+
+def _pixmap_bytes(pixmap):
+    return pixmap.width() * pixmap.height() * 4
+
+
+def _cache_get(key):
+    pixmap = _pixmap_cache.get(key)
+    if pixmap is not None:
+        _pixmap_cache.move_to_end(key)
+    return pixmap
+
+
+def _cache_put(key, pixmap):
+    global _pixmap_cache_bytes
+    size = _pixmap_bytes(pixmap)
+    if size > PIXMAP_CACHE_BYTES:
+        return
+    old = _pixmap_cache.pop(key, None)
+    if old is not None:
+        _pixmap_cache_bytes -= _pixmap_bytes(old)
+    _pixmap_cache[key] = pixmap
+    _pixmap_cache_bytes += size
+    while _pixmap_cache_bytes > PIXMAP_CACHE_BYTES:
+        _, evicted = _pixmap_cache.popitem(last=False)
+        _pixmap_cache_bytes -= _pixmap_bytes(evicted)
+
+
+def clear_pixmap_cache():
+    """Drops every decoded pixmap (the thumbnail files on disk are kept)."""
+    global _pixmap_cache_bytes
+    _pixmap_cache.clear()
+    _pixmap_cache_bytes = 0
+
+
+def thumbnail_path(screenshot_path):
+    """Where the preview of `screenshot_path` is stored, e.g. Screenshots/thumbnails/123.jpg"""
+    folder, filename = os.path.split(screenshot_path)
+    return os.path.join(folder, THUMBNAIL_DIR, os.path.splitext(filename)[0] + ".jpg")
+
+
+def image_size(screenshot_path):
+    """Pixel size of an image from its header alone (no decode)."""
+    return QImageReader(screenshot_path).size()
+
+
+def _decode(path, scaled_size=None):
+    """Decodes `path` with QImageReader, optionally straight to `scaled_size`."""
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    if scaled_size is not None:
+        reader.setScaledSize(scaled_size)
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"Could not read image {path}: {reader.errorString()}")
+    return image
+
+
+def load_preview(screenshot_path, max_size=PREVIEW_SIZE):
+    """
+    Returns a QPixmap preview of `screenshot_path` that fits inside max_size (never upscaled).
+    Served from memory, then from the thumbnail file if it is newer than the screenshot,
+    otherwise decoded at the reduced size and saved for next time.
+    """
+    mtime = os.path.getmtime(screenshot_path)
+    key = (os.path.abspath(screenshot_path), mtime, "preview", max_size.width(), max_size.height())
+    pixmap = _cache_get(key)
+    if pixmap is not None:
+        return pixmap
+
+    full_size = image_size(screenshot_path)
+    if full_size.width() <= max_size.width() and full_size.height() <= max_size.height():
+        # Small enough already: no thumbnail file needed
+        image = _decode(screenshot_path)
+    else:
+        thumb = thumbnail_path(screenshot_path)
+        if os.path.exists(thumb) and os.path.getmtime(thumb) >= mtime:
+            image = _decode(thumb)
+        else:
+            image = _decode(screenshot_path, full_size.scaled(max_size, Qt.AspectRatioMode.KeepAspectRatio))
+            os.makedirs(os.path.dirname(thumb), exist_ok=True)
+            image.save(thumb, "JPG", 85)
+
+    pixmap = QPixmap.fromImage(image)
+    _cache_put(key, pixmap)
+    return pixmap
+
+
+def load_full(screenshot_path):
+    """Returns the screenshot at native resolution as a QPixmap. Used when a card is zoomed."""
+    mtime = os.path.getmtime(screenshot_path)
+    key = (os.path.abspath(screenshot_path), mtime, "full")
+    pixmap = _cache_get(key)
+    if pixmap is not None:
+        return pixmap
+
+    pixmap = QPixmap.fromImage(_decode(screenshot_path))
+    _cache_put(key, pixmap)
+    return pixmap